@@ -1,195 +1,143 @@
-from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import Flask, Request, Response, g, request, jsonify, send_from_directory, render_template, url_for
 import os
 import sys
-import re
-import json
-from collections import Counter
-from werkzeug.utils import secure_filename
-import nltk
-import importlib.util
-
-# Set up NLTK data path for Vercel
-nltk_data_path = os.path.join('/tmp', 'nltk_data')
-os.makedirs(nltk_data_path, exist_ok=True)
-nltk.data.path.append(nltk_data_path)
-
-# Download necessary NLTK data to the temp directory
-try:
-    nltk.download('punkt', download_dir=nltk_data_path)
-    nltk.download('stopwords', download_dir=nltk_data_path)
-except Exception as e:
-    print(f"Error downloading NLTK data: {e}")
+import tempfile
+import time
+
+# Cold starts read the stopwords from the asset bundle shipped in the package
+# (see resume_analyzer.assets) instead of downloading NLTK data to /tmp, and
+# the PDF and DOCX libraries are only imported by the first upload that needs them
 
 # Create a new Flask app for Vercel with proper template path
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 template_dir = os.path.join(root_dir, 'templates')
 static_dir = os.path.join(root_dir, 'static')
+
+class UploadRequest(Request):
+    """Request that keeps uploaded files in memory unless they are larger than UPLOAD_SPOOL_MAX_SIZE"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_SPOOL_MAX_SIZE'])
+
 app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
+app.request_class = UploadRequest
 
 # Set up configuration
-app.config['UPLOAD_FOLDER'] = '/tmp/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['UPLOAD_SPOOL_MAX_SIZE'] = 4 * 1024 * 1024  # Larger uploads are spooled to a temporary file
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'docx'}
+app.config['ANALYSIS_WORKERS'] = int(os.environ.get('RESUME_ANALYZER_ANALYSIS_WORKERS', 2))  # Background analyses running at once
+app.config['ANALYSIS_QUEUE_SIZE'] = int(os.environ.get('RESUME_ANALYZER_ANALYSIS_QUEUE_SIZE', 32))  # Background analyses waiting for a worker
+app.config['ANALYSIS_WORKER_MODE'] = os.environ.get('RESUME_ANALYZER_ANALYSIS_WORKER_MODE', 'thread')  # 'thread' or 'process'
+app.config['SCORING_TIER'] = os.environ.get('RESUME_ANALYZER_SCORING_TIER', 'lexical')  # Default of the 'tier' field: lexical, tfidf or semantic
+app.config['TEXT_CACHE_BYTES'] = int(os.environ.get('RESUME_ANALYZER_TEXT_CACHE_BYTES', 32 * 1024 * 1024))  # Extracted texts of uploads kept in memory
+app.config['RESULT_CACHE_BYTES'] = int(os.environ.get('RESUME_ANALYZER_RESULT_CACHE_BYTES', 16 * 1024 * 1024))  # Match results kept in memory
+app.config['RESULT_CACHE_TTL'] = float(os.environ.get('RESUME_ANALYZER_RESULT_CACHE_TTL', 24 * 3600)) or None  # Seconds cached texts and results stay valid, 0 for no limit
+app.config['RESULT_CACHE_DIR'] = os.environ.get('RESUME_ANALYZER_RESULT_CACHE_DIR') or None  # Directory of the on-disk cache tier, disabled by default
 
-# Create upload folder if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Add the project root to the path, a broken package fails the deployment at import
+sys.path.insert(0, root_dir)
 
-# Import the resume parser module
-try:
-    # Add the project root to the path
-    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    sys.path.insert(0, root_dir)
-    
-    # Import the resume parser
-    from resume_analyzer.parser import extract_text_from_resume
-except Exception as e:
-    print(f"Error importing resume_analyzer: {e}")
-    
-    # Define a fallback function if import fails
-    def extract_text_from_resume(file_path):
-        return f"Error extracting text: {str(e)}"
+from resume_analyzer.parser import extract_text_from_resume
+from resume_analyzer.jobs import JobQueue, QueueFullError
+from resume_analyzer.profile_registry import ProfileRegistry
+from resume_analyzer.result_cache import AnalysisCache, content_hash
+from resume_analyzer import analyzer, models, scoring, timing
+
+# Apply RESUME_ANALYZER_MODEL_LOADING: 'eager' loads the models now, 'background'
+# in a thread while requests are scored without them, 'lazy' on first use
+models.start()
+
+# The TF-IDF statistics are not updated by requests; start from the saved ones
+# (RESUME_ANALYZER_TERM_STATS_PATH) or the seed corpus (RESUME_ANALYZER_TERM_STATS_SEED_DIR)
+analyzer.seed_term_statistics()
 
 # Helper function to check allowed file extensions
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
-# Common skills dictionary for IT/Tech jobs
-COMMON_SKILLS = {
-    'programming_languages': [
-        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go'
-    ],
-    'web_development': [
-        'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-        'spring', 'asp.net', 'jquery', 'bootstrap'
-    ],
-    'databases': [
-        'sql', 'mysql', 'postgresql', 'oracle', 'mongodb', 'cassandra', 'redis', 'elasticsearch'
-    ],
-    'cloud_platforms': [
-        'aws', 'azure', 'google cloud', 'gcp', 'heroku', 'digitalocean'
-    ],
-    'devops': [
-        'docker', 'kubernetes', 'jenkins', 'gitlab ci', 'github actions', 'ci/cd'
-    ],
-    'data_science': [
-        'machine learning', 'deep learning', 'ai', 'artificial intelligence', 'data mining',
-        'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch'
-    ],
-    'soft_skills': [
-        'communication', 'teamwork', 'leadership', 'problem solving', 'critical thinking',
-        'time management', 'adaptability', 'creativity', 'project management', 'agile', 'scrum'
-    ]
-}
-
-def extract_skills(text):
-    """Extract skills from text"""
-    skills = {category: [] for category in COMMON_SKILLS}
-    
-    # Find skills in text
-    for category, skill_list in COMMON_SKILLS.items():
-        for skill in skill_list:
-            # Check for exact matches (with word boundaries)
-            if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
-                if skill not in skills[category]:
-                    skills[category].append(skill)
-    
-    # Return skills with counts
-    result = {}
-    for category, skill_list in skills.items():
-        if skill_list:  # Only include categories with found skills
-            result[category] = skill_list
-    
-    return result
+# Job profiles registered through /job-profiles, reusable by id in /analyze
+job_profiles = ProfileRegistry(scoring.MatchProfile)
 
-def calculate_match_score(resume_text, job_description):
-    """Calculate match score between resume and job description"""
-    # Preprocess texts
-    resume_text = resume_text.lower()
-    job_description = job_description.lower()
-    
-    # Extract skills
-    resume_skills = extract_skills(resume_text)
-    job_skills = extract_skills(job_description)
-    
-    # Flatten skills
-    resume_skills_flat = []
-    for category, skills in resume_skills.items():
-        resume_skills_flat.extend(skills)
+# Analyses accepted with async=1 run here and are polled through /jobs/<job_id>
+analysis_jobs = JobQueue(
+    max_workers=app.config['ANALYSIS_WORKERS'],
+    max_queued=app.config['ANALYSIS_QUEUE_SIZE'],
+    use_processes=app.config['ANALYSIS_WORKER_MODE'] == 'process'
+)
+
+# Extracted texts and match results of re-submitted resumes, keyed by content hashes
+analysis_cache = AnalysisCache(
+    text_bytes=app.config['TEXT_CACHE_BYTES'],
+    result_bytes=app.config['RESULT_CACHE_BYTES'],
+    ttl=app.config['RESULT_CACHE_TTL'],
+    cache_dir=app.config['RESULT_CACHE_DIR'],
+    namespace='api'
+)
+
+@app.before_request
+def start_timing():
+    # Stage spans recorded while handling the request end up in its Server-Timing header
+    g.timing_token = timing.start_request()
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def add_server_timing(response):
+    token = g.pop('timing_token', None)
+    if token is not None:
+        header = timing.finish_request(token, request.endpoint or 'unknown', time.perf_counter() - g.request_start)
+        if header:
+            response.headers['Server-Timing'] = header
+    return response
+
+@app.route('/', methods=['GET'])
+def index():
+    return render_template('index.html')
+
+@app.route('/job-profiles', methods=['POST'])
+def register_job_profile():
+    job_description = request.form.get('job_description', '')
+    if not job_description and request.is_json:
+        job_description = (request.get_json(silent=True) or {}).get('job_description', '')
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
     
-    job_skills_flat = []
-    for category, skills in job_skills.items():
-        job_skills_flat.extend(skills)
+    profile_id, profile = job_profiles.register(job_description)
+    return jsonify({'job_profile_id': profile_id, 'skills': profile.skills_flat}), 201
+
+def get_scoring_engine():
+    """Scoring engine of the tier picked by the request's 'tier' field, ValueError if it is unknown"""
+    return scoring.get_engine(request.values.get('tier') or app.config['SCORING_TIER'])
+
+def analysis_key(resume_hash, job_description, engine):
+    """Result cache key and ETag of a resume scored against a job description text or MatchProfile"""
+    if isinstance(job_description, scoring.MatchProfile):
+        job_description = job_description.job_description
+    return analysis_cache.result_key(resume_hash, job_description, engine.version())
+
+def run_analysis(resume_file, filename, job_description, tier, resume_hash=None):
+    """
+    Parse a resume and score it against a job description text or MatchProfile with a scoring tier,
+    reusing the text and result of an identical earlier submission
+    """
+    engine = scoring.get_engine(tier)
+    resume_hash = resume_hash or content_hash(resume_file)
+    result = analysis_cache.results.get(analysis_key(resume_hash, job_description, engine))
+    if result is not None:
+        return result
     
-    # Find matching and missing skills
-    skills_found = [skill for skill in job_skills_flat if skill in resume_skills_flat]
-    skills_missing = [skill for skill in job_skills_flat if skill not in resume_skills_flat]
+    # Extract text from resume, once per distinct file
+    resume_text = analysis_cache.text(resume_hash, lambda: extract_text_from_resume(resume_file, filename=filename))
     
-    # Calculate skill match percentage
-    skill_match_percentage = 0
-    if job_skills_flat:
-        skill_match_percentage = (len(skills_found) / len(job_skills_flat)) * 100
+    # Calculate match score
+    match_result = engine.score(resume_text, job_description)
     
-    # Simple word overlap similarity
-    resume_words = set(re.findall(r'\b\w+\b', resume_text))
-    job_words = set(re.findall(r'\b\w+\b', job_description))
+    # Prepare response
+    result = scoring.analysis_response(match_result, tier)
     
-    # Remove common English stopwords
-    try:
-        stopwords = set(nltk.corpus.stopwords.words('english'))
-        resume_words = resume_words - stopwords
-        job_words = job_words - stopwords
-    except Exception as e:
-        print(f"Error with stopwords: {e}")
-        # Continue without stopwords if there's an error
-    
-    # Calculate Jaccard similarity (intersection over union)
-    intersection = len(resume_words.intersection(job_words))
-    union = len(resume_words.union(job_words))
-    
-    content_similarity = 0
-    if union > 0:
-        content_similarity = (intersection / union) * 100
-    
-    # Combine scores (weighted average)
-    match_percentage = (0.7 * skill_match_percentage) + (0.3 * content_similarity)
-    match_percentage = min(100, max(0, match_percentage))  # Ensure between 0-100
-    
-    # Generate suggestions
-    suggestions = []
-    if skills_missing:
-        suggestions.append(f"Consider adding these missing skills to your resume: {', '.join(skills_missing[:5])}")
-        if len(skills_missing) > 5:
-            suggestions.append(f"...and {len(skills_missing) - 5} more skills")
-    
-    # Prepare chart data
-    skills_chart_data = {
-        'skills_data': [
-            {'skill': skill, 'in_resume': True, 'in_job': skill in job_skills_flat} 
-            for skill in resume_skills_flat
-        ] + [
-            {'skill': skill, 'in_resume': False, 'in_job': True} 
-            for skill in skills_missing
-        ]
-    }
-    
-    match_chart_data = {
-        'overall_match': round(match_percentage, 1),
-        'skill_match': round(skill_match_percentage, 1),
-        'content_match': round(content_similarity, 1)
-    }
-    
-    return {
-        'match_percentage': round(match_percentage, 1),
-        'skills_found': skills_found,
-        'skills_missing': skills_missing,
-        'suggestions': suggestions,
-        'skills_chart': skills_chart_data,
-        'match_chart': match_chart_data
-    }
-
-@app.route('/', methods=['GET'])
-def index():
-    return render_template('index.html')
+    # Keyed by the engine version after scoring, a model may have finished loading meanwhile
+    analysis_cache.results.put(analysis_key(resume_hash, job_description, engine), result)
+    return result
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
@@ -204,29 +152,113 @@ def analyze():
     if not allowed_file(file.filename):
         return jsonify({'error': 'File type not allowed. Please upload PDF or DOCX files only.'}), 400
     
-    job_description = request.form.get('job_description', '')
-    if not job_description:
-        return jsonify({'error': 'Job description is required'}), 400
+    job_profile_id = request.form.get('job_profile_id', '')
+    if job_profile_id:
+        # Reuse a job description registered through /job-profiles
+        job_description = job_profiles.get(job_profile_id)
+        if job_description is None:
+            return jsonify({'error': 'Unknown job profile id'}), 404
+    else:
+        job_description = request.form.get('job_description', '')
+        if not job_description:
+            return jsonify({'error': 'Job description is required'}), 400
     
     try:
-        # Save the file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Extract text from resume
-        resume_text = extract_text_from_resume(filepath)
-        
-        # Calculate match score
-        result = calculate_match_score(resume_text, job_description)
-        
-        # Clean up the file
+        engine = get_scoring_engine()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    resume_hash = content_hash(file.stream)
+    
+    if request.values.get('async', '').lower() in ('1', 'true', 'yes'):
+        # Read the upload now, the request stream is gone once this returns
         try:
-            os.remove(filepath)
-        except:
-            pass
+            job_id = analysis_jobs.submit(run_analysis, file.read(), file.filename, job_description, engine.name,
+                                          resume_hash)
+        except QueueFullError as e:
+            return jsonify({'error': str(e)}), 503
+        return jsonify({'job_id': job_id, 'status_url': url_for('job_status', job_id=job_id)}), 202
+    
+    # A client that already has the result of this resume, job description and scorer gets a 304
+    etag = analysis_key(resume_hash, job_description, engine)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    try:
+        response = jsonify(run_analysis(file.stream, file.filename, job_description, engine.name, resume_hash))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    response.set_etag(analysis_key(resume_hash, job_description, engine))
+    return response
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    status = analysis_jobs.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown job id'}), 404
+    return jsonify(status)
+
+@app.route('/jobs/stats', methods=['GET'])
+def job_stats():
+    return jsonify(analysis_jobs.stats())
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(analysis_cache.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    # Stage and endpoint latency histograms in the Prometheus text format
+    return Response(timing.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/rank', methods=['POST'])
+def rank():
+    files = request.files.getlist('resumes')
+    if not files or all(file.filename == '' for file in files):
+        return jsonify({'error': 'No resumes uploaded'}), 400
+    
+    for file in files:
+        if not allowed_file(file.filename):
+            return jsonify({'error': f'File type not allowed: {file.filename}. Please upload PDF or DOCX files only.'}), 400
+    
+    job_descriptions = [text for text in request.form.getlist('job_descriptions') if text.strip()]
+    if not job_descriptions:
+        return jsonify({'error': 'At least one job description is required'}), 400
+    
+    try:
+        top_k = int(request.form.get('top_k', 5))
+    except ValueError:
+        return jsonify({'error': 'top_k must be an integer'}), 400
+    
+    # Cascade mode skips the expensive stages for candidates that cannot make the top_k or min_score
+    cascade = request.form.get('cascade', '').lower() in ('1', 'true', 'yes')
+    try:
+        min_score = float(request.form['min_score']) if request.form.get('min_score') else None
+    except ValueError:
+        return jsonify({'error': 'min_score must be a number'}), 400
+    
+    try:
+        engine = get_scoring_engine()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        # Extract the text of every resume once, reusing the text of files seen before
+        resume_texts = []
+        for file in files:
+            resume_texts.append(analysis_cache.text(
+                content_hash(file.stream), lambda: extract_text_from_resume(file.stream, filename=file.filename)
+            ))
+        
+        # Rankings refer to resumes and jobs by their position in the request
+        result = engine.rank(resume_texts, job_descriptions, top_k, cascade=cascade, min_score=min_score)
+        result['resumes'] = [file.filename for file in files]
+        result['tier'] = engine.name
         
         return jsonify(result)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,79 @@
+"""
+Benchmark for cascade ranking
+
+Ranks generated resumes against job descriptions with analyzer.rank_matches,
+once computing every stage for every pair and once in cascade mode, for a
+few min_score thresholds. Reports the time of both, how many resumes and
+pairs each cascade stage pruned, and whether the rankings are the same.
+
+Usage:
+    python benchmarks/bench_cascade.py [--resumes 500] [--jobs 5] [--top-k 10] [--tier semantic]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import job_description, resume_lines
+from resume_analyzer import analyzer
+
+
+def same_rankings(full, cascade, min_score):
+    """Whether the cascade rankings per job and per resume match the full ones above min_score"""
+    for direction, other in (('by_job', 'resume'), ('by_resume', 'job')):
+        for full_ranking, cascade_ranking in zip(full[direction], cascade[direction]):
+            expected = [
+                (match[other], match['match_percentage']) for match in full_ranking['matches']
+                if min_score is None or match['match_percentage'] >= min_score
+            ]
+            found = [(match[other], match['match_percentage']) for match in cascade_ranking['matches']]
+            if found[:len(expected)] != expected:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=500)
+    parser.add_argument('--jobs', type=int, default=5)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--tier', choices=['tfidf', 'semantic'], default='semantic')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resume_texts = ['\n'.join(resume_lines(rng, skills=rng.randint(2, 30))) for _ in range(args.resumes)]
+    job_texts = [job_description(rng, skills=rng.randint(3, 15)) for _ in range(args.jobs)]
+    resume_analyses = [analyzer.analyze_resume(text) for text in resume_texts]
+    semantic = args.tier == 'semantic'
+
+    def rank(**options):
+        # Fresh profiles and an empty embedding cache, so both runs pay for the job embeddings
+        analyzer.embedding_cache.clear()
+        job_profiles = [analyzer.JobProfile(text, eager=False) for text in job_texts]
+        start = time.perf_counter()
+        result = analyzer.rank_matches(resume_analyses, job_profiles, top_k=args.top_k, semantic=semantic, **options)
+        return result, (time.perf_counter() - start) * 1000
+
+    rank()  # load the models
+    full, full_ms = rank()
+    print(f"{args.resumes} resumes x {args.jobs} jobs, top {args.top_k}, {args.tier} tier: "
+          f"all stages {full_ms:.0f} ms")
+    print(f"{'min_score':>9} {'ms':>8} {'speedup':>8} {'skills: resumes/pairs':>22} "
+          f"{'tfidf: resumes/pairs':>21} {'same':>5}")
+    for min_score in (None, 40, 60, 80):
+        result, cascade_ms = rank(cascade=True, min_score=min_score)
+        pruned = result['cascade']['pruned']
+        counts = [
+            f"{pruned[stage]['resumes']}/{pruned[stage]['pairs']}" if stage in pruned else '-'
+            for stage in ('skills', 'tfidf')
+        ]
+        print(f"{str(min_score):>9} {cascade_ms:>8.0f} {full_ms / cascade_ms:>7.1f}x {counts[0]:>22} "
+              f"{counts[1]:>21} {str(same_rankings(full, result, min_score)):>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for import time and cold start of the analyzer
+
+Every measurement runs in a fresh Python process, so nothing is shared
+between runs. For each model loading strategy it reports how long the
+import takes, how long until the first lexical result (skills) is
+available, how long models.start() blocks, and how long the first full
+calculate_match_score call takes.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import resume_analyzer.analyzer as analyzer
+from resume_analyzer import models
+timings = {{'import': time.perf_counter() - start}}
+
+analyzer.extract_skills(None, "python developer with aws and docker")
+timings['first_skills'] = time.perf_counter() - start
+
+before = time.perf_counter()
+models.start({strategy!r})
+timings['start'] = time.perf_counter() - before
+
+before = time.perf_counter()
+analysis = analyzer.analyze_resume("Python developer with AWS and Docker. Education: BSc, University")
+result = analyzer.calculate_match_score(analysis, "Looking for a Python engineer with AWS, Docker and Kubernetes")
+timings['first_match'] = time.perf_counter() - before
+timings['semantic_ready'] = result['semantic_similarity'] is not None
+timings['total'] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def run_child(strategy):
+    """Run one cold start in a fresh interpreter and return its timings"""
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD.format(root=ROOT, strategy=strategy)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help="cold starts per strategy")
+    args = parser.parse_args()
+
+    print(f"{'strategy':<11} {'import s':>9} {'skills s':>9} {'start s':>8} {'1st match s':>12} {'total s':>8}  semantic")
+    for strategy in ('lazy', 'eager', 'background'):
+        runs = [run_child(strategy) for _ in range(args.runs)]
+
+        def median(key):
+            return statistics.median(run[key] for run in runs)
+
+        semantic = sum(run['semantic_ready'] for run in runs)
+        print(f"{strategy:<11} {median('import'):>9.3f} {median('first_skills'):>9.3f} {median('start'):>8.3f} "
+              f"{median('first_match'):>12.3f} {median('total'):>8.3f}  {semantic}/{len(runs)} runs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark for DOCX text extraction
+
+Generates template-style resumes: the name and contact details in the
+page header, skills and experience laid out in tables, a text box in the
+sidebar and the rest as body paragraphs, from a few to hundreds of table
+rows. Extracts each file with python-docx (the body paragraphs of the
+Document object model, the previous implementation, and the same model
+walked through the header and table cells as well) and with the streaming
+extractor of resume_analyzer.parser, and reports the median time, the peak
+Python memory (tracemalloc) and how many of the resume's skills each one
+found.
+
+Usage:
+    python benchmarks/bench_docx.py [--jobs 5 50 400] [--runs 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from docx.oxml import parse_xml
+
+from corpus import ALL_SKILLS, COMPANIES, FIRST_NAMES, LAST_NAMES, MONTHS, OBJECTS, TITLES, VERBS
+from resume_analyzer.analyzer import extract_skills
+from resume_analyzer.parser import extract_text_from_docx
+
+TEXT_BOX = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+    ' xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>{paragraphs}'
+    '</w:txbxContent></wps:txbx></w:drawing></mc:Choice><mc:Fallback><w:pict><v:textbox><w:txbxContent>'
+    '{paragraphs}</w:txbxContent></v:textbox></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+)
+
+
+def write_template_docx(path, rng, jobs):
+    """Write a table-based resume with a header and a text box, return the skills it mentions"""
+    skills = rng.sample(ALL_SKILLS, 24)
+    document = Document()
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    document.sections[0].header.paragraphs[0].text = f"{name} | {name.split()[0].lower()}@example.com"
+
+    # Sidebar text box with a third of the skills
+    anchor = document.add_paragraph("Profile")
+    sidebar = ''.join(f'<w:p><w:r><w:t>{skill}</w:t></w:r></w:p>' for skill in skills[:8])
+    anchor._p.append(parse_xml(TEXT_BOX.format(paragraphs=sidebar)))
+
+    document.add_paragraph("SKILLS")
+    table = document.add_table(rows=4, cols=4)
+    for index, skill in enumerate(skills[8:]):
+        table.cell(index // 4, index % 4).text = skill
+
+    document.add_paragraph("EXPERIENCE")
+    table = document.add_table(rows=jobs, cols=2)
+    for row in range(jobs):
+        start = rng.randint(2000, 2020)
+        table.cell(row, 0).text = f"{rng.choice(MONTHS)} {start} - {rng.choice(MONTHS)} {start + rng.randint(1, 4)}"
+        cell = table.cell(row, 1)
+        cell.text = f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)}"
+        for _ in range(4):
+            cell.add_paragraph(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}")
+    document.save(path)
+    return skills
+
+
+def python_docx_text(path):
+    """The previous extractor: body paragraphs of the python-docx object model"""
+    return "\n".join(paragraph.text for paragraph in Document(path).paragraphs)
+
+
+def python_docx_full_text(path):
+    """Header, body paragraphs and table cells of the python-docx object model (no text boxes)"""
+    document = Document(path)
+    texts = [paragraph.text for section in document.sections for paragraph in section.header.paragraphs]
+    for block in document.iter_inner_content():
+        if hasattr(block, 'rows'):
+            texts.extend(
+                paragraph.text for row in block.rows for cell in row.cells for paragraph in cell.paragraphs
+            )
+        else:
+            texts.append(block.text)
+    return "\n".join(texts)
+
+
+def measure(extract, path, runs):
+    """Median seconds of extract(path), its peak traced memory and its text"""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        text = extract(path)
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    extract(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(seconds), peak, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, nargs='+', default=[5, 50, 400], help="experience table rows per file")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    extractors = [
+        ('python-docx', python_docx_text),
+        ('python-docx+', python_docx_full_text),
+        ('streaming', extract_text_from_docx),
+    ]
+    print(f"{'rows':>5} {'KB':>6} {'extractor':<13} {'ms':>8} {'peak MB':>8} {'chars':>8} {'skills':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for jobs in args.jobs:
+            path = os.path.join(directory, f'template-{jobs}.docx')
+            skills = write_template_docx(path, rng, jobs)
+            size_kb = os.path.getsize(path) / 1024
+            for label, extract in extractors:
+                seconds, peak, text = measure(extract, path, args.runs)
+                found = {skill for found in extract_skills(None, text.lower()).values() for skill in found}
+                print(f"{jobs:>5} {size_kb:>6.0f} {label:<13} {seconds * 1000:>8.1f} {peak / 1024 / 1024:>8.2f} "
+                      f"{len(text):>8} {len(found & set(skills)):>3}/{len(skills)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark for top-k search in the memory-mapped embedding index
+
+Fills an EmbeddingIndex with clustered random vectors of the sentence model's
+size and compares, per query, a brute-force search over an in-memory matrix
+with the blocked exact search and the partitioned search for several numbers
+of probed partitions (reporting their recall@k against brute force).
+
+Usage:
+    python benchmarks/bench_embedding_index.py [--vectors 100000] [--dim 384] [--queries 50] [--dtype float32]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from resume_analyzer.embedding_index import EmbeddingIndex
+
+
+def clustered_vectors(rng, count, dim, clusters):
+    """Random vectors scattered around random cluster centers, like embeddings of similar resumes"""
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(clusters, size=count)
+    return centers[labels] + rng.normal(scale=0.6, size=(count, dim)).astype(np.float32)
+
+
+def timed_queries(search, queries):
+    """Run search on every query and return the results and the per-query latencies in ms"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vectors', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--dtype', choices=['float32', 'float16'], default='float32')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = clustered_vectors(rng, args.vectors, args.dim, args.clusters)
+    queries = clustered_vectors(rng, args.queries, args.dim, args.clusters)
+    ids = [str(row) for row in range(args.vectors)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = EmbeddingIndex(directory, dtype=args.dtype)
+        start = time.perf_counter()
+        for first in range(0, args.vectors, 10000):
+            index.add(ids[first:first + 10000], vectors[first:first + 10000])
+        print(f"{args.vectors} x {args.dim} {args.dtype} vectors "
+              f"({index.vectors().nbytes / 2 ** 20:.0f} MB) added in {time.perf_counter() - start:.2f} s")
+
+        # Brute force: the whole normalized matrix in memory, one product per query
+        matrix = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        def brute_force(query):
+            scores = matrix @ (query / np.linalg.norm(query))
+            best = np.argpartition(-scores, args.k - 1)[:args.k]
+            return {ids[row] for row in best}
+
+        expected, latencies = timed_queries(brute_force, queries)
+        rows = [('brute force (in memory)', latencies, 1.0)]
+
+        def recall(results):
+            return statistics.mean(
+                len(expected_ids & {key for key, _ in result[0]}) / args.k
+                for expected_ids, result in zip(expected, results)
+            )
+
+        results, latencies = timed_queries(lambda query: index.search(query, k=args.k), queries)
+        rows.append(('blocked exact (memmap)', latencies, recall(results)))
+
+        start = time.perf_counter()
+        n_partitions = int(np.sqrt(args.vectors))
+        index.build_partitions(n_partitions)
+        print(f"{n_partitions} partitions built in {time.perf_counter() - start:.2f} s")
+        for n_probe in (1, 4, 16, 64):
+            if n_probe > n_partitions:
+                break
+            results, latencies = timed_queries(lambda query: index.search(query, k=args.k, n_probe=n_probe), queries)
+            rows.append((f"partitioned, n_probe={n_probe}", latencies, recall(results)))
+
+    print(f"{'search':<28} {'p50 ms':>8} {'p95 ms':>8} {'recall@' + str(args.k):>10}")
+    for name, latencies, recall_at_k in rows:
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        print(f"{name:<28} {statistics.median(latencies):>8.2f} {p95:>8.2f} {recall_at_k:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark for the time to first response of a freshly started app
+
+Every run starts a new Python process, like a serverless cold start: it
+imports an entry point (api/index.py or app.py) and sends one /analyze
+request with a generated resume through Flask's test client. Reports the
+interpreter start, the import of the entry point, the first request and
+the total wall time measured from outside the process, with the stopwords
+read from the shipped asset bundle and from NLTK's corpus
+(RESUME_ANALYZER_ASSET_BUNDLE=none, which imports NLTK).
+
+Usage:
+    python benchmarks/bench_first_response.py [--runs 5] [--entry api.index] [--format pdf]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import job_description, resume_lines, write_docx, write_pdf
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+import {entry} as entry
+imported = time.perf_counter()
+
+client = entry.app.test_client()
+with open({path!r}, 'rb') as f:
+    response = client.post('/analyze', data={{'resume': (f, {filename!r}), 'job_description': {job!r}, 'tier': 'lexical'}},
+                           content_type='multipart/form-data')
+assert response.status_code == 200, response.get_data(as_text=True)
+responded = time.perf_counter()
+print(json.dumps({{'import': imported - started, 'first_response': responded - imported,
+                   'modules': len(sys.modules), 'nltk': 'nltk' in sys.modules}}))
+"""
+
+
+def run_child(entry, path, job, bundle):
+    """Start a fresh interpreter, serve one request and return its timings"""
+    env = dict(os.environ)
+    if bundle:
+        env.pop('RESUME_ANALYZER_ASSET_BUNDLE', None)
+    else:
+        env['RESUME_ANALYZER_ASSET_BUNDLE'] = 'none'
+    code = CHILD.format(root=ROOT, entry=entry, path=path, filename=os.path.basename(path), job=job)
+
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True, env=env).stdout
+    wall = time.perf_counter() - start
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings['wall'] = wall
+    timings['interpreter'] = wall - timings['import'] - timings['first_response']
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="cold starts per configuration")
+    parser.add_argument('--entry', choices=['api.index', 'app'], default='api.index')
+    parser.add_argument('--format', choices=['pdf', 'docx'], default='pdf')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    job = job_description(rng)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f'resume.{args.format}')
+        (write_pdf if args.format == 'pdf' else write_docx)(path, resume_lines(rng))
+
+        print(f"{args.entry}, {args.format} resume, median of {args.runs} cold starts")
+        print(f"{'stopwords':<12} {'interp s':>9} {'import s':>9} {'1st resp s':>11} {'wall s':>8} {'modules':>8}  nltk")
+        for bundle in (True, False):
+            runs = [run_child(args.entry, path, job, bundle) for _ in range(args.runs)]
+
+            def median(key):
+                return statistics.median(run[key] for run in runs)
+
+            print(f"{'bundle' if bundle else 'nltk corpus':<12} {median('interpreter'):>9.3f} {median('import'):>9.3f} "
+                  f"{median('first_response'):>11.3f} {median('wall'):>8.3f} {median('modules'):>8.0f}  "
+                  f"{'imported' if runs[0]['nltk'] else 'not imported'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Throughput benchmark for bulk resume ingestion
+
+Generates a folder of synthetic PDF and DOCX resumes (plus one corrupt
+file, to show it does not stop the batch) and runs ingest_resumes with
+1, 2, 4 and N worker processes.
+
+Usage:
+    python benchmarks/bench_ingest.py [--files 400] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_resumes
+from resume_analyzer.parser import ingest_resumes
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=400, help="number of resumes to generate")
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, 4, cpu_count}),
+                        help="worker counts to try")
+    parser.add_argument('--timeout', type=float, default=30, help="per-file timeout in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='resume-ingest-')
+    try:
+        paths = generate_resumes(directory, args.files, seed=args.seed)
+        corrupt = os.path.join(directory, 'corrupt.pdf')
+        with open(corrupt, 'wb') as f:
+            f.write(b'%PDF-1.4 this is not really a pdf')
+        paths.append(corrupt)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"{len(paths)} files, {size / 1024 / 1024:.1f} MB, {cpu_count} CPUs")
+
+        print(f"{'workers':>7} {'seconds':>8} {'files/s':>8} {'speedup':>8} {'errors':>7}")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            errors = 0
+            for result in ingest_resumes(paths, max_workers=workers, timeout=args.timeout):
+                errors += result.error is not None
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>8.2f} {len(paths) / elapsed:>8.1f} {baseline / elapsed:>7.2f}x {errors:>7}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
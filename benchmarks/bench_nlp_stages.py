@@ -0,0 +1,78 @@
+"""
+Per-stage latency of the spaCy pipeline, full versus trimmed
+
+"before" loads the full pipeline and parses every text with all of its
+components, once per resume and twice per job description (the old match
+score and keyword extraction each parsed it). "after" loads the pipeline
+without the components no stage uses and parses each job description once
+with only the components of models.SPACY_STAGE_COMPONENTS['keywords'], one
+at a time and batched through nlp.pipe. Resumes are no longer parsed.
+
+Usage:
+    python benchmarks/bench_nlp_stages.py [--resumes 200] [--jobs 50] [--batch-size 64] [--n-process 1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy
+
+from corpus import job_description, resume_lines
+from resume_analyzer import models
+from resume_analyzer.analyzer import preprocess_text
+
+
+def timed(func):
+    """Run func and return its result and the elapsed seconds"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def report(stage, seconds, count):
+    print(f"{stage:<32} {seconds:>9.3f} {seconds / count * 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resumes = [preprocess_text('\n'.join(resume_lines(rng, jobs=rng.randint(2, 8)))) for _ in range(args.resumes)]
+    jobs = [preprocess_text(job_description(rng)) for _ in range(args.jobs)]
+
+    print(f"{'stage':<32} {'seconds':>9} {'ms / text':>10}")
+
+    # Before: full pipeline, every component on every parse
+    full_nlp, seconds = timed(lambda: spacy.load(models.SPACY_MODEL_NAME))
+    print(f"full pipeline: {', '.join(full_nlp.pipe_names) or '(tokenizer only)'}")
+    report("load", seconds, 1)
+    _, seconds = timed(lambda: [full_nlp(text) for text in resumes])
+    report("resume parse", seconds, len(resumes))
+    _, seconds = timed(lambda: [(full_nlp(text), full_nlp(text)) for text in jobs])
+    report("job parse (x2)", seconds, len(jobs))
+    del full_nlp
+
+    # After: trimmed pipeline, only the components of each stage
+    trimmed_nlp, seconds = timed(models.get_nlp)
+    print(f"trimmed pipeline: {', '.join(trimmed_nlp.pipe_names) or '(tokenizer only)'}")
+    for stage, components in models.SPACY_STAGE_COMPONENTS.items():
+        print(f"  {stage}: {', '.join(components) or '(tokenizer only)'}")
+    report("load", seconds, 1)
+    _, seconds = timed(lambda: [models.parse(text, 'keywords') for text in jobs])
+    report("job keywords parse", seconds, len(jobs))
+    _, seconds = timed(lambda: list(models.parse_many(jobs, 'keywords', args.batch_size, args.n_process)))
+    report(f"job keywords parse, pipe({args.batch_size})", seconds, len(jobs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark for PDF text extraction modes
+
+Generates synthetic resumes of a few to tens of pages (and reads any PDF
+given with --pdf) and extracts them with pdfplumber's layout analysis on
+every page ('layout'), with fast extraction falling back to layout
+analysis on degraded pages ('fast'), and with fast extraction split
+across worker processes by page range. Reports the time per file, the
+pages per second, the share of pages that fell back to layout analysis
+and the share of pages whose text is identical to the layout text.
+
+Usage:
+    python benchmarks/bench_pdf.py [--pages 2 10 40] [--workers 2 4] [--pdf resume.pdf ...]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import pdf_bytes, resume_lines
+from resume_analyzer import parser as resume_parser
+
+
+def synthetic_pdf(rng, pages):
+    """A resume long enough to fill the given number of 50-line pages"""
+    lines = []
+    while len(lines) < pages * 50:
+        lines += resume_lines(rng, jobs=8, bullets=5, projects=10)
+    return pdf_bytes(lines[:pages * 50])
+
+
+def measure(source, runs, mode, workers):
+    """Median seconds to extract every page of source, and the pages of the last run"""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pages = list(resume_parser.iter_pdf_pages(source, mode=mode, workers=workers))
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[2, 10, 40], help="pages per synthetic resume")
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4], help="worker counts for the parallel runs")
+    parser.add_argument('--pdf', nargs='*', default=[], help="PDF files to extract as well")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sources = [(f"{pages} pages", synthetic_pdf(rng, pages)) for pages in args.pages]
+    sources += [(os.path.basename(path), path) for path in args.pdf]
+    # Split every file that has more than one page, the threshold is what is measured here
+    resume_parser.PDF_PARALLEL_MIN_PAGES = 2
+    configurations = [('layout', 1), ('fast', 1)] + [('fast', workers) for workers in args.workers]
+
+    width = max(len(label) for label, _ in sources)
+    print(f"{'file':<{width}} {'mode':<7} {'workers':>7} {'ms':>9} {'pages/s':>9} {'fallback':>9} {'= layout':>9}")
+    for label, source in sources:
+        # Start the worker pools outside of the measured runs
+        for _, workers in configurations:
+            if workers > 1:
+                list(resume_parser.iter_pdf_pages(source, max_pages=2, workers=workers))
+
+        reference = None
+        for mode, workers in configurations:
+            seconds, pages = measure(source, args.runs, mode, workers)
+            if reference is None:
+                reference = [page.text for page in pages]
+            fallbacks = sum(page.fallback for page in pages)
+            identical = sum(page.text == text for page, text in zip(pages, reference))
+            print(f"{label:<{width}} {mode:<7} {workers:>7} {seconds * 1000:>9.1f} {len(pages) / seconds:>9.1f} "
+                  f"{fallbacks / len(pages):>9.1%} {identical / len(pages):>9.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Benchmark suite for the parse -> analyze -> score pipeline
+
+Generates a deterministic corpus (PDF and DOCX resumes of three lengths, job
+descriptions of three skill densities) and times every stage separately:
+extract_text_from_resume, preprocess_text, extract_skills, analyze_resume,
+calculate_match_score, generate_suggestions and the score of every scoring
+tier (resume_analyzer.scoring, from the extracted text).
+For each stage it reports the first (cold) call, latency percentiles over
+the remaining calls, throughput and the peak Python heap (tracemalloc, in a
+separate pass so it does not slow the timed one).
+
+Results can be saved as JSON and compared with an earlier run, e.g. one
+made on the previous commit on the same machine.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--resumes 60] [--jobs 9] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from corpus import generate_resumes, job_description
+from resume_analyzer import analyzer, scoring
+from resume_analyzer.parser import extract_text_from_resume
+
+# Skills asked for by the generated job descriptions, cycled through
+SKILL_DENSITIES = (3, 10, 25)
+
+
+def build_corpus(directory, resumes, jobs, seed):
+    """
+    Write the resumes and build the job descriptions
+
+    Returns:
+        tuple: (resume file paths, job description texts)
+    """
+    paths = generate_resumes(directory, resumes, seed=seed)
+    rng = random.Random(seed)
+    job_texts = [
+        job_description(rng, skills=SKILL_DENSITIES[index % len(SKILL_DENSITIES)], sentences=4 + index % 5)
+        for index in range(jobs)
+    ]
+    return paths, job_texts
+
+
+def time_stage(func, inputs):
+    """
+    Call func on every input, timing each call
+
+    Returns:
+        tuple: (results, first call seconds, list of the other calls' seconds)
+    """
+    results, seconds = [], []
+    for item in inputs:
+        start = time.perf_counter()
+        results.append(func(item))
+        seconds.append(time.perf_counter() - start)
+    return results, seconds[0], seconds[1:]
+
+
+def peak_heap(func, inputs):
+    """Peak Python heap in bytes while calling func on every input"""
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            func(item)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(first, seconds, peak_bytes):
+    """Latency percentiles (ms), throughput and memory of one stage"""
+    milliseconds = np.asarray(seconds or [first]) * 1000
+    return {
+        'calls': len(seconds) + 1,
+        'first_call_ms': round(first * 1000, 3),
+        'mean_ms': round(float(milliseconds.mean()), 3),
+        'p50_ms': round(float(np.percentile(milliseconds, 50)), 3),
+        'p90_ms': round(float(np.percentile(milliseconds, 90)), 3),
+        'p99_ms': round(float(np.percentile(milliseconds, 99)), 3),
+        'max_ms': round(float(milliseconds.max()), 3),
+        'per_second': round(1000 / float(milliseconds.mean()), 1) if milliseconds.mean() > 0 else None,
+        'peak_heap_kb': round(peak_bytes / 1024, 1)
+    }
+
+
+def environment():
+    """Machine and code version the results were measured on"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def run(args):
+    """Run every stage and return the results document"""
+    directory = tempfile.mkdtemp(prefix='resume-bench-')
+    try:
+        paths, job_texts = build_corpus(directory, args.resumes, args.jobs, args.seed)
+        stages = {}
+
+        def stage(name, func, inputs):
+            results, first, seconds = time_stage(func, inputs)
+            stages[name] = summarize(first, seconds, peak_heap(func, inputs[:args.memory_calls]))
+            print(f"{name:<24} {stages[name]['p50_ms']:>9.2f} {stages[name]['p90_ms']:>9.2f} "
+                  f"{stages[name]['p99_ms']:>9.2f} {stages[name]['per_second'] or 0:>9.1f} "
+                  f"{stages[name]['first_call_ms']:>10.1f} {stages[name]['peak_heap_kb']:>10.0f}")
+            return results
+
+        print(f"{len(paths)} resumes, {len(job_texts)} job descriptions, {os.cpu_count()} CPUs")
+        print(f"{'stage':<24} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'calls/s':>9} {'1st ms':>10} {'heap KB':>10}")
+
+        raw_texts = stage('extract_text', extract_text_from_resume, paths)
+        stage('preprocess_text', analyzer.preprocess_text, raw_texts)
+        stage('extract_skills', lambda text: analyzer.extract_skills(None, text.lower()), raw_texts)
+        analyses = stage('analyze_resume', analyzer.analyze_resume, raw_texts)
+
+        pairs = [(analysis, job_texts[index % len(job_texts)]) for index, analysis in enumerate(analyses)]
+        matches = stage('calculate_match_score', lambda pair: analyzer.calculate_match_score(*pair), pairs)
+
+        profiles = [analyzer.JobProfile(text) for text in job_texts]
+        suggestion_inputs = [
+            (match['skills_missing'], analysis, profiles[index % len(profiles)])
+            for index, (match, analysis) in enumerate(zip(matches, analyses))
+        ]
+        stage('generate_suggestions', lambda item: analyzer.generate_suggestions(*item), suggestion_inputs)
+
+        # Every tier scores a resume text against a job profile built beforehand
+        for tier in scoring.TIERS:
+            engine = scoring.get_engine(tier)
+            tier_profiles = [engine.build_profile(text) for text in job_texts]
+            stage(f'{tier}_match_score', lambda pair: engine.score(*pair),
+                  [(text, tier_profiles[index % len(tier_profiles)]) for index, text in enumerate(raw_texts)])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_mb = max_rss / 1024 / (1024 if sys.platform == 'darwin' else 1)
+    print(f"peak RSS {max_rss_mb:.0f} MB")
+    return {
+        'environment': environment(),
+        'settings': {'resumes': args.resumes, 'jobs': args.jobs, 'seed': args.seed},
+        'peak_rss_mb': round(max_rss_mb, 1),
+        'stages': stages
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the p50 change of every stage against a baseline results document"""
+    print(f"\ncompared with {baseline['environment'].get('commit') or 'baseline'} "
+          f"(p50, regression above +{threshold:.0f}%)")
+    for name, stage in results['stages'].items():
+        before = baseline['stages'].get(name)
+        if not before or not before['p50_ms']:
+            print(f"{name:<24} {'new':>9}")
+            continue
+        change = (stage['p50_ms'] / before['p50_ms'] - 1) * 100
+        flag = 'REGRESSION' if change > threshold else ''
+        print(f"{name:<24} {before['p50_ms']:>9.2f} -> {stage['p50_ms']:>9.2f} ms {change:>+7.1f}%  {flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=60)
+    parser.add_argument('--jobs', type=int, default=9)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory-calls', type=int, default=10, help="calls per stage in the tracemalloc pass")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare with")
+    parser.add_argument('--threshold', type=float, default=10, help="p50 slowdown in %% reported as a regression")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f), args.threshold)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark for skill bitset queries over a large candidate pool
+
+Builds a pool of random candidate skill sets drawn from COMMON_SKILLS and
+compares Python set checks with the packed bit matrix of SkillPool for a
+boolean filter ("python AND (aws OR gcp)") and for the per-candidate skill
+coverage of a job.
+
+Usage:
+    python benchmarks/bench_skill_bits.py [--candidates 100000] [--skills 15] [--runs 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from corpus import ALL_SKILLS
+from resume_analyzer.analyzer import skill_vocabulary
+from resume_analyzer.skill_bits import SkillPool
+
+
+def best_time(func, runs):
+    """Run func several times and return its result and the median seconds"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--skills', type=int, default=15, help="skills per candidate")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    skill_sets = [set(rng.sample(ALL_SKILLS, args.skills)) for _ in range(args.candidates)]
+    job_skills = rng.sample(ALL_SKILLS, 10)
+    job_mask = skill_vocabulary.encode(job_skills)
+
+    pool, seconds = best_time(lambda: SkillPool(skill_vocabulary, skill_sets), 1)
+    print(f"{len(skill_vocabulary)} skills, {args.candidates} candidates, "
+          f"pool of {pool.bits.nbytes / 1024:.0f} KB built in {seconds:.2f} s")
+    print(f"{'operation':<34} {'sets ms':>9} {'bits ms':>9} {'speedup':>8}")
+
+    def sets_query():
+        return np.array([
+            'python' in skills and ('aws' in skills or 'gcp' in skills) for skills in skill_sets
+        ])
+
+    def sets_coverage():
+        return np.array([
+            sum(skill in skills for skill in job_skills) * 100 / len(job_skills) for skills in skill_sets
+        ])
+
+    expected, set_seconds = best_time(sets_query, args.runs)
+    result, bit_seconds = best_time(lambda: pool.query(all_of=['python'], any_of=['aws', 'gcp']), args.runs)
+    assert (expected == result).all()
+    print(f"{'python AND (aws OR gcp)':<34} {set_seconds * 1000:>9.1f} {bit_seconds * 1000:>9.1f} "
+          f"{set_seconds / bit_seconds:>7.0f}x  ({int(result.sum())} matches)")
+
+    expected, set_seconds = best_time(sets_coverage, args.runs)
+    result, bit_seconds = best_time(lambda: pool.coverage_matrix([job_mask])[0], args.runs)
+    assert np.allclose(expected, result)
+    print(f"{'coverage of a 10-skill job':<34} {set_seconds * 1000:>9.1f} {bit_seconds * 1000:>9.1f} "
+          f"{set_seconds / bit_seconds:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark for the single-pass skill matcher
+
+Checks that SkillMatcher returns the same skills as the previous
+per-skill regex loop on sample resumes, then measures how both approaches
+scale with the size of the skills dictionary.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py
+"""
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_analyzer.analyzer import COMMON_SKILLS
+from resume_analyzer.skills import SkillMatcher
+
+SAMPLE_RESUMES = [
+    """John Doe - Senior Software Engineer
+    Skills: Python, Java, JavaScript, TypeScript, React, Node.js, Django, Flask
+    Databases: PostgreSQL, MySQL, MongoDB, Redis
+    Cloud: AWS (EC2, S3, Lambda, RDS), Docker, Kubernetes, Terraform, CI/CD with GitHub Actions
+    Experience: Led a team of 6 engineers, agile/scrum, strong communication and leadership.
+    Built machine learning pipelines with pandas, numpy, scikit-learn and TensorFlow.""",
+    """Jane Smith - Data Scientist
+    Education: Master of Science in Computer Science, Stanford University
+    Deep learning with PyTorch and Keras, computer vision and NLP research.
+    Visualization with Tableau, Power BI, matplotlib and seaborn. SQL and Spark on Google Cloud / GCP.
+    Soft skills: problem solving, critical thinking, time management, teamwork.""",
+    """Alex Lee - DevOps Engineer
+    Jenkins, GitLab CI, Travis CI, Ansible, Puppet, Chef, Prometheus, Grafana, ELK stack.
+    Shell and Bash scripting, PowerShell on Azure. Go and Rust services behind Cloudflare.
+    Deployed to Heroku, Vercel, Netlify and DigitalOcean. REST API and GraphQL design.""",
+]
+
+TEXT_REPEAT = 20
+
+
+def legacy_extract_skills(skills_by_category, text):
+    """The per-skill regex loop the matcher replaces"""
+    skills = {category: [] for category in skills_by_category}
+    for category, skill_list in skills_by_category.items():
+        for skill in skill_list:
+            if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
+                if skill not in skills[category]:
+                    skills[category].append(skill)
+    return {category: skill_list for category, skill_list in skills.items() if skill_list}
+
+
+def synthetic_dictionary(size, seed=0):
+    """Grow COMMON_SKILLS to the given number of skills with made-up entries"""
+    rng = random.Random(seed)
+    dictionary = {category: list(skill_list) for category, skill_list in COMMON_SKILLS.items()}
+    categories = list(dictionary)
+    count = sum(len(skill_list) for skill_list in dictionary.values())
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+    while count < size:
+        words = [''.join(rng.choice(alphabet) for _ in range(rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        skill = ' '.join(words) + rng.choice(['', '', '', '.js', '++', '/cd'])
+        dictionary[rng.choice(categories)].append(skill)
+        count += 1
+    return dictionary
+
+
+def check_equivalence():
+    """Compare matcher output with the legacy loop on the sample resumes"""
+    matcher = SkillMatcher(COMMON_SKILLS)
+    print("Equivalence on sample resumes")
+    for index, text in enumerate(SAMPLE_RESUMES):
+        expected = legacy_extract_skills(COMMON_SKILLS, text)
+        actual = matcher.extract(text)
+        expected_pairs = {(c, s) for c, skills in expected.items() for s in skills}
+        actual_pairs = {(c, s) for c, skills in actual.items() for s in skills}
+        # The legacy \b boundaries can never match skills ending in punctuation
+        # such as "c++" or "c#" when followed by a space, so those are the
+        # only expected differences
+        extra = sorted(s for _, s in actual_pairs - expected_pairs)
+        missing = sorted(s for _, s in expected_pairs - actual_pairs)
+        status = "same" if not missing and all(not s[-1].isalnum() for s in extra) else "DIFFERENT"
+        print(f"  resume {index}: {len(actual_pairs)} skills, {status}"
+              f"{'; newly matched: ' + ', '.join(extra) if extra else ''}"
+              f"{'; missing: ' + ', '.join(missing) if missing else ''}")
+
+
+def bench_scaling():
+    """Time both approaches for growing dictionary sizes"""
+    text = "\n".join(SAMPLE_RESUMES) * TEXT_REPEAT
+    print(f"\nScaling with dictionary size (text of {len(text)} characters)")
+    print(f"  {'skills':>7} {'compile ms':>11} {'matcher ms':>11} {'legacy ms':>10} {'speedup':>8}")
+    for size in (150, 500, 1000, 2500, 5000):
+        dictionary = synthetic_dictionary(size)
+        compile_time = timeit.timeit(lambda: SkillMatcher(dictionary), number=3) / 3
+        matcher = SkillMatcher(dictionary)
+        runs = 20
+        matcher_time = timeit.timeit(lambda: matcher.extract(text), number=runs) / runs
+        legacy_runs = 3 if size <= 1000 else 1
+        legacy_time = timeit.timeit(lambda: legacy_extract_skills(dictionary, text), number=legacy_runs) / legacy_runs
+        print(f"  {size:>7} {compile_time * 1000:>11.2f} {matcher_time * 1000:>11.2f} "
+              f"{legacy_time * 1000:>10.2f} {legacy_time / matcher_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    check_equivalence()
+    bench_scaling()
@@ -0,0 +1,178 @@
+"""
+Deterministic synthetic resumes and job descriptions for the benchmarks
+
+The same seed always produces the same documents, so benchmark results
+can be compared across commits. PDF files are written by hand (one
+Helvetica text stream per page), so no PDF library is needed to build
+the corpus.
+"""
+import os
+import random
+
+from docx import Document
+
+from resume_analyzer.analyzer import COMMON_SKILLS
+
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Kim', 'Novak', 'Okafor', 'Silva', 'Larsen', 'Haddad']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Tech', 'Hooli', 'Vandelay']
+TITLES = ['Software Engineer', 'Data Scientist', 'DevOps Engineer', 'Backend Developer', 'Frontend Developer',
+          'Machine Learning Engineer', 'Site Reliability Engineer', 'Full Stack Developer']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Data Science',
+           'Bachelor of Engineering in Software Engineering', 'PhD in Machine Learning']
+SCHOOLS = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+VERBS = ['Designed', 'Built', 'Led', 'Migrated', 'Optimized', 'Automated', 'Maintained', 'Shipped', 'Scaled']
+OBJECTS = ['a payments service', 'the data pipeline', 'an internal dashboard', 'the CI pipeline',
+           'a recommendation engine', 'the public API', 'a monitoring stack', 'customer onboarding flows']
+FILLER = ['cross-functional teams', 'latency by 40%', 'weekly releases', 'on-call rotations',
+          'code reviews', 'stakeholder requirements', 'millions of requests per day', 'test coverage']
+
+ALL_SKILLS = [skill for skill_list in COMMON_SKILLS.values() for skill in skill_list]
+
+
+def resume_lines(rng, jobs=3, bullets=4, projects=0, skills=15):
+    """
+    Build the lines of a synthetic resume
+
+    Args:
+        rng (random.Random): Seeded random generator
+        jobs (int): Number of positions in the experience section
+        bullets (int): Bullet points per position
+        projects (int): Number of entries in a projects section
+        skills (int): Number of skills listed
+
+    Returns:
+        list: Lines of text
+    """
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice(TITLES),
+             "email@example.com | +1 555 0100", "", "Summary",
+             f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience in "
+             f"{', '.join(rng.sample(ALL_SKILLS, 3))}.", "", "Experience"]
+
+    year = 2024
+    for _ in range(jobs):
+        start_year = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)}")
+        lines.append(f"{rng.choice(MONTHS)} {start_year} - {rng.choice(MONTHS)} {year}")
+        for _ in range(bullets):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(ALL_SKILLS)}, "
+                         f"improving {rng.choice(FILLER)}")
+        year = start_year
+
+    if projects:
+        lines += ["", "Projects"]
+        for index in range(projects):
+            lines.append(f"Project {index + 1}: {rng.choice(VERBS)} {rng.choice(OBJECTS)} with "
+                         f"{' and '.join(rng.sample(ALL_SKILLS, 2))}")
+
+    lines += ["", "Education", rng.choice(DEGREES), f"{rng.choice(SCHOOLS)}, {year - rng.randint(0, 4)}",
+              "", "Skills", ', '.join(rng.sample(ALL_SKILLS, min(skills, len(ALL_SKILLS))))]
+    return lines
+
+
+def job_description(rng, skills=10, sentences=6):
+    """
+    Build a synthetic job description
+
+    Args:
+        rng (random.Random): Seeded random generator
+        skills (int): Number of skills the posting asks for (its skill density)
+        sentences (int): Number of filler sentences
+
+    Returns:
+        str: Job description text
+    """
+    wanted = rng.sample(ALL_SKILLS, min(skills, len(ALL_SKILLS)))
+    parts = [f"We are hiring a {rng.choice(TITLES)} at {rng.choice(COMPANIES)}."]
+    for _ in range(sentences):
+        parts.append(f"You will work on {rng.choice(OBJECTS)} with {rng.choice(FILLER)}.")
+    parts.append(f"Required skills: {', '.join(wanted)}.")
+    parts.append("Bachelor degree in Computer Science or equivalent experience.")
+    return ' '.join(parts)
+
+
+def _pdf_escape(text):
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_bytes(lines, lines_per_page=50):
+    """
+    Render lines of text as a minimal multi-page PDF
+
+    Args:
+        lines (list): Lines of text
+        lines_per_page (int): Lines on each page
+
+    Returns:
+        bytes: PDF file contents
+    """
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    page_count = len(pages)
+    font_ref = 3 + 2 * page_count
+
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(page_count))}] /Count {page_count} >>",
+    ]
+    for index, page_lines in enumerate(pages):
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 {font_ref} 0 R >> >> /Contents {4 + 2 * index} 0 R >>')
+        content = 'BT /F1 10 Tf 14 TL 50 760 Td ' + ' '.join(f'({_pdf_escape(line)}) Tj T*' for line in page_lines) + ' ET'
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\nendstream')
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(output)
+    output += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    output += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    output += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    return bytes(output)
+
+
+def write_pdf(path, lines, lines_per_page=50):
+    """Write lines of text to a PDF file"""
+    with open(path, 'wb') as f:
+        f.write(pdf_bytes(lines, lines_per_page))
+
+
+def write_docx(path, lines):
+    """Write lines of text to a DOCX file, one paragraph per line"""
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def generate_resumes(directory, count, seed=0, sizes=((3, 4, 0), (6, 6, 10), (12, 8, 40))):
+    """
+    Write a folder of synthetic resumes, alternating PDF and DOCX
+
+    Args:
+        directory (str): Output folder, created if needed
+        count (int): Number of resumes
+        seed (int): Random seed
+        sizes (tuple): (jobs, bullets per job, projects) presets cycled through for varying lengths
+
+    Returns:
+        list: Paths of the written files
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        jobs, bullets, projects = sizes[index % len(sizes)]
+        lines = resume_lines(rng, jobs=jobs, bullets=bullets, projects=projects)
+        extension = 'pdf' if index % 2 == 0 else 'docx'
+        path = os.path.join(directory, f'resume_{index:05d}.{extension}')
+        if extension == 'pdf':
+            write_pdf(path, lines)
+        else:
+            write_docx(path, lines)
+        paths.append(path)
+    return paths
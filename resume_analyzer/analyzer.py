@@ -1,41 +1,38 @@
 """
 Module for analyzing resume content and calculating match scores
 """
+import os
 import re
-import nltk
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
+import time
 import numpy as np
 
-# Download necessary NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_md")
-except OSError:
-    import sys
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "spacy", "download", "en_core_web_md"])
-    nlp = spacy.load("en_core_web_md")
-
-# Load sentence transformer model for semantic similarity
-model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+from . import models, timing
+from .chunking import chunk_text
+from .document import TOKEN_PATTERN, Document, preprocess_text
+from .embedding_cache import EmbeddingCache
+from .ranking import build_rankings, cosine_matrix, prune
+from .sections import segment
+from .skill_bits import SkillPool, SkillVocabulary, bit_count
+from .skills import SkillMatcher
+from .term_stats import TermStatistics
+
+# The spaCy pipeline and the sentence transformer are loaded on first use
+# (or at boot, see resume_analyzer.models), not when this module is imported
+MODEL_NAME = models.SENTENCE_MODEL_NAME
+
+# Cache of chunk embeddings, so the same job posting or resume is only embedded once
+embedding_cache = EmbeddingCache(
+    max_bytes=int(os.environ.get('RESUME_ANALYZER_EMBEDDING_CACHE_BYTES', 64 * 1024 * 1024)),
+    cache_dir=os.environ.get('RESUME_ANALYZER_EMBEDDING_CACHE_DIR') or None
+)
+
+# Document frequencies of the resume and job corpus, the IDF of the TF-IDF similarity.
+# Requests don't update them: they come from the saved statistics, store_resumes,
+# add_to_corpus and the seed corpus read at boot (seed_term_statistics)
+term_statistics = TermStatistics(os.environ.get('RESUME_ANALYZER_TERM_STATS_PATH') or None)
+
+# Directory of .txt documents (one resume or job posting per file) the statistics are seeded from
+TERM_STATS_SEED_DIR = os.environ.get('RESUME_ANALYZER_TERM_STATS_SEED_DIR') or None
 
 # Common skills dictionary for IT/Tech jobs
 COMMON_SKILLS = {
@@ -71,187 +68,155 @@ COMMON_SKILLS = {
     ]
 }
 
+# Compiled once so every document is matched in a single scan
+skill_matcher = SkillMatcher(COMMON_SKILLS)
+
+# Bit index of every skill, skill sets are compared as bitmasks over it
+skill_vocabulary = SkillVocabulary(COMMON_SKILLS)
+
+# Common education keywords
+EDUCATION_KEYWORDS = re.compile(
+    'bachelor|master|phd|doctorate|degree|diploma|certification|'
+    'university|college|school|institute|academy|education'
+)
+
+# Month and year, used to separate job entries
+DATE_PATTERN = re.compile(
+    r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|may|june|july|august|september|october|november|december)[\s\-]+(20\d{2}|19\d{2})',
+    re.IGNORECASE
+)
+
 def analyze_resume(resume_text):
     """
     Analyze resume text to extract key information
     
+    The extractors work on the text and its sections, the resume is not
+    parsed with spaCy.
+    
     Args:
-        resume_text (str): Text extracted from the resume
+        resume_text (str or Document): Text extracted from the resume, or its Document
         
     Returns:
         dict: Analysis results containing skills, education, experience, etc.
     """
-    # Preprocess text
-    resume_text = preprocess_text(resume_text)
+    # Tokenize once, the preprocessed text and the terms are shared by the scorers
+    document = Document.of(resume_text)
     
-    # Process with spaCy
-    doc = nlp(resume_text)
+    # Find the sections while the line structure is still there
+    with timing.span('sections'):
+        sections = segment(document.text)
     
-    # Extract skills
-    skills = extract_skills(doc, resume_text)
+    resume_text = document.normalized
+    
+    # Extract skills (anywhere in the resume, not only in the skills section),
+    # from the lowercased text that still has the punctuation of "c++" or "node.js"
+    skills = extract_skills(None, document.lower)
     
     # Extract education
-    education = extract_education(doc, resume_text)
+    education = extract_education(None, resume_text, sections=sections)
     
     # Extract work experience
-    experience = extract_experience(doc, resume_text)
+    experience = extract_experience(None, resume_text, sections=sections)
     
     # Return analysis results
     return {
         'skills': skills,
+        'skill_mask': skill_vocabulary.encode_skills(skills),
         'education': education,
         'experience': experience,
-        'full_text': resume_text
+        'sections': sections,
+        'full_text': resume_text,
+        'document': document
     }
 
-def preprocess_text(text):
+def resume_document(resume_analysis):
     """
-    Preprocess text by removing extra whitespace, converting to lowercase, etc.
+    Get the Document of an analyzed resume
     
     Args:
-        text (str): Raw text
+        resume_analysis (dict): Analysis results from analyze_resume
         
     Returns:
-        str: Preprocessed text
+        Document: The analysis' document, or one built from its preprocessed text
     """
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters
-    text = re.sub(r'[^\w\s]', ' ', text)
-    
-    return text.strip()
+    document = resume_analysis.get('document')
+    if document is None:
+        document = Document(resume_analysis['full_text'])
+    return document
 
+@timing.timed('skills')
 def extract_skills(doc, text):
     """
     Extract skills from resume text
     
+    Skills are matched in the lowercased text (Document.lower), not the
+    preprocessed one, which has lost the punctuation of skills such as
+    "c++", "c#", "node.js" or "ci/cd". Every scoring tier extracts the
+    skills of resumes and job descriptions with this function.
+    
     Args:
         doc (spacy.Doc): spaCy document
-        text (str): Preprocessed resume text
+        text (str): Lowercased resume text, with its punctuation
         
     Returns:
         dict: Dictionary of skills by category
     """
-    skills = {category: [] for category in COMMON_SKILLS}
-    
-    # Flatten the skills list
-    all_skills = []
-    for category, skill_list in COMMON_SKILLS.items():
-        all_skills.extend(skill_list)
-    
-    # Find skills in text
-    for skill in all_skills:
-        # Check for exact matches (with word boundaries)
-        if re.search(r'\\b' + re.escape(skill) + r'\\b', text):
-            # Find which category this skill belongs to
-            for category, skill_list in COMMON_SKILLS.items():
-                if skill in skill_list and skill not in skills[category]:
-                    skills[category].append(skill)
-    
-    # Return skills with counts
-    result = {}
-    for category, skill_list in skills.items():
-        if skill_list:  # Only include categories with found skills
-            result[category] = skill_list
-    
-    return result
+    return skill_matcher.extract(text)
 
-def extract_education(doc, text):
+def extract_education(doc, text, sections=None):
     """
     Extract education information from resume text
     
     Args:
         doc (spacy.Doc): spaCy document
-        text (str): Preprocessed resume text
+        text (str): Resume text
+        sections (SectionMap): Sections of the resume, built from text if not given
         
     Returns:
         list: List of education entries
     """
-    # Common education keywords
-    education_keywords = [
-        'bachelor', 'master', 'phd', 'doctorate', 'degree', 'diploma', 'certification',
-        'university', 'college', 'school', 'institute', 'academy', 'education'
-    ]
+    if sections is None:
+        sections = segment(text)
     
-    # Find education section
-    education_section = ""
-    lines = text.split('\n')
-    in_education_section = False
-    
-    for line in lines:
-        # Check if this line could be an education section header
-        if any(keyword in line for keyword in ['education', 'academic', 'qualification']):
-            in_education_section = True
-            education_section += line + "\n"
-        # If we're in the education section, add the line
-        elif in_education_section:
-            # Check if we've moved to a new section
-            if any(keyword in line for keyword in ['experience', 'skills', 'projects', 'certifications']):
-                in_education_section = False
-            else:
-                education_section += line + "\n"
+    # Lines of the education section
+    education_lines = sections.section_lines('education')
     
     # If no clear education section was found, look for education keywords throughout the text
-    if not education_section:
-        for line in lines:
-            if any(keyword in line for keyword in education_keywords):
-                education_section += line + "\n"
+    if not education_lines:
+        education_lines = sections.lines()
     
     # Extract degree information
     degrees = []
-    if education_section:
-        # Split into potential degree entries
-        entries = re.split(r'\n+', education_section)
-        for entry in entries:
-            if any(keyword in entry for keyword in education_keywords):
-                degrees.append(entry.strip())
+    for line in education_lines:
+        line = preprocess_text(line)
+        if EDUCATION_KEYWORDS.search(line):
+            degrees.append(line)
     
     return degrees
 
-def extract_experience(doc, text):
+def extract_experience(doc, text, sections=None):
     """
     Extract work experience information from resume text
     
     Args:
         doc (spacy.Doc): spaCy document
-        text (str): Preprocessed resume text
+        text (str): Resume text
+        sections (SectionMap): Sections of the resume, built from text if not given
         
     Returns:
         list: List of work experience entries
     """
-    # Common experience section keywords
-    experience_keywords = [
-        'experience', 'employment', 'work', 'job', 'career', 'professional'
-    ]
+    if sections is None:
+        sections = segment(text)
     
     # Find experience section
-    experience_section = ""
-    lines = text.split('\n')
-    in_experience_section = False
-    
-    for line in lines:
-        # Check if this line could be an experience section header
-        if any(keyword in line for keyword in experience_keywords):
-            in_experience_section = True
-            experience_section += line + "\n"
-        # If we're in the experience section, add the line
-        elif in_experience_section:
-            # Check if we've moved to a new section
-            if any(keyword in line for keyword in ['education', 'skills', 'projects', 'certifications']):
-                in_experience_section = False
-            else:
-                experience_section += line + "\n"
+    experience_section = "\n".join(preprocess_text(line) for line in sections.section_lines('experience'))
     
     # Extract job information
     jobs = []
     if experience_section:
         # Look for date patterns to separate job entries
-        date_pattern = r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|january|february|march|april|may|june|july|august|september|october|november|december)[\s\-]+(20\d{2}|19\d{2})'
-        job_entries = re.split(date_pattern, experience_section, flags=re.IGNORECASE)
+        job_entries = DATE_PATTERN.split(experience_section)
         
         # Clean up and combine entries
         for i in range(0, len(job_entries), 3):
@@ -265,103 +230,651 @@ def extract_experience(doc, text):
     
     return jobs
 
-def calculate_match_score(resume_analysis, job_description):
+class JobProfile:
     """
-    Calculate match score between resume and job description
+    Everything about a job description that does not depend on the resume.
+    
+    Build one per job posting and pass it to calculate_match_score instead of
+    the job description text: the preprocessing, skill extraction, keyword
+    parse, TF-IDF term counts and embedding of the job are then computed once
+    and reused for every applicant.
+    """
+    
+    def __init__(self, job_description, doc=None, eager=True):
+        """
+        Analyze the job description
+        
+        Args:
+            job_description (str or Document): Job description text, or its Document
+            doc (spacy.tokens.Doc): Optional parse of the preprocessed text for the
+                'keywords' stage, as made by build_job_profiles
+            eager (bool): Compute the keywords and embedding now if the models are loaded
+                (otherwise they are computed on first use, the embedding possibly together
+                with a resume by calculate_match_score)
+        """
+        self.document = Document.of(job_description)
+        self.job_description = self.document.text
+        self.text = self.document.normalized
+        self._doc = doc
+        
+        # Skills by category and flattened
+        self.skills = extract_skills(None, self.document.lower)
+        self.skills_flat = []
+        for category, skills in self.skills.items():
+            self.skills_flat.extend(skills)
+        self.skill_mask = skill_vocabulary.encode(self.skills_flat)
+        
+        # Term counts used for the TF-IDF similarity
+        self.term_counts = self.document.term_counts
+        
+        # Keywords and embedding need the models, compute them now if they are available
+        self._keywords = None
+        self._embedding = None
+        if eager:
+            self.keywords
+            self.embedding
+    
+    @property
+    def keywords(self):
+        """Keywords used by generate_suggestions (one spaCy parse), empty while spaCy is loading"""
+        if self._keywords is None and (self._doc is not None or models.get_nlp(wait=False) is not None):
+            self._keywords = extract_important_keywords(self.text, doc=self._doc)
+            self._doc = None
+        return self._keywords or []
+    
+    @property
+    def embedding(self):
+        """Averaged embedding of the job chunks, None while the sentence model is loading"""
+        if self._embedding is None:
+            try:
+                self._embedding = mean_embedding(self.job_description, wait=False)
+            except Exception:
+                self._embedding = None
+        return self._embedding
+
+def build_job_profiles(job_descriptions, batch_size=None, n_process=None):
+    """
+    Build JobProfile objects for many job descriptions, parsing them in batches with nlp.pipe
     
     Args:
-        resume_analysis (dict): Analysis results from analyze_resume
-        job_description (str): Job description text
+        job_descriptions (list): Job description texts
+        batch_size (int): Texts per nlp.pipe batch, see models.parse_many
+        n_process (int): Worker processes for nlp.pipe, see models.parse_many
         
     Returns:
-        dict: Match results including score, matching skills, missing skills, and suggestions
+        list: JobProfile objects in the same order as job_descriptions
     """
-    # Preprocess job description
-    job_description = preprocess_text(job_description)
+    documents = [Document(job_description) for job_description in job_descriptions]
+    docs = models.parse_many(
+        [document.normalized for document in documents], 'keywords',
+        batch_size=batch_size, n_process=n_process, wait=False
+    )
+    if docs is None:
+        docs = [None] * len(documents)
+    return [JobProfile(document, doc=doc) for document, doc in zip(documents, docs)]
+
+@timing.timed('embedding')
+def embed_documents(texts, wait=True):
+    """
+    Embed documents, encoding the chunks of all of them in one batched call
     
-    # Process job description with spaCy
-    job_doc = nlp(job_description)
+    Every text is split into chunks of whole sentences that fit the model's
+    maximum sequence length (see chunking.chunk_text). The chunk embeddings
+    are L2-normalized, averaged per document and normalized again.
     
-    # Extract skills from job description
-    job_skills = extract_skills(job_doc, job_description)
+    Args:
+        texts (list): Document texts, unprocessed so the sentence boundaries are kept
+        wait (bool): When False, return (None, None) instead of waiting for a model that is loading in the background
+        
+    Returns:
+        tuple: (numpy.ndarray, dict) with one normalized embedding per text, and the
+            number of chunks of every text ('chunks') and the encoding time ('encode_ms')
+    """
+    model = models.get_sentence_model(wait)
+    if model is None:
+        return None, None
+    tokenizer = getattr(model, 'tokenizer', None)
+    max_tokens = getattr(model, 'max_seq_length', None) or 128
+    
+    chunks = []
+    chunk_counts = []
+    for text in texts:
+        text_chunks = chunk_text(text, tokenizer, max_tokens)
+        chunk_counts.append(len(text_chunks))
+        chunks.extend(text_chunks or [''])
+    
+    start = time.perf_counter()
+    chunk_embeddings = embedding_cache.encode(model, chunks, MODEL_NAME, batch_size=models.EMBEDDING_BATCH_SIZE)
+    encode_ms = (time.perf_counter() - start) * 1000
+    
+    # Average the normalized chunk embeddings of every document (chunks are in document order)
+    offsets = np.cumsum([0] + [max(1, count) for count in chunk_counts[:-1]])
+    embeddings = np.add.reduceat(_normalize_rows(chunk_embeddings), offsets, axis=0) if len(texts) else chunk_embeddings
+    return _normalize_rows(embeddings), {'chunks': chunk_counts, 'encode_ms': round(encode_ms, 1)}
+
+def _normalize_rows(vectors):
+    """Scale every row to unit length (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+def mean_embedding(text, wait=True):
+    """
+    Embed one document, see embed_documents
     
-    # Flatten job skills
-    job_skills_flat = []
-    for category, skills in job_skills.items():
-        job_skills_flat.extend(skills)
+    Args:
+        text (str): Document text
+        wait (bool): When False, return None instead of waiting for a model that is loading in the background
+        
+    Returns:
+        numpy.ndarray: Normalized embedding, or None if the model is not ready
+    """
+    embeddings, _ = embed_documents([text], wait)
+    return None if embeddings is None else embeddings[0]
+
+def mean_embeddings(texts, wait=True):
+    """
+    Embed many documents, see embed_documents
     
-    # Flatten resume skills
-    resume_skills_flat = []
-    for category, skills in resume_analysis['skills'].items():
-        resume_skills_flat.extend(skills)
+    Args:
+        texts (list): Document texts
+        wait (bool): When False, return None instead of waiting for a model that is loading in the background
+        
+    Returns:
+        numpy.ndarray: One normalized embedding per text, or None if the model is not ready
+    """
+    embeddings, _ = embed_documents(texts, wait)
+    return embeddings
+
+def embedding_text(resume_analysis):
+    """
+    Get the text of a resume analysis to embed: the extracted text, which
+    keeps the sentence boundaries, or the preprocessed text if it is missing
     
-    # Find matching and missing skills
-    skills_found = [skill for skill in job_skills_flat if skill in resume_skills_flat]
-    skills_missing = [skill for skill in job_skills_flat if skill not in resume_skills_flat]
+    Args:
+        resume_analysis (dict): Analysis results from analyze_resume
+        
+    Returns:
+        str: Text for embed_documents
+    """
+    sections = resume_analysis.get('sections')
+    return getattr(sections, 'text', None) or resume_analysis['full_text']
+
+def skill_mask(resume_analysis):
+    """
+    Get the skill bitmask of a resume analysis
     
-    # Calculate skill match percentage
-    skill_match_percentage = 0
-    if job_skills_flat:
-        skill_match_percentage = (len(skills_found) / len(job_skills_flat)) * 100
+    Args:
+        resume_analysis (dict): Analysis results from analyze_resume
+        
+    Returns:
+        int: Bitmask over skill_vocabulary
+    """
+    mask = resume_analysis.get('skill_mask')
+    if mask is None:
+        mask = skill_vocabulary.encode_skills(resume_analysis['skills'])
+    return mask
+
+def calculate_match_score(resume_analysis, job_description, semantic=True):
+    """
+    Calculate match score between resume and job description
     
-    # Calculate semantic similarity between resume and job description
-    resume_text = resume_analysis['full_text']
+    Args:
+        resume_analysis (dict): Analysis results from analyze_resume
+        job_description (str or JobProfile): Job description text, or a profile built from it
+        semantic (bool): Include the sentence model similarity and the keyword suggestions;
+            when False only the skill and TF-IDF scores are computed and no model is used
+        
+    Returns:
+        dict: Match results including score, matching skills, missing skills, and suggestions
+    """
+    job_profile = job_description if isinstance(job_description, JobProfile) else JobProfile(job_description, eager=False)
+    job_mask = job_profile.skill_mask
     
-    # TF-IDF vectorization and cosine similarity
-    tfidf_vectorizer = TfidfVectorizer(stop_words='english')
-    try:
-        tfidf_matrix = tfidf_vectorizer.fit_transform([resume_text, job_description])
-        tfidf_similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100
-    except:
-        tfidf_similarity = 0
+    # Resume skills as a bitmask
+    resume_mask = skill_mask(resume_analysis)
     
-    # Semantic similarity using sentence transformers
-    try:
-        # Split texts into chunks to handle long texts
-        resume_chunks = [resume_text[i:i+512] for i in range(0, len(resume_text), 512)]
-        job_chunks = [job_description[i:i+512] for i in range(0, len(job_description), 512)]
-        
-        # Get embeddings
-        resume_embeddings = model.encode(resume_chunks)
-        job_embeddings = model.encode(job_chunks)
-        
-        # Average embeddings
-        resume_embedding = np.mean(resume_embeddings, axis=0)
-        job_embedding = np.mean(job_embeddings, axis=0)
-        
-        # Calculate cosine similarity
-        semantic_similarity = cosine_similarity(
-            [resume_embedding], 
-            [job_embedding]
-        )[0][0] * 100
-    except:
-        semantic_similarity = 0
+    # Find matching and missing skills
+    skills_found = skill_vocabulary.decode(job_mask & resume_mask)
+    skills_missing = skill_vocabulary.decode(job_mask & ~resume_mask)
+    
+    # Calculate skill match percentage
+    skill_match_percentage = 0
+    if job_mask:
+        skill_match_percentage = (len(skills_found) / bit_count(job_mask)) * 100
+    
+    # TF-IDF cosine similarity with the corpus IDF
+    with timing.span('tfidf'):
+        resume_counts = resume_document(resume_analysis).term_counts
+        tfidf_vectors = term_statistics.transform([job_profile.term_counts, resume_counts])
+        tfidf_similarity = float(term_statistics.similarity(tfidf_vectors[0], tfidf_vectors[1])[0, 0])
+    
+    # Semantic similarity using sentence transformers, None while the model is loading.
+    # The resume chunks, and the job chunks unless the profile already has its
+    # embedding, are encoded in one batch
+    embedding_stats = None
+    semantic_similarity = None
+    if semantic:
+        try:
+            texts = [embedding_text(resume_analysis)]
+            if job_profile._embedding is None:
+                texts.append(job_profile.job_description)
+            embeddings, stats = embed_documents(texts, wait=False)
+            if embeddings is not None:
+                if len(texts) == 2:
+                    job_profile._embedding = embeddings[1]
+                embedding_stats = {
+                    'resume_chunks': stats['chunks'][0],
+                    'job_chunks': stats['chunks'][1] if len(texts) == 2 else 0,
+                    'encode_ms': stats['encode_ms']
+                }
+                # Calculate cosine similarity
+                semantic_similarity = float(cosine_matrix(embeddings[:1], job_profile._embedding[None, :])[0, 0])
+        except:
+            semantic_similarity = 0
     
     # Combine scores (weighted average)
-    match_percentage = (0.4 * skill_match_percentage) + (0.3 * tfidf_similarity) + (0.3 * semantic_similarity)
+    if semantic_similarity is None:
+        # Lexical-only score until the sentence model is ready (or when it is not wanted)
+        match_percentage = ((0.4 * skill_match_percentage) + (0.3 * tfidf_similarity)) / 0.7
+    else:
+        match_percentage = (0.4 * skill_match_percentage) + (0.3 * tfidf_similarity) + (0.3 * semantic_similarity)
     match_percentage = min(100, max(0, match_percentage))  # Ensure between 0-100
     
     # Generate suggestions
-    suggestions = generate_suggestions(skills_missing, resume_analysis, job_description)
+    suggestions = generate_suggestions(skills_missing, resume_analysis, job_profile, keywords=semantic)
     
     return {
         'match_percentage': round(match_percentage, 1),
         'skill_match_percentage': round(skill_match_percentage, 1),
         'tfidf_similarity': round(tfidf_similarity, 1),
-        'semantic_similarity': round(semantic_similarity, 1),
+        'semantic_similarity': round(semantic_similarity, 1) if semantic_similarity is not None else None,
         'skills_found': skills_found,
         'skills_missing': skills_missing,
-        'suggestions': suggestions
+        'suggestions': suggestions,
+        'embedding_stats': embedding_stats
+    }
+
+def rank_matches(resume_analyses, job_descriptions, top_k=5, semantic=True, resume_ids=None,
+                 cascade=False, min_score=None):
+    """
+    Score every resume against every job description in one pass
+    
+    Each document is preprocessed, skill-matched and embedded once, and the
+    score matrices are computed with matrix products instead of a
+    calculate_match_score call per pair. The TF-IDF similarity uses the
+    corpus IDF of term_statistics, like calculate_match_score.
+    
+    In cascade mode the stages run from cheapest to most expensive (skills,
+    TF-IDF, embeddings). After each stage the pairs whose highest possible
+    score can no longer reach min_score, nor the top_k of their job or of
+    their resume, are dropped, and the next stage only runs for the resumes
+    left in some pair. The rankings per job and per resume are the same as
+    without the cascade, apart from the matches below min_score; scores
+    that were not computed are NaN.
+    
+    Args:
+        resume_analyses (list): Analysis results from analyze_resume, one per resume
+        job_descriptions (list): Job description texts or JobProfile objects
+        top_k (int): Number of entries in each ranking
+        semantic (bool): Include the sentence model similarity, see calculate_match_score
+        resume_ids (list): Optional id of every resume used in the rankings instead of its position
+        cascade (bool): Skip the TF-IDF and embedding stages for pairs that cannot make the rankings
+        min_score (float): With cascade, also skip pairs that cannot reach this match percentage
+        
+    Returns:
+        dict: Score matrices of shape (jobs, resumes) and top-k rankings per job and per resume,
+            plus the number of resumes and pairs each stage pruned ('cascade') in cascade mode
+    """
+    # While the sentence model is loading in the background, score with the
+    # lexical components only (decided up front, the cascade bounds depend on it)
+    if semantic and models.get_sentence_model(wait=False) is None:
+        semantic = False
+    
+    job_profiles = [job if isinstance(job, JobProfile) else None for job in job_descriptions]
+    job_documents = [
+        profile.document if profile else Document(job)
+        for profile, job in zip(job_profiles, job_descriptions)
+    ]
+    job_sources = [
+        profile.job_description if profile else job
+        for profile, job in zip(job_profiles, job_descriptions)
+    ]
+    resume_sources = [embedding_text(analysis) for analysis in resume_analyses]
+    
+    # Skill match percentage
+    job_skill_masks = [
+        profile.skill_mask if profile else skill_vocabulary.encode_skills(extract_skills(None, document.lower))
+        for profile, document in zip(job_profiles, job_documents)
+    ]
+    resume_pool = SkillPool.from_masks(skill_vocabulary, [skill_mask(analysis) for analysis in resume_analyses])
+    skill_scores = resume_pool.coverage_matrix(job_skill_masks)
+    
+    # Pairs still in the running, and the resumes in at least one of them
+    keep = np.ones(skill_scores.shape, dtype=bool)
+    pruned = {}
+    if cascade:
+        keep = prune(*_score_bounds(skill_scores, None, semantic), keep, top_k, min_score)
+        pruned['skills'] = _pruned_counts(np.ones_like(keep), keep)
+    resume_rows = np.flatnonzero(keep.any(axis=0))
+    
+    # TF-IDF cosine similarity with the corpus IDF
+    job_counts = [document.term_counts for document in job_documents]
+    resume_counts = [resume_document(resume_analyses[row]).term_counts for row in resume_rows]
+    tfidf_scores = np.full(skill_scores.shape, np.nan)
+    space = term_statistics.column_space()
+    tfidf_scores[:, resume_rows] = term_statistics.similarity(
+        term_statistics.transform(job_counts, space), term_statistics.transform(resume_counts, space)
+    )
+    
+    if cascade and semantic:
+        previous = keep
+        keep = prune(*_score_bounds(skill_scores, tfidf_scores, semantic), keep, top_k, min_score)
+        pruned['tfidf'] = _pruned_counts(previous, keep)
+        resume_rows = np.flatnonzero(keep.any(axis=0))
+    job_rows = np.flatnonzero(keep.any(axis=1))
+    
+    # Semantic similarity, encoding the chunks of all documents in one call
+    semantic_scores = None
+    try:
+        embeddings = None
+        if semantic:
+            embeddings = mean_embeddings(
+                [job_sources[row] for row in job_rows] + [resume_sources[row] for row in resume_rows], wait=False
+            )
+        if embeddings is not None:
+            semantic_scores = np.full(skill_scores.shape, np.nan)
+            semantic_scores[np.ix_(job_rows, resume_rows)] = cosine_matrix(
+                embeddings[:len(job_rows)], embeddings[len(job_rows):]
+            )
+    except Exception:
+        semantic_scores = np.zeros_like(skill_scores)
+    
+    # Combine scores (weighted average), same weights as calculate_match_score
+    if semantic_scores is None:
+        scores = np.clip(((0.4 * skill_scores) + (0.3 * tfidf_scores)) / 0.7, 0, 100)
+    else:
+        scores = np.clip((0.4 * skill_scores) + (0.3 * tfidf_scores) + (0.3 * semantic_scores), 0, 100)
+    
+    result = {
+        'match_percentage': scores,
+        'skill_match_percentage': skill_scores,
+        'tfidf_similarity': tfidf_scores,
+        'semantic_similarity': semantic_scores
+    }
+    if cascade:
+        result['cascade'] = {'resumes': len(resume_analyses), 'pairs': int(keep.size), 'pruned': pruned}
+    result.update(build_rankings(scores, top_k, resume_ids=resume_ids))
+    return result
+
+def _score_bounds(skill_scores, tfidf_scores, semantic):
+    """
+    Lowest and highest match percentage of every pair given the similarities computed so far
+    
+    The similarities not computed yet (TF-IDF if tfidf_scores is None, and the
+    semantic one if semantic) can be anything between 0 and 100.
+    """
+    known = 0.4 * skill_scores
+    remaining = 0.3 if semantic else 0
+    if tfidf_scores is None:
+        remaining += 0.3
+    else:
+        known = known + 0.3 * tfidf_scores
+    # Same weights as the combined score, rescaled without the semantic similarity
+    total = 1.0 if semantic else 0.7
+    return np.clip(known / total, 0, 100), np.clip((known + remaining * 100) / total, 0, 100)
+
+def _pruned_counts(previous, keep):
+    """Number of resumes and pairs a cascade stage dropped, given the pairs kept before and after it"""
+    return {
+        'resumes': int(previous.any(axis=0).sum() - keep.any(axis=0).sum()),
+        'pairs': int(previous.sum() - keep.sum())
     }
 
-def generate_suggestions(missing_skills, resume_analysis, job_description):
+def store_resumes(store, resume_texts, names=None, index=None):
+    """
+    Analyze resumes and save their features in a CandidateStore
+    
+    Resumes whose text is already stored are skipped, so a talent pool can
+    be added to incrementally. New resumes are also added to the corpus
+    term statistics. Candidates stored while the sentence model was still
+    loading get their embedding on a later call.
+    
+    Args:
+        store (CandidateStore): Store to write to
+        resume_texts (list): Texts extracted from the resumes
+        names (list): Optional display names (e.g. file names), one per resume
+        index (EmbeddingIndex): Optional index that also receives the new embeddings
+        
+    Returns:
+        list: Store keys of the resumes, in input order
+    """
+    names = names or [None] * len(resume_texts)
+    keys = [store.make_key(text) for text in resume_texts]
+    
+    # Analyze each new text once, even if it appears twice in the batch
+    new = {}
+    for key, text, name in zip(keys, resume_texts, names):
+        if key not in new:
+            new[key] = (text, name)
+    new_keys = store.missing(new)
+    
+    if new_keys:
+        texts = [new[key][0] for key in new_keys]
+        analyses = [analyze_resume(text) for text in texts]
+        embeddings = mean_embeddings(texts, wait=False)
+        
+        term_counts = [analysis['document'].term_counts for analysis in analyses]
+        store.put_many(
+            {
+                'id': key,
+                'name': new[key][1],
+                'text': text,
+                'skills': [skill for skills in analysis['skills'].values() for skill in skills],
+                'sections': analysis['sections'].to_dict(),
+                'term_counts': term_counts[row],
+                'embedding': embeddings[row] if embeddings is not None else None
+            }
+            for row, (key, text, analysis) in enumerate(zip(new_keys, texts, analyses))
+        )
+        term_statistics.add_documents(term_counts)
+        term_statistics.save()
+        if index is not None and embeddings is not None:
+            index.add(new_keys, embeddings)
+    
+    # Fill in the embeddings that could not be computed earlier
+    pending = store.without_embedding()
+    if pending and models.get_sentence_model(wait=False) is not None:
+        texts = [store.get(key)['text'] for key in pending]
+        embeddings = mean_embeddings(texts)
+        store.set_embeddings(pending, embeddings)
+        if index is not None:
+            index.add(pending, embeddings)
+    
+    return keys
+
+def add_to_corpus(texts):
+    """
+    Add documents (e.g. job postings) to the corpus term statistics
+    
+    store_resumes already adds the resumes it stores; use this for job
+    descriptions and for seeding the statistics from an existing corpus.
+    
+    Args:
+        texts (list): Raw document texts
+    """
+    term_statistics.add_documents(Document(text).term_counts for text in texts)
+    term_statistics.save()
+
+def seed_term_statistics(directory=None):
+    """
+    Seed empty corpus term statistics from a directory of text documents
+    
+    Called by the entry points at boot. The documents that arrive at /analyze
+    and /rank are not added to the statistics, since every update changes the
+    tfidf and semantic scorer versions and with them the result cache keys.
+    Statistics that already hold documents (loaded from
+    RESUME_ANALYZER_TERM_STATS_PATH) are left as they are.
+    
+    Args:
+        directory (str): Directory of .txt files, one document each, defaults to TERM_STATS_SEED_DIR
+        
+    Returns:
+        int: Number of documents added
+    """
+    directory = directory or TERM_STATS_SEED_DIR
+    if directory is None or term_statistics.n_documents:
+        return 0
+    
+    texts = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith('.txt'):
+            with open(os.path.join(directory, name), encoding='utf-8', errors='replace') as f:
+                texts.append(f.read())
+    if texts:
+        add_to_corpus(texts)
+    return len(texts)
+
+# Skill pool of the most recently loaded store contents, rebuilt when the store changes
+_stored_skill_pool = (None, None)
+
+def _skill_pool(stored):
+    """Get the SkillPool of a StoredCandidates result, building it once per load"""
+    global _stored_skill_pool
+    loaded, pool = _stored_skill_pool
+    if loaded is not stored:
+        pool = SkillPool(skill_vocabulary, stored.skill_sets)
+        _stored_skill_pool = (stored, pool)
+    return pool
+
+# TF-IDF vectors of the most recently loaded store contents and their column
+# space, rebuilt when the store or the term statistics change
+_stored_tfidf = (None, None, None, None)
+
+def _tfidf_vectors(stored):
+    """
+    Get the TF-IDF vectors of a StoredCandidates result, building them once per load
+    
+    Returns:
+        tuple: (vectors, space), job descriptions are compared in a copy of the space
+    """
+    global _stored_tfidf
+    loaded, version, vectors, space = _stored_tfidf
+    if loaded is not stored or version != term_statistics.version:
+        version = term_statistics.version
+        space = term_statistics.column_space()
+        vectors = term_statistics.transform_matrix(stored.term_counts, stored.vocabulary, space)
+        _stored_tfidf = (stored, version, vectors, space)
+    return vectors, space
+
+def rank_stored(store, job_descriptions, top_k=5, all_of=(), any_of=(), none_of=()):
+    """
+    Score every candidate of a CandidateStore against job descriptions
+    
+    Only the precomputed features of the candidates are read, nothing is
+    parsed or embedded again. The TF-IDF similarity uses the corpus IDF, like
+    calculate_match_score. Candidates stored without an embedding get the
+    lexical-only score.
+    
+    Candidates can first be filtered with a boolean skill query, e.g.
+    all_of=['python'], any_of=['aws', 'gcp'], which runs on the skill bit
+    matrix before anything is scored.
+    
+    Args:
+        store (CandidateStore): Store filled by store_resumes
+        job_descriptions (list): Job description texts or JobProfile objects
+        top_k (int): Number of entries in each ranking
+        all_of (iterable): Skills a candidate must all have
+        any_of (iterable): Skills of which a candidate must have at least one
+        none_of (iterable): Skills a candidate must not have
+        
+    Returns:
+        dict: Score matrices of shape (jobs, candidates), top-k rankings per job
+            and per candidate (candidates are identified by their store key),
+            and the candidate names
+    """
+    stored = store.load()
+    skill_pool = _skill_pool(stored)
+    
+    # Keep the candidates matching the skill query
+    selected = np.flatnonzero(skill_pool.query(all_of, any_of, none_of))
+    skill_pool = skill_pool.subset(selected)
+    candidate_ids = [stored.ids[index] for index in selected]
+    candidate_names = [stored.names[index] for index in selected]
+    has_embedding = stored.has_embedding[selected]
+    
+    # Profiles of plain job description texts are built together, in one nlp.pipe batch
+    built = iter(build_job_profiles([job for job in job_descriptions if not isinstance(job, JobProfile)]))
+    job_profiles = [job if isinstance(job, JobProfile) else next(built) for job in job_descriptions]
+    
+    # Skill match percentage
+    skill_scores = skill_pool.coverage_matrix([profile.skill_mask for profile in job_profiles])
+    
+    # TF-IDF cosine similarity with the corpus IDF, the candidate vectors are
+    # only rebuilt when the store or the statistics change
+    candidate_vectors, space = _tfidf_vectors(stored)
+    tfidf_scores = term_statistics.similarity(
+        term_statistics.transform([profile.term_counts for profile in job_profiles], space.copy()),
+        candidate_vectors[selected]
+    )
+    
+    # Semantic similarity against the stored embeddings
+    job_embeddings = [profile.embedding for profile in job_profiles]
+    semantic_scores = None
+    if stored.embeddings is not None and all(embedding is not None for embedding in job_embeddings):
+        semantic_scores = cosine_matrix(np.vstack(job_embeddings), stored.embeddings[selected])
+    
+    # Combine scores (weighted average), same weights as calculate_match_score
+    lexical_scores = np.clip(((0.4 * skill_scores) + (0.3 * tfidf_scores)) / 0.7, 0, 100)
+    if semantic_scores is None:
+        scores = lexical_scores
+    else:
+        scores = np.clip((0.4 * skill_scores) + (0.3 * tfidf_scores) + (0.3 * semantic_scores), 0, 100)
+        scores[:, ~has_embedding] = lexical_scores[:, ~has_embedding]
+        semantic_scores[:, ~has_embedding] = np.nan
+    
+    result = {
+        'match_percentage': scores,
+        'skill_match_percentage': skill_scores,
+        'tfidf_similarity': tfidf_scores,
+        'semantic_similarity': semantic_scores,
+        'candidates': candidate_names
+    }
+    result.update(build_rankings(scores, top_k, resume_ids=candidate_ids))
+    return result
+
+def semantic_search(index, job_descriptions, k=10, n_probe=None):
+    """
+    Find the stored resumes closest in meaning to job descriptions
+    
+    Only the job embeddings are computed; the resumes are looked up in an
+    EmbeddingIndex filled by store_resumes(..., index=index). This is the
+    quick way to shortlist candidates from a large pool before rank_stored.
+    
+    Args:
+        index (EmbeddingIndex): Index of resume embeddings
+        job_descriptions (list): Job description texts or JobProfile objects
+        k (int): Number of resumes per job
+        n_probe (int): Partitions to scan if the index is partitioned, None for an exact search
+        
+    Returns:
+        list: For every job, a list of (resume key, similarity between 0 and 100), best first
+    """
+    job_texts = [job.job_description if isinstance(job, JobProfile) else job for job in job_descriptions]
+    job_embeddings = mean_embeddings(job_texts)
+    results = index.search(job_embeddings, k=k, n_probe=n_probe)
+    return [[(key, similarity * 100) for key, similarity in result] for result in results]
+
+@timing.timed('suggestions')
+def generate_suggestions(missing_skills, resume_analysis, job_description, keywords=True):
     """
     Generate improvement suggestions based on missing skills and other factors
     
     Args:
         missing_skills (list): Skills missing from the resume
         resume_analysis (dict): Analysis results from analyze_resume
-        job_description (str): Job description text
+        job_description (str or JobProfile): Job description text, or a profile built from it
+        keywords (bool): Also suggest job description keywords missing from the resume
+            (needs a spaCy parse of the job description)
         
     Returns:
         list: List of suggestions for improving the resume
@@ -383,13 +896,14 @@ def generate_suggestions(missing_skills, resume_analysis, job_description):
         suggestions.append("Include your work experience with detailed responsibilities")
     
     # Check for keywords in job description that might be missing from resume
-    job_keywords = extract_important_keywords(job_description)
-    resume_text = resume_analysis['full_text']
-    
-    missing_keywords = []
-    for keyword in job_keywords:
-        if keyword.lower() not in resume_text.lower():
-            missing_keywords.append(keyword)
+    if not keywords:
+        job_keywords = []
+    elif isinstance(job_description, JobProfile):
+        job_keywords = job_description.keywords
+    else:
+        job_keywords = extract_important_keywords(job_description)
+    document = resume_document(resume_analysis)
+    missing_keywords = [keyword for keyword in job_keywords if not _has_keyword(document, keyword)]
     
     if missing_keywords:
         suggestions.append(f"Consider adding these keywords from the job description: {', '.join(missing_keywords[:5])}")
@@ -398,18 +912,38 @@ def generate_suggestions(missing_skills, resume_analysis, job_description):
     
     return suggestions
 
-def extract_important_keywords(text):
+def _has_keyword(document, keyword):
+    """
+    Tell whether a resume contains a job description keyword
+    
+    The keyword is tokenized like the resume and every token is looked up in
+    its distinct terms. Keywords that are not a single plain token ("node.js",
+    "c++", "machine learning") are then searched in the lowercased text, with
+    any run of whitespace between their words.
+    """
+    keyword = keyword.lower()
+    terms = TOKEN_PATTERN.findall(keyword)
+    if not document.term_set.issuperset(terms):
+        return False
+    if terms == [keyword]:
+        return True
+    pattern = r'\s+'.join(re.escape(part) for part in keyword.split())
+    return re.search(pattern, document.lower) is not None
+
+def extract_important_keywords(text, doc=None):
     """
     Extract important keywords from text using TF-IDF
     
     Args:
         text (str): Text to extract keywords from
+        doc (spacy.tokens.Doc): Optional existing parse of text for the 'keywords' stage
         
     Returns:
         list: List of important keywords
     """
-    # Process with spaCy
-    doc = nlp(text)
+    # Process with spaCy, tagging only (no dependency parse or entities)
+    if doc is None:
+        doc = models.parse(text, 'keywords')
     
     # Extract nouns and proper nouns
     keywords = []
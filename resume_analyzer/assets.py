@@ -0,0 +1,184 @@
+"""
+Module for the NLP asset bundle shipped with the package
+
+The stopword lists the scorers need (NLTK's, and scikit-learn's for the
+TF-IDF terms) are read from a JSON bundle in the package
+(resume_analyzer/data/nlp_assets.json) instead of being downloaded with
+nltk.download() at startup, so a fresh process (e.g. a serverless cold
+start) needs no network access and imports neither NLTK nor scikit-learn.
+
+The bundle has a format number, checked when it is loaded, and a content
+version (a digest of its data). Rebuild it from the installed NLTK data and
+scikit-learn with:
+
+    python -m resume_analyzer.assets [--output PATH]
+
+Set RESUME_ANALYZER_ASSET_BUNDLE to the path of another bundle, or to "none"
+to read the lists from NLTK's stopwords corpus and scikit-learn instead.
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+# Bumped when the layout of the bundle changes; bundles of another format are ignored
+BUNDLE_FORMAT = 1
+
+DEFAULT_BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'nlp_assets.json')
+
+BUNDLE_PATH = os.environ.get('RESUME_ANALYZER_ASSET_BUNDLE', DEFAULT_BUNDLE_PATH)
+
+# Languages of the stopword lists written by build_bundle
+LANGUAGES = ('english',)
+
+_bundle = None
+_stopwords = {}
+_lock = threading.Lock()
+
+
+def load_bundle(path=None):
+    """
+    Read the asset bundle, once per process for the default path
+
+    Args:
+        path (str): Bundle file, BUNDLE_PATH if not given
+
+    Returns:
+        dict: Bundle contents, or None if bundles are disabled, the file is
+            missing or it has another format
+    """
+    global _bundle
+    if path is None and _bundle is not None:
+        return _bundle or None
+
+    bundle_path = path or BUNDLE_PATH
+    bundle = {}
+    if bundle_path and bundle_path.lower() != 'none':
+        try:
+            with open(bundle_path) as f:
+                data = json.load(f)
+            if data.get('format') == BUNDLE_FORMAT:
+                bundle = data
+            else:
+                print(f"Ignoring asset bundle {bundle_path}: format {data.get('format')}, expected {BUNDLE_FORMAT}")
+        except (OSError, ValueError) as e:
+            print(f"Error reading asset bundle {bundle_path}: {e}")
+
+    if path is None:
+        _bundle = bundle
+    return bundle or None
+
+
+def stopwords(language='english'):
+    """
+    Get a stopword list, from the bundle or else from NLTK's corpus
+
+    Args:
+        language (str): Language of the list
+
+    Returns:
+        frozenset: Stopwords, empty if neither source has the language
+    """
+    return _get_stopwords(
+        ('nltk', language), lambda bundle: bundle['stopwords'].get(language), lambda: _nltk_stopwords(language)
+    )
+
+
+def tfidf_stopwords():
+    """
+    Get the stop words of the TF-IDF terms (scikit-learn's English list), from the
+    bundle or else from scikit-learn
+
+    Returns:
+        frozenset: Stop words
+    """
+    return _get_stopwords(('tfidf', 'english'), lambda bundle: bundle.get('tfidf_stopwords'), _sklearn_stopwords)
+
+
+def _get_stopwords(key, from_bundle, fallback):
+    """Stopwords cached under key, read with from_bundle(bundle) or else fallback()"""
+    words = _stopwords.get(key)
+    if words is not None:
+        return words
+
+    with _lock:
+        if key in _stopwords:
+            return _stopwords[key]
+        bundle = load_bundle()
+        words = from_bundle(bundle) if bundle is not None else None
+        words = frozenset(words) if words is not None else fallback()
+        if words is None:
+            # Retried on the next call, the corpus may be installed later
+            return frozenset()
+        _stopwords[key] = words
+        return words
+
+
+def _nltk_stopwords(language):
+    """Stopwords from NLTK's installed corpus, None if it is not available"""
+    try:
+        from nltk.corpus import stopwords as corpus
+
+        return frozenset(corpus.words(language))
+    except Exception as e:  # LookupError when the corpus is not downloaded
+        print(f"Error with stopwords: {e}")
+        return None
+
+
+def _sklearn_stopwords():
+    """scikit-learn's English stop words, used by TfidfVectorizer(stop_words='english')"""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    return frozenset(ENGLISH_STOP_WORDS)
+
+
+def build_bundle(path=None, languages=LANGUAGES):
+    """
+    Write a bundle from the installed NLTK data and scikit-learn
+
+    Args:
+        path (str): Output file, DEFAULT_BUNDLE_PATH if not given
+        languages (iterable): Languages of the stopword lists to include
+
+    Returns:
+        dict: Bundle contents
+    """
+    from nltk.corpus import stopwords as corpus
+
+    data = {
+        'stopwords': {language: sorted(set(corpus.words(language))) for language in languages},
+        'tfidf_stopwords': sorted(_sklearn_stopwords()),
+    }
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    bundle = {
+        'format': BUNDLE_FORMAT,
+        'version': digest,
+        'source': 'nltk stopwords corpus, scikit-learn ENGLISH_STOP_WORDS',
+    }
+    bundle.update(data)
+
+    path = path or DEFAULT_BUNDLE_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(bundle, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the NLP asset bundle from the installed NLTK data and scikit-learn")
+    parser.add_argument('--output', default=DEFAULT_BUNDLE_PATH, help="bundle file to write")
+    parser.add_argument('--languages', nargs='+', default=list(LANGUAGES), help="stopword lists to include")
+    args = parser.parse_args()
+
+    bundle = build_bundle(args.output, args.languages)
+    counts = ', '.join(f"{language}: {len(words)}" for language, words in bundle['stopwords'].items())
+    counts += f", tfidf: {len(bundle['tfidf_stopwords'])}"
+    print(f"wrote {args.output} (version {bundle['version']}; {counts} stopwords)")
+
+
+if __name__ == '__main__':
+    main()
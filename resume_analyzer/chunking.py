@@ -0,0 +1,80 @@
+"""
+Module for splitting texts into chunks that fit the sentence model
+"""
+import re
+
+import numpy as np
+
+# A sentence starts after ., ! or ? followed by whitespace, or on a new line
+SENTENCE_START = re.compile(r'(?:[.!?]\s+|\n\s*)(?=\S)')
+
+# Tokens reserved for the [CLS] and [SEP] tokens the model adds to every chunk
+SPECIAL_TOKENS = 2
+
+# Without a tokenizer, words are counted instead of tokens; word pieces make a
+# word about 1.3 tokens on average, so the word budget is scaled down
+WORDS_PER_TOKEN = 0.75
+
+
+def token_spans(text, tokenizer=None):
+    """
+    Find the character span of every token of a text
+
+    Args:
+        text (str): Text to tokenize
+        tokenizer: Fast Hugging Face tokenizer (with offset mappings), or None to use words
+
+    Returns:
+        numpy.ndarray: (start, end) character offsets of shape (tokens, 2)
+    """
+    if tokenizer is not None and getattr(tokenizer, 'is_fast', False):
+        offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True,
+                            truncation=False, verbose=False)['offset_mapping']
+        return np.array(offsets, dtype=np.int64).reshape(-1, 2)
+    return np.array([match.span() for match in re.finditer(r'\S+', text)], dtype=np.int64).reshape(-1, 2)
+
+
+def chunk_text(text, tokenizer=None, max_tokens=128):
+    """
+    Split text into chunks of at most max_tokens model tokens
+
+    Whole sentences are packed into each chunk. A chunk only ends inside a
+    sentence if that sentence alone is too long, and then between words,
+    so words are never cut (unless a single word exceeds the limit).
+
+    Args:
+        text (str): Text to split
+        tokenizer: Tokenizer of the sentence model, or None to estimate tokens from words
+        max_tokens (int): Maximum sequence length of the model, special tokens included
+
+    Returns:
+        list: Chunk texts, with whitespace normalized
+    """
+    spans = token_spans(text, tokenizer)
+    if len(spans) == 0:
+        return []
+
+    budget = max(1, max_tokens - SPECIAL_TOKENS)
+    if tokenizer is None or not getattr(tokenizer, 'is_fast', False):
+        budget = max(1, int(budget * WORDS_PER_TOKEN))
+
+    # Where a chunk may end: before a token starting a sentence (best) or a word
+    starts = spans[:, 0]
+    sentence_starts = np.isin(starts, [match.end() for match in SENTENCE_START.finditer(text)])
+    word_starts = np.array([start == 0 or text[start - 1].isspace() for start in starts])
+
+    chunks = []
+    first = 0
+    while first < len(spans):
+        end = min(first + budget, len(spans))
+        if end < len(spans):
+            for breaks in (sentence_starts, word_starts):
+                candidates = np.flatnonzero(breaks[first + 1:end + 1])
+                if len(candidates):
+                    end = first + 1 + candidates[-1]
+                    break
+        chunk = ' '.join(text[starts[first]:spans[end - 1, 1]].split())
+        if chunk:
+            chunks.append(chunk)
+        first = end
+    return chunks
@@ -0,0 +1,117 @@
+"""
+Module for the tokenized form of a resume or job description
+
+A Document tokenizes its text once and derives from the tokens every view
+the scorers compare: the normalized text, the distinct terms, the content
+words (without NLTK's English stopwords) and the TF-IDF term counts. Each
+view is computed on first use and kept, so the lexical word overlap, the
+TF-IDF similarity and the keyword suggestions of one text share a single
+tokenization.
+"""
+import re
+from collections import Counter
+
+from . import assets, timing
+
+# Words of a lowercased text; the TF-IDF terms are the ones with at least two
+# characters, as with scikit-learn's default token pattern (\b\w\w+\b)
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def preprocess_text(text):
+    """
+    Preprocess text by removing extra whitespace, converting to lowercase, etc.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Preprocessed text
+    """
+    return _normalize(text.lower())
+
+
+def _normalize(text):
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text)
+
+    # Remove special characters
+    text = re.sub(r'[^\w\s]', ' ', text)
+
+    return text.strip()
+
+
+class Document:
+    """
+    A text tokenized once, with the views of it the scorers need.
+
+    Attributes:
+        text (str): Original text, with its line structure
+        lower (str): Lowercased text
+        tokens (list): Words of the lowercased text, in order
+    """
+
+    def __init__(self, text):
+        """
+        Tokenize the text
+
+        Args:
+            text (str): Resume or job description text
+        """
+        self.text = text
+        self.lower = text.lower()
+        with timing.span('tokenize'):
+            self.tokens = TOKEN_PATTERN.findall(self.lower)
+        self._normalized = None
+        self._term_set = None
+        self._content_words = None
+        self._term_counts = None
+
+    @classmethod
+    def of(cls, text):
+        """
+        Get the Document of a text, or the Document itself
+
+        Args:
+            text (str or Document): Text or an existing Document
+
+        Returns:
+            Document: Document of the text
+        """
+        return text if isinstance(text, cls) else cls(text)
+
+    @property
+    def normalized(self):
+        """Lowercased text on one line without special characters (see preprocess_text)"""
+        if self._normalized is None:
+            self._normalized = _normalize(self.lower)
+        return self._normalized
+
+    @property
+    def term_set(self):
+        """Distinct tokens, a hashed index for constant time term lookups"""
+        if self._term_set is None:
+            self._term_set = frozenset(self.tokens)
+        return self._term_set
+
+    @property
+    def content_words(self):
+        """Distinct tokens without NLTK's English stopwords"""
+        if self._content_words is None:
+            with timing.span('content_words'):
+                self._content_words = self.term_set - assets.stopwords('english')
+        return self._content_words
+
+    @property
+    def term_counts(self):
+        """
+        Counts of the TF-IDF terms: the tokens of two or more characters that are
+        not scikit-learn English stop words, the terms TfidfVectorizer(stop_words='english')
+        extracts from the normalized text
+        """
+        if self._term_counts is None:
+            stop_words = assets.tfidf_stopwords()
+            self._term_counts = Counter(
+                token for token in self.tokens if len(token) > 1 and token not in stop_words
+            )
+        return self._term_counts
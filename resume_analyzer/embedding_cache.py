@@ -0,0 +1,114 @@
+"""
+Module for caching sentence embeddings of text chunks
+"""
+import hashlib
+import io
+
+import numpy as np
+
+from .tiered_cache import TieredCache
+
+
+def _dump_embedding(embedding):
+    buffer = io.BytesIO()
+    np.save(buffer, embedding)
+    return buffer.getvalue()
+
+
+def _load_embedding(payload):
+    embedding = np.load(io.BytesIO(payload))
+    embedding.setflags(write=False)
+    return embedding
+
+
+class EmbeddingCache(TieredCache):
+    """
+    Content-addressed cache for chunk embeddings.
+
+    Entries are keyed by a SHA-256 of the model name and the chunk text, so
+    the same job posting or resume chunk is only embedded once per model.
+    The in-process tier is an LRU bounded by a byte budget and holds the
+    read-only arrays themselves. The optional on-disk tier stores one .npy
+    payload per entry and survives restarts (see TieredCache).
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_dir=None, max_disk_bytes=1024 * 1024 * 1024):
+        """
+        Create the cache
+
+        Args:
+            max_bytes (int): Byte budget of the in-process tier
+            cache_dir (str): Directory of the on-disk tier, or None to keep it disabled
+            max_disk_bytes (int): Byte budget of the on-disk tier
+        """
+        super().__init__(
+            max_bytes, cache_dir=cache_dir, max_disk_bytes=max_disk_bytes,
+            size=lambda embedding: embedding.nbytes, dump=_dump_embedding, load=_load_embedding
+        )
+
+    @staticmethod
+    def make_key(text, model_name):
+        """
+        Build the cache key of a chunk
+
+        Args:
+            text (str): Chunk text
+            model_name (str): Name of the embedding model
+
+        Returns:
+            str: Hex digest identifying the chunk for this model
+        """
+        digest = hashlib.sha256()
+        digest.update(model_name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def put(self, key, embedding):
+        """
+        Add an embedding to both tiers
+
+        Args:
+            key (str): Key from make_key
+            embedding (numpy.ndarray): Embedding to cache
+        """
+        # Copy so a row of a batch result does not keep the whole batch alive
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        super().put(key, embedding)
+
+    def encode(self, model, chunks, model_name, **encode_kwargs):
+        """
+        Embed chunks, running the model only on chunks that are not cached
+
+        Args:
+            model (SentenceTransformer): Model used for cache misses
+            chunks (list): Chunk texts
+            model_name (str): Name of the model, part of the cache key
+            **encode_kwargs: Extra arguments passed to model.encode
+
+        Returns:
+            numpy.ndarray: One embedding per chunk, in input order
+        """
+        keys = [self.make_key(chunk, model_name) for chunk in chunks]
+        embeddings = [self.get(key) for key in keys]
+
+        # Encode every distinct missing chunk once, in a single batch
+        missing = {}
+        for index, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(keys[index], chunks[index])
+
+        if missing:
+            encoded = model.encode(list(missing.values()), **encode_kwargs)
+            new_embeddings = dict(zip(missing, encoded))
+            for key, embedding in new_embeddings.items():
+                self.put(key, embedding)
+            embeddings = [
+                embedding if embedding is not None else new_embeddings[key]
+                for key, embedding in zip(keys, embeddings)
+            ]
+
+        if not embeddings:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(embeddings).astype(np.float32, copy=False)
@@ -0,0 +1,340 @@
+"""
+Module for searching resume embeddings on disk by cosine similarity
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+DTYPES = {'float32': np.float32, 'float16': np.float16}
+
+
+class EmbeddingIndex:
+    """
+    Memory-mapped matrix of normalized embeddings with top-k search.
+
+    Vectors and ids are appended to raw files, so adding a resume never
+    rewrites the index; removing one only marks its row as deleted until
+    compact().
+    Search streams the matrix in blocks of rows and keeps a running top-k,
+    so memory use does not grow with the pool. For very large pools,
+    build_partitions() clusters the rows (IVF-style) and search can then
+    scan only the partitions closest to the query.
+    """
+
+    def __init__(self, directory, dim=None, dtype='float32'):
+        """
+        Open the index, creating it if needed
+
+        Args:
+            directory (str): Directory holding the index files
+            dim (int): Embedding size, taken from the first vectors added if not given
+            dtype (str): 'float32' or 'float16' storage of new indexes (float16 halves the size)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._meta_path = os.path.join(directory, 'index.json')
+        self._ids_path = os.path.join(directory, 'ids.txt')
+        self._deleted_path = os.path.join(directory, 'deleted.bits')
+
+        meta = {'dim': dim, 'dtype': dtype, 'partitions': False}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                meta.update(json.load(f))
+        if meta['dtype'] not in DTYPES:
+            raise ValueError(f"Unknown dtype: {meta['dtype']}")
+        self.dim = meta['dim']
+        self.dtype = meta['dtype']
+        self._vectors_path = os.path.join(directory, 'vectors.' + self.dtype)
+
+        # Row i of the vector file belongs to line i of the id file; an id
+        # added again later points to its newest row
+        self.ids = []
+        if os.path.exists(self._ids_path):
+            with open(self._ids_path, encoding='utf-8') as f:
+                self.ids = f.read().splitlines()
+        # An interrupted append leaves vectors without ids, ids without a
+        # complete vector, or part of a vector: both files are cut back to
+        # the rows they have in common, so the next append lines them up again
+        if self.dim is not None and os.path.exists(self._vectors_path):
+            row_bytes = self.dim * np.dtype(DTYPES[self.dtype]).itemsize
+            rows = min(len(self.ids), os.path.getsize(self._vectors_path) // row_bytes)
+            if os.path.getsize(self._vectors_path) != rows * row_bytes:
+                os.truncate(self._vectors_path, rows * row_bytes)
+            if len(self.ids) != rows:
+                self.ids = self.ids[:rows]
+                self._write_ids()
+        else:
+            # No vectors, or the first append never got to record their size
+            if os.path.exists(self._vectors_path):
+                os.truncate(self._vectors_path, 0)
+            if self.ids:
+                self.ids = []
+                self._write_ids()
+        self._rows = {key: row for row, key in enumerate(self.ids)}
+
+        self._deleted = np.zeros(len(self.ids), dtype=bool)
+        if os.path.exists(self._deleted_path):
+            stored = np.unpackbits(np.fromfile(self._deleted_path, dtype=np.uint8)).astype(bool)[:len(self.ids)]
+            self._deleted[:len(stored)] = stored
+        for row in np.flatnonzero(self._deleted):
+            if self._rows.get(self.ids[row]) == row:
+                del self._rows[self.ids[row]]
+
+        self._centroids = None
+        self._assignments = None
+        self._lists = None
+        if meta['partitions']:
+            self._centroids = np.load(os.path.join(directory, 'centroids.npy'))
+            self._assignments = np.fromfile(os.path.join(directory, 'assignments.i32'), dtype=np.int32)
+            if len(self._assignments) != len(self.ids):
+                # Rows appended without their partition (interrupted append) are assigned again
+                self._assignments = self._assignments[:len(self.ids)]
+                missing = np.asarray(self.vectors()[len(self._assignments):], dtype=np.float32)
+                self._assignments = np.concatenate([
+                    self._assignments, np.argmax(missing @ self._centroids.T, axis=1).astype(np.int32)
+                ])
+                self._assignments.tofile(os.path.join(directory, 'assignments.i32'))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def add(self, keys, embeddings):
+        """
+        Add or replace embeddings
+
+        Args:
+            keys (list): Ids of the embeddings (e.g. CandidateStore keys)
+            embeddings (numpy.ndarray): Matrix with one row per key, normalized before storing
+        """
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if len(keys) != embeddings.shape[0]:
+            raise ValueError("Need exactly one embedding per key")
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms > 0, norms, 1)
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = embeddings.shape[1]
+            elif embeddings.shape[1] != self.dim:
+                raise ValueError(f"Embeddings have {embeddings.shape[1]} dimensions, the index uses {self.dim}")
+
+            # Vectors first: a crash between the two writes leaves ids without
+            # vectors, which are dropped when the index is opened again
+            with open(self._vectors_path, 'ab') as f:
+                f.write(embeddings.astype(DTYPES[self.dtype]).tobytes())
+            with open(self._ids_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(f"{key}\n" for key in keys))
+
+            first_row = len(self.ids)
+            self._deleted = np.concatenate([self._deleted, np.zeros(len(keys), dtype=bool)])
+            replaced = False
+            for offset, key in enumerate(keys):
+                previous = self._rows.get(key)
+                if previous is not None:
+                    self._deleted[previous] = True
+                    replaced = True
+                self._rows[key] = first_row + offset
+                self.ids.append(key)
+
+            if self._centroids is not None:
+                # New rows join the partition of their closest centroid
+                new_assignments = np.argmax(embeddings @ self._centroids.T, axis=1).astype(np.int32)
+                self._assignments = np.concatenate([self._assignments, new_assignments])
+                with open(os.path.join(self.directory, 'assignments.i32'), 'ab') as f:
+                    f.write(new_assignments.tobytes())
+                self._lists = None
+
+            self._save_meta()
+            if replaced:
+                self._save_deleted()
+
+    def remove(self, keys):
+        """
+        Delete embeddings (their rows are skipped by search until compact())
+
+        Args:
+            keys (iterable): Ids to delete, unknown ids are ignored
+        """
+        with self._lock:
+            for key in keys:
+                row = self._rows.pop(key, None)
+                if row is not None:
+                    self._deleted[row] = True
+            self._save_deleted()
+
+    def vectors(self):
+        """
+        Memory-map the stored vectors, including deleted rows
+
+        Returns:
+            numpy.ndarray: Read-only matrix of shape (rows, dim)
+        """
+        rows = len(self.ids)
+        if rows == 0 or self.dim is None:
+            return np.zeros((0, self.dim or 0), dtype=DTYPES[self.dtype])
+        return np.memmap(self._vectors_path, dtype=DTYPES[self.dtype], mode='r', shape=(rows, self.dim))
+
+    def search(self, queries, k=10, block_rows=65536, n_probe=None):
+        """
+        Find the stored embeddings closest to each query
+
+        Args:
+            queries (numpy.ndarray): One query embedding, or a matrix with one per row
+            k (int): Number of results per query
+            block_rows (int): Rows scored per matrix product
+            n_probe (int): Number of partitions to scan when partitions are built,
+                None scans the whole index (exact search)
+
+        Returns:
+            list: For every query, a list of (id, cosine similarity) pairs, best first
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms > 0, norms, 1)
+
+        with self._lock:
+            vectors = self.vectors()
+            deleted = self._deleted
+            if n_probe is not None and self._centroids is not None:
+                return [
+                    self._search_rows(vectors, query[None, :], self._probe(query, n_probe), deleted, k)[0]
+                    for query in queries
+                ]
+            return self._search_blocks(vectors, queries, deleted, k, block_rows)
+
+    def build_partitions(self, n_partitions=None, iterations=10, sample_size=100000, seed=0):
+        """
+        Cluster the rows with spherical k-means for partitioned search
+
+        Args:
+            n_partitions (int): Number of partitions, defaults to about the square root of the row count
+            iterations (int): k-means iterations
+            sample_size (int): Rows used to fit the centroids
+            seed (int): Random seed
+        """
+        with self._lock:
+            vectors = self.vectors()
+            live = np.flatnonzero(~self._deleted)
+            if len(live) == 0:
+                return
+            n_partitions = min(n_partitions or max(1, int(np.sqrt(len(live)))), len(live))
+
+            rng = np.random.default_rng(seed)
+            sample = np.asarray(vectors[np.sort(rng.choice(live, min(sample_size, len(live)), replace=False))],
+                                dtype=np.float32)
+            centroids = sample[rng.choice(len(sample), n_partitions, replace=False)]
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                # Empty clusters keep their previous centroid
+                centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids)
+
+            assignments = np.zeros(len(self.ids), dtype=np.int32)
+            for start in range(0, len(self.ids), 65536):
+                block = np.asarray(vectors[start:start + 65536], dtype=np.float32)
+                assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+            np.save(os.path.join(self.directory, 'centroids.npy'), centroids)
+            assignments.tofile(os.path.join(self.directory, 'assignments.i32'))
+            self._centroids = centroids
+            self._assignments = assignments
+            self._lists = None
+            self._save_meta()
+
+    def compact(self):
+        """Rewrite the index without its deleted rows"""
+        with self._lock:
+            live = np.flatnonzero(~self._deleted)
+            vectors = self.vectors()
+            tmp_path = self._vectors_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                for start in range(0, len(live), 65536):
+                    f.write(np.ascontiguousarray(vectors[live[start:start + 65536]]).tobytes())
+            del vectors
+            os.replace(tmp_path, self._vectors_path)
+
+            self.ids = [self.ids[row] for row in live]
+            self._rows = {key: row for row, key in enumerate(self.ids)}
+            self._deleted = np.zeros(len(self.ids), dtype=bool)
+            self._write_ids()
+            self._save_deleted()
+            if self._assignments is not None:
+                self._assignments = self._assignments[live]
+                self._assignments.tofile(os.path.join(self.directory, 'assignments.i32'))
+                self._lists = None
+            self._save_meta()
+
+    def _probe(self, query, n_probe):
+        """Rows of the n_probe partitions whose centroids are closest to the query (lock held)"""
+        if self._lists is None:
+            order = np.argsort(self._assignments, kind='stable')
+            bounds = np.searchsorted(self._assignments[order], np.arange(len(self._centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+        closest = np.argsort(-(self._centroids @ query))[:n_probe]
+        return np.sort(np.concatenate([self._lists[partition] for partition in closest]))
+
+    def _search_rows(self, vectors, queries, rows, deleted, k):
+        """Exact top-k over the given rows (lock held)"""
+        rows = rows[~deleted[rows]]
+        if len(rows) == 0:
+            return [[] for _ in queries]
+        scores = queries @ np.asarray(vectors[rows], dtype=np.float32).T
+        return [self._top(rows, row_scores, k) for row_scores in scores]
+
+    def _search_blocks(self, vectors, queries, deleted, k, block_rows):
+        """Exact top-k over the whole index, one block of rows at a time (lock held)"""
+        best_rows = [np.zeros(0, dtype=np.int64) for _ in queries]
+        best_scores = [np.zeros(0, dtype=np.float32) for _ in queries]
+        for start in range(0, vectors.shape[0], block_rows):
+            block = np.asarray(vectors[start:start + block_rows], dtype=np.float32)
+            scores = queries @ block.T
+            scores[:, deleted[start:start + len(block)]] = -np.inf
+            rows = np.arange(start, start + len(block))
+            for index in range(len(queries)):
+                # Merge the block's best rows with the best rows so far
+                candidate_rows = np.concatenate([best_rows[index], rows])
+                candidate_scores = np.concatenate([best_scores[index], scores[index]])
+                if len(candidate_scores) > k:
+                    keep = np.argpartition(-candidate_scores, k - 1)[:k]
+                    candidate_rows = candidate_rows[keep]
+                    candidate_scores = candidate_scores[keep]
+                best_rows[index] = candidate_rows
+                best_scores[index] = candidate_scores
+        return [self._top(rows, scores, k) for rows, scores in zip(best_rows, best_scores)]
+
+    def _top(self, rows, scores, k):
+        """Sort the best rows and turn them into (id, score) pairs"""
+        if len(scores) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[keep], scores[keep]
+        order = np.argsort(-scores, kind='stable')
+        return [(self.ids[rows[i]], float(scores[i])) for i in order if np.isfinite(scores[i])]
+
+    def _write_ids(self):
+        """Rewrite the id file atomically"""
+        tmp_path = self._ids_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(f"{key}\n" for key in self.ids))
+        os.replace(tmp_path, self._ids_path)
+
+    def _save_meta(self):
+        """Write the settings atomically (lock held)"""
+        meta = {'dim': self.dim, 'dtype': self.dtype, 'partitions': self._centroids is not None}
+        tmp_path = self._meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _save_deleted(self):
+        """Write the deleted-row bits atomically, one bit per row (lock held)"""
+        tmp_path = self._deleted_path + '.tmp'
+        np.packbits(self._deleted).tofile(tmp_path)
+        os.replace(tmp_path, self._deleted_path)
@@ -0,0 +1,232 @@
+"""
+Module for running analyses asynchronously on a bounded local worker pool
+"""
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+def _run_job(func, args, kwargs):
+    """Run a job in the worker and report when it started, its result and its error message"""
+    started_at = time.time()
+    try:
+        return started_at, func(*args, **kwargs), None
+    except Exception as e:
+        return started_at, None, str(e)
+
+
+class JobQueue:
+    """
+    Runs submitted functions in a thread or process pool and keeps their status.
+
+    At most max_workers jobs run at once and at most max_queued more wait
+    for a worker; submitting beyond that raises QueueFullError instead of
+    piling up work. Finished jobs are kept for retention_seconds so their
+    result can be polled, then dropped.
+
+    Waiting jobs stay in this queue and a job is handed to the pool only
+    when a worker is free, so the jobs the pool holds are the running ones.
+    (Future.running() can't tell: a process pool marks a job running as
+    soon as it is moved to the queue feeding its workers.)
+    """
+
+    def __init__(self, max_workers=2, max_queued=32, use_processes=False, retention_seconds=3600):
+        """
+        Create the queue
+
+        Args:
+            max_workers (int): Number of jobs running at the same time
+            max_queued (int): Number of jobs allowed to wait for a worker
+            use_processes (bool): Run jobs in worker processes instead of threads
+                (the function and its arguments must then be picklable)
+            retention_seconds (float): How long finished jobs stay available
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.use_processes = use_processes
+        self.retention_seconds = retention_seconds
+
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor = executor_class(max_workers=max_workers)
+        self._jobs = {}
+        # Reentrant because a future that is already done runs its callback,
+        # which dispatches the next job, inside _dispatch
+        self._lock = threading.RLock()
+
+        # (job, func, args, kwargs) waiting for a worker, and the number of jobs handed to the pool
+        self._waiting = deque()
+        self._running = 0
+
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        # Wait times of the most recent jobs, for the percentiles in stats()
+        self._wait_times = deque(maxlen=1000)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue a function call
+
+        Args:
+            func (callable): Function to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            str: Job id to poll with status()
+        """
+        self._drop_expired()
+        with self._lock:
+            if self._running + len(self._waiting) >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                raise QueueFullError(f"Too many queued jobs ({self.max_queued} waiting)")
+
+            job_id = uuid.uuid4().hex
+            job = {
+                'id': job_id,
+                'status': 'queued',
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+            self._jobs[job_id] = job
+            self._waiting.append((job, func, args, kwargs))
+            self._dispatch()
+        return job_id
+
+    def status(self, job_id):
+        """
+        Get the status of a job
+
+        Args:
+            job_id (str): Id returned by submit
+
+        Returns:
+            dict: Status ('queued', 'running', 'done' or 'failed'), timings and
+                result or error; None if the job is unknown or expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            status = job['status']
+            now = time.time()
+            started_at = job['started_at']
+            return {
+                'id': job_id,
+                'status': status,
+                'wait_seconds': round((started_at or now) - job['submitted_at'], 3) if status != 'queued' else None,
+                'run_seconds': round(job['finished_at'] - started_at, 3) if job['finished_at'] else None,
+                'result': job['result'],
+                'error': job['error']
+            }
+
+    def stats(self):
+        """
+        Report queue depth and wait times
+
+        Returns:
+            dict: Queued and running job counts, totals and wait-time statistics in seconds
+        """
+        with self._lock:
+            queued = len(self._waiting)
+            running = self._running
+            waits = sorted(self._wait_times)
+
+        def percentile(fraction):
+            return round(waits[min(len(waits) - 1, int(fraction * len(waits)))], 3) if waits else None
+
+        return {
+            'queued': queued,
+            'running': running,
+            'max_workers': self.max_workers,
+            'max_queued': self.max_queued,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'wait_seconds': {
+                'mean': round(sum(waits) / len(waits), 3) if waits else None,
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'max': round(waits[-1], 3) if waits else None
+            }
+        }
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker pool
+
+        Args:
+            wait (bool): Wait for running jobs to finish
+        """
+        with self._lock:
+            waiting = list(self._waiting)
+            self._waiting.clear()
+            for job, _, _, _ in waiting:
+                self._record(job, time.time(), 'Job cancelled by shutdown')
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _dispatch(self):
+        """Hand waiting jobs to the pool while it has free workers (lock held)"""
+        while self._waiting and self._running < self.max_workers:
+            job, func, args, kwargs = self._waiting.popleft()
+            try:
+                future = self._executor.submit(_run_job, func, args, kwargs)
+            except Exception as e:
+                # The pool is shut down or broken
+                self._record(job, time.time(), str(e) or type(e).__name__)
+                continue
+            self._running += 1
+            job['status'] = 'running'
+            future.add_done_callback(lambda future, job=job: self._finish(job, future))
+
+    def _finish(self, job, future):
+        """Record the outcome of a job and start the next one (called when its future completes)"""
+        finished_at = time.time()
+        with self._lock:
+            self._running -= 1
+            try:
+                job['started_at'], job['result'], job['error'] = future.result()
+                job['finished_at'] = finished_at
+                self._count(job)
+            except Exception as e:
+                # The job never ran, e.g. its arguments could not be sent to a worker process
+                self._record(job, finished_at, str(e) or type(e).__name__)
+            self._dispatch()
+
+    def _record(self, job, finished_at, error):
+        """Fail a job that never ran (lock held)"""
+        job['started_at'] = finished_at
+        job['finished_at'] = finished_at
+        job['error'] = error
+        self._count(job)
+
+    def _count(self, job):
+        """Set the final status of a job and update the counters (lock held)"""
+        if job['error'] is None:
+            job['status'] = 'done'
+            self.completed += 1
+        else:
+            job['status'] = 'failed'
+            self.failed += 1
+        self._wait_times.append(job['started_at'] - job['submitted_at'])
+
+    def _drop_expired(self):
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished_at'] is not None and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
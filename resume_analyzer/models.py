@@ -0,0 +1,306 @@
+"""
+Module for loading the NLP models used by the analyzer
+
+Nothing is loaded at import time. The loading strategy is picked with the
+RESUME_ANALYZER_MODEL_LOADING environment variable (or passed to start()):
+
+- "lazy" (default): every model is loaded the first time it is used
+- "eager": start() loads every model and runs a warm-up inference
+- "background": start() loads the models in a background thread; until a
+  model is ready, callers that pass wait=False get None and can fall back
+  to the lexical scores
+
+A model that fails to load is not loaded again: the error is kept, callers
+that pass wait=False get None from then on (and fall back as above) and the
+others get a ModelUnavailableError.
+"""
+import os
+import threading
+import time
+
+from . import timing
+
+SPACY_MODEL_NAME = 'en_core_web_md'
+SENTENCE_MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
+
+LOADING_STRATEGIES = ('lazy', 'eager', 'background')
+
+# spaCy components each analyzer stage reads; every other component is
+# skipped when that stage parses a text. Resumes are not parsed, their
+# extractors work on the text
+SPACY_STAGE_COMPONENTS = {
+    # Keyword extraction reads token.pos_ (tagger and attribute ruler) and token.is_stop
+    'keywords': ('tok2vec', 'tagger', 'attribute_ruler'),
+}
+
+# Components no stage needs are not loaded at all
+SPACY_EXCLUDED_COMPONENTS = ('parser', 'ner', 'lemmatizer', 'senter')
+
+# Defaults for parsing many texts at once with nlp.pipe
+NLP_BATCH_SIZE = int(os.environ.get('RESUME_ANALYZER_NLP_BATCH_SIZE', 64))
+NLP_PROCESSES = int(os.environ.get('RESUME_ANALYZER_NLP_PROCESSES', 1))
+
+# Chunks per sentence model forward pass, and the number of threads it uses
+# (0 keeps the PyTorch default)
+EMBEDDING_BATCH_SIZE = int(os.environ.get('RESUME_ANALYZER_EMBEDDING_BATCH_SIZE', 32))
+EMBEDDING_THREADS = int(os.environ.get('RESUME_ANALYZER_EMBEDDING_THREADS', 0))
+
+
+class ModelUnavailableError(RuntimeError):
+    """Raised when a model is needed that failed to load earlier"""
+
+
+def _load_spacy():
+    import spacy
+    try:
+        return spacy.load(SPACY_MODEL_NAME, exclude=SPACY_EXCLUDED_COMPONENTS)
+    except OSError:
+        import sys
+        import subprocess
+        subprocess.check_call([sys.executable, "-m", "spacy", "download", SPACY_MODEL_NAME])
+        return spacy.load(SPACY_MODEL_NAME, exclude=SPACY_EXCLUDED_COMPONENTS)
+
+
+def _load_sentence_model():
+    from sentence_transformers import SentenceTransformer
+    if EMBEDDING_THREADS:
+        import torch
+        torch.set_num_threads(EMBEDDING_THREADS)
+    return SentenceTransformer(SENTENCE_MODEL_NAME)
+
+
+class ModelRegistry:
+    """
+    Loads named models on demand, at most once, according to a loading strategy.
+    """
+
+    def __init__(self, strategy=None):
+        """
+        Create the registry
+
+        Args:
+            strategy (str): One of LOADING_STRATEGIES, defaults to $RESUME_ANALYZER_MODEL_LOADING or "lazy"
+        """
+        self.strategy = self._check_strategy(strategy or os.environ.get('RESUME_ANALYZER_MODEL_LOADING', 'lazy'))
+        self._loaders = {}
+        self._warm_ups = {}
+        self._models = {}
+        self._locks = {}
+        self._background_thread = None
+        self.load_seconds = {}
+        # name -> exception of a failed load, kept so the load is not retried on every request
+        self.load_errors = {}
+
+    @staticmethod
+    def _check_strategy(strategy):
+        if strategy not in LOADING_STRATEGIES:
+            raise ValueError(f"Unknown model loading strategy: {strategy}")
+        return strategy
+
+    def register(self, name, loader, warm_up=None):
+        """
+        Register a model
+
+        Args:
+            name (str): Model name
+            loader (callable): Returns the loaded model
+            warm_up (callable): Optional function run once on the loaded model
+        """
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        if warm_up is not None:
+            self._warm_ups[name] = warm_up
+
+    def get(self, name, wait=True):
+        """
+        Get a model, loading it if needed
+
+        Args:
+            name (str): Model name
+            wait (bool): When False, return None instead of blocking until a model
+                loading in the background is ready, and instead of raising when the
+                model fails to load
+
+        Returns:
+            object: The model, or None if it is not ready or failed to load and wait is False
+
+        Raises:
+            ModelUnavailableError: If wait is True and the model failed to load before
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name in self.load_errors:
+            if not wait:
+                return None
+            raise ModelUnavailableError(f"Model {name} failed to load: {self.load_errors[name]}")
+
+        if not wait and self._background_thread is not None and self._background_thread.is_alive():
+            return None
+
+        try:
+            return self._load(name)
+        except Exception:
+            if wait:
+                raise
+            return None
+
+    def is_ready(self, name):
+        """
+        Check whether a model has been loaded
+
+        Args:
+            name (str): Model name
+
+        Returns:
+            bool: True if the model is loaded
+        """
+        return name in self._models
+
+    def start(self, strategy=None):
+        """
+        Apply the loading strategy, call this once when the server boots
+
+        Args:
+            strategy (str): Optional strategy overriding the one given at construction
+        """
+        if strategy is not None:
+            self.strategy = self._check_strategy(strategy)
+
+        if self.strategy == 'eager':
+            self.load_all(warm_up=True)
+        elif self.strategy == 'background' and self._background_thread is None:
+            self._background_thread = threading.Thread(
+                target=self.load_all, kwargs={'warm_up': True}, name='model-loader', daemon=True
+            )
+            self._background_thread.start()
+
+    def load_all(self, warm_up=False):
+        """
+        Load every registered model
+
+        Args:
+            warm_up (bool): Run each model's warm-up inference after loading it
+        """
+        for name in self._loaders:
+            try:
+                model = self._load(name)
+            except Exception as e:
+                # Keep loading the other models, the error is kept for get
+                print(f"Error loading model {name}: {e}")
+                continue
+            if warm_up and name in self._warm_ups:
+                try:
+                    self._warm_ups[name](model)
+                except Exception as e:
+                    # The model is loaded, it is only used without the warm-up
+                    print(f"Error warming up model {name}: {e}")
+
+    def _load(self, name):
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            if name in self.load_errors:
+                raise ModelUnavailableError(f"Model {name} failed to load: {self.load_errors[name]}")
+            start = time.perf_counter()
+            try:
+                with timing.span('load_' + name):
+                    model = self._loaders[name]()
+            except Exception as e:
+                self.load_errors[name] = e
+                raise
+            self.load_seconds[name] = time.perf_counter() - start
+            self._models[name] = model
+            return model
+
+
+# Registered cheapest first; the TF-IDF terms need no model (see document.Document)
+registry = ModelRegistry()
+registry.register('spacy', _load_spacy, warm_up=lambda nlp: nlp("Warm up the pipeline."))
+registry.register('sentence_model', _load_sentence_model, warm_up=lambda model: model.encode(["Warm up the model."]))
+
+
+def start(strategy=None):
+    """
+    Apply the loading strategy of the default registry
+
+    Args:
+        strategy (str): Optional strategy, see LOADING_STRATEGIES
+    """
+    registry.start(strategy)
+
+
+def get_nlp(wait=True):
+    """
+    Get the spaCy pipeline
+
+    Args:
+        wait (bool): See ModelRegistry.get
+
+    Returns:
+        spacy.Language: The pipeline, or None if it is still loading and wait is False
+    """
+    return registry.get('spacy', wait)
+
+
+def parse(text, stage, wait=True):
+    """
+    Parse a text with only the spaCy components a stage needs
+
+    Args:
+        text (str): Text to parse
+        stage (str): Key of SPACY_STAGE_COMPONENTS
+        wait (bool): See ModelRegistry.get
+
+    Returns:
+        spacy.tokens.Doc: Parsed text, or None if spaCy is still loading and wait is False
+    """
+    nlp = get_nlp(wait)
+    if nlp is None:
+        return None
+    with timing.span('spacy'):
+        return nlp(text, disable=_disabled_components(nlp, stage))
+
+
+def parse_many(texts, stage, batch_size=None, n_process=None, wait=True):
+    """
+    Parse many texts in batches with only the spaCy components a stage needs
+
+    Args:
+        texts (iterable): Texts to parse
+        stage (str): Key of SPACY_STAGE_COMPONENTS
+        batch_size (int): Texts per nlp.pipe batch, defaults to $RESUME_ANALYZER_NLP_BATCH_SIZE or 64
+        n_process (int): Worker processes for nlp.pipe, defaults to $RESUME_ANALYZER_NLP_PROCESSES or 1
+        wait (bool): See ModelRegistry.get
+
+    Returns:
+        iterator: Parsed texts in input order, or None if spaCy is still loading and wait is False
+    """
+    nlp = get_nlp(wait)
+    if nlp is None:
+        return None
+    return nlp.pipe(
+        texts,
+        disable=_disabled_components(nlp, stage),
+        batch_size=batch_size or NLP_BATCH_SIZE,
+        n_process=n_process or NLP_PROCESSES
+    )
+
+
+def _disabled_components(nlp, stage):
+    needed = SPACY_STAGE_COMPONENTS[stage]
+    return [name for name in nlp.pipe_names if name not in needed]
+
+
+def get_sentence_model(wait=True):
+    """
+    Get the sentence transformer used for semantic similarity
+
+    Args:
+        wait (bool): See ModelRegistry.get
+
+    Returns:
+        SentenceTransformer: The model, or None if it is still loading and wait is False
+    """
+    return registry.get('sentence_model', wait)
@@ -1,62 +1,641 @@
 """
 Module for extracting text from resume files (PDF and DOCX)
 """
+import io
 import os
-import pdfplumber
-from docx import Document
+import posixpath
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 
-def extract_text_from_resume(file_path):
+from . import timing
+
+# Text of one PDF page, with the time it took to extract it and whether fast
+# extraction fell back to layout analysis for it
+PageText = namedtuple('PageText', ['page_number', 'text', 'seconds', 'fallback'], defaults=(False,))
+
+# Outcome of extracting one file during bulk ingestion; text is None and
+# error holds the message when the file could not be parsed
+IngestResult = namedtuple('IngestResult', ['path', 'text', 'error', 'seconds'])
+
+# Streams that can't seek are copied into memory, spilling to a temporary
+# file only when they are larger than this
+SPOOL_MAX_SIZE = 4 * 1024 * 1024
+
+# How PDF pages are read: 'fast' takes the text from the content stream in the
+# order it is drawn and re-reads only the pages that look degraded with
+# pdfplumber's layout analysis (see pdf_text), 'layout' analyzes every page
+PDF_MODES = ('fast', 'layout')
+PDF_MODE = os.environ.get('RESUME_ANALYZER_PDF_MODE', 'fast')
+
+# Worker processes a large PDF is split across by page range (1 reads every
+# PDF in the calling process), and the page count from which a PDF is split
+PDF_WORKERS = int(os.environ.get('RESUME_ANALYZER_PDF_WORKERS', 1))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('RESUME_ANALYZER_PDF_PARALLEL_MIN_PAGES', 8))
+
+# Page range worker pools by number of workers, started on first use
+_page_pools = {}
+_page_pools_lock = threading.Lock()
+
+# WordprocessingML elements read by the DOCX extractor
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = W_NS + 'p'
+W_R = W_NS + 'r'
+W_T = W_NS + 't'
+W_BR = W_NS + 'br'
+W_TYPE = W_NS + 'type'
+# Text of the other run content elements, as in python-docx's Run.text
+W_RUN_CHARACTERS = {W_NS + 'tab': '\t', W_NS + 'ptab': '\t', W_NS + 'cr': '\n', W_NS + 'noBreakHyphen': '-'}
+# Alternative content for older readers (e.g. VML copies of text boxes), skipped
+# because the preferred copy is read
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# Compressed XML is decompressed and parsed this many bytes at a time
+DOCX_READ_SIZE = 64 * 1024
+
+# Package relationships, to find the document, header and footer parts
+RELS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+RELATIONSHIP_TYPES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+
+def spooled_file(max_size=None):
+    """
+    Create a file that stays in memory until it grows past max_size
+    
+    Args:
+        max_size (int): Size in bytes above which the data is moved to a temporary file
+        
+    Returns:
+        tempfile.SpooledTemporaryFile: Empty binary file
+    """
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE if max_size is None else max_size)
+
+def open_resume_source(source):
+    """
+    Turn a resume source into something the PDF and DOCX readers can open
+    
+    Args:
+        source (str, os.PathLike, bytes or file-like): Path, file contents or binary file object
+        
+    Returns:
+        str or file-like: The path unchanged, or a seekable binary file object
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    
+    seekable = getattr(source, 'seekable', None)
+    if seekable is not None and seekable():
+        return source
+    
+    # Request streams and pipes can't seek, which both parsers need
+    spooled = spooled_file()
+    shutil.copyfileobj(source, spooled)
+    spooled.seek(0)
+    return spooled
+
+def detect_format(source, filename=None):
+    """
+    Find out whether a resume source is a PDF or a DOCX file
+    
+    The extension of filename (or of the path) is used when there is one,
+    otherwise the first bytes of the file are checked.
+    
+    Args:
+        source (str or file-like): Path or seekable binary file object
+        filename (str): Optional original file name, e.g. of an upload
+        
+    Returns:
+        str: File extension, '.pdf' or '.docx' for supported files
+    """
+    if filename is None and isinstance(source, (str, os.PathLike)):
+        filename = os.fspath(source)
+    if filename:
+        return os.path.splitext(filename)[1].lower()
+    
+    position = source.tell()
+    header = source.read(4)
+    source.seek(position)
+    if header.startswith(b'%PDF'):
+        return '.pdf'
+    if header.startswith(b'PK'):
+        # DOCX files are zip archives
+        return '.docx'
+    return ''
+
+@timing.timed('extract_text')
+def extract_text_from_resume(file_path, max_pages=None, max_chars=None, filename=None, pdf_mode=None, pdf_workers=None):
     """
     Extract text from a resume file (PDF or DOCX)
     
     Args:
-        file_path (str): Path to the resume file
+        file_path (str, bytes or file-like): Path to the resume file, its contents or a binary file object
+        max_pages (int): Optional maximum number of PDF pages to read
+        max_chars (int): Optional character budget, extraction stops once it is reached
+        filename (str): Original file name, used to tell the format of in-memory files
+        pdf_mode (str): How PDF pages are read, 'fast' or 'layout' (defaults to PDF_MODE)
+        pdf_workers (int): Worker processes large PDFs are split across (defaults to PDF_WORKERS)
         
     Returns:
         str: Extracted text from the resume
     """
-    file_extension = os.path.splitext(file_path)[1].lower()
+    return "".join(iter_resume_text(file_path, max_pages=max_pages, max_chars=max_chars, filename=filename,
+                                    pdf_mode=pdf_mode, pdf_workers=pdf_workers))
+
+def iter_resume_text(file_path, max_pages=None, max_chars=None, filename=None, pdf_mode=None, pdf_workers=None):
+    """
+    Extract text from a resume file (PDF or DOCX) as a stream of pieces
+    
+    PDF files are read page by page, so downstream stages can start on the
+    first pages before the whole file is parsed.
+    
+    Args:
+        file_path (str, bytes or file-like): Path to the resume file, its contents or a binary file object
+        max_pages (int): Optional maximum number of PDF pages to read
+        max_chars (int): Optional character budget, extraction stops once it is reached
+        filename (str): Original file name, used to tell the format of in-memory files
+        pdf_mode (str): How PDF pages are read, 'fast' or 'layout' (defaults to PDF_MODE)
+        pdf_workers (int): Worker processes large PDFs are split across (defaults to PDF_WORKERS)
+        
+    Yields:
+        str: Consecutive pieces of the resume text
+    """
+    file_path = open_resume_source(file_path)
+    file_extension = detect_format(file_path, filename)
     
     if file_extension == '.pdf':
-        return extract_text_from_pdf(file_path)
+        for page in iter_pdf_pages(file_path, max_pages=max_pages, max_chars=max_chars, mode=pdf_mode,
+                                   workers=pdf_workers):
+            yield page.text
     elif file_extension == '.docx':
-        return extract_text_from_docx(file_path)
+        chars_left = max_chars
+        for index, paragraph in enumerate(iter_docx_paragraphs(file_path)):
+            text = paragraph if index == 0 else "\n" + paragraph
+            if chars_left is not None:
+                text = text[:chars_left]
+                chars_left -= len(text)
+            yield text
+            if chars_left == 0:
+                break
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
 
-def extract_text_from_pdf(pdf_path):
+def extract_text_from_pdf(pdf_path, max_pages=None, max_chars=None, mode=None, workers=None):
     """
     Extract text from a PDF file
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str, bytes or file-like): Path to the PDF file, its contents or a binary file object
+        max_pages (int): Optional maximum number of pages to read
+        max_chars (int): Optional character budget, extraction stops once it is reached
+        mode (str): How pages are read, 'fast' or 'layout' (defaults to PDF_MODE)
+        workers (int): Worker processes a large PDF is split across (defaults to PDF_WORKERS)
         
     Returns:
         str: Extracted text from the PDF
     """
-    text = ""
+    pages = iter_pdf_pages(pdf_path, max_pages=max_pages, max_chars=max_chars, mode=mode, workers=workers)
+    return "".join(page.text for page in pages)
+
+def iter_pdf_pages(pdf_path, max_pages=None, max_chars=None, mode=None, workers=None):
+    """
+    Extract text from a PDF file one page at a time
+    
+    The PDF is closed as soon as the generator is exhausted or closed, so a
+    caller that stops early never pays for the remaining pages. With more
+    than one worker, PDFs of at least PDF_PARALLEL_MIN_PAGES pages are split
+    into page ranges extracted in worker processes, and their pages are still
+    yielded in order. Each page is timed as the 'pdf_page' stage, and the
+    pages fast mode fell back on also as 'pdf_page_fallback', which gives the
+    pages per second and the fallback rate in the metrics.
+    
+    Args:
+        pdf_path (str, bytes or file-like): Path to the PDF file, its contents or a binary file object
+        max_pages (int): Optional maximum number of pages to read
+        max_chars (int): Optional character budget; no page is read after the
+            pages read so far reach it, and the last page is cut to fit
+        mode (str): How pages are read, 'fast' or 'layout' (defaults to PDF_MODE)
+        workers (int): Worker processes a large PDF is split across (defaults to PDF_WORKERS)
+        
+    Yields:
+        PageText: Page number (starting at 1), text, extraction time and fallback flag of each page
+        
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = _check_pdf_mode(mode)
+    workers = PDF_WORKERS if workers is None else workers
+    if max_chars is not None and max_chars <= 0:
+        return
+    
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
+        # Imported on first use so that importing this module (and starting the app) stays cheap
+        import pdfplumber
+        
+        source = open_resume_source(pdf_path)
+        with pdfplumber.open(source) as pdf:
+            page_count = len(pdf.pages)
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            if workers > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+                pages = _iter_page_ranges(source, page_count, mode, workers)
+            else:
+                pages = _iter_pages(pdf.pages[:page_count], mode)
+            
+            chars_left = max_chars
+            for page in pages:
+                timing.record('pdf_page', page.seconds)
+                if page.fallback:
+                    timing.record('pdf_page_fallback', page.seconds)
+                
+                if chars_left is not None:
+                    page = page._replace(text=page.text[:chars_left])
+                    chars_left -= len(page.text)
+                
+                yield page
+                if chars_left is not None and chars_left <= 0:
+                    break
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+def _check_pdf_mode(mode):
+    mode = (mode or PDF_MODE).strip().lower()
+    if mode not in PDF_MODES:
+        raise ValueError(f"Unknown PDF mode '{mode}', expected one of: {', '.join(PDF_MODES)}")
+    return mode
+
+def _iter_pages(pages, mode):
+    """
+    Extract the text of pdfplumber pages in the calling process
+    
+    Args:
+        pages (list): pdfplumber pages
+        mode (str): 'fast' or 'layout'
+        
+    Yields:
+        PageText: Text of each page
+    """
+    extractor = None
+    if mode == 'fast':
+        from .pdf_text import FastTextExtractor
+        extractor = FastTextExtractor()
+    
+    for page in pages:
+        start = time.perf_counter()
+        fallback = False
+        if extractor is not None:
+            text, fallback = extractor.extract_page(page.page_obj)
+        if extractor is None or fallback:
+            text = page.extract_text() or ""
+        # Release the parsed page objects, only the text is kept
+        page.flush_cache()
+        yield PageText(page.page_number, text, time.perf_counter() - start, fallback)
+
+def _extract_page_range(source, start, stop, mode):
+    """
+    Extract a range of pages in a worker process
+    
+    Args:
+        source (str or bytes): Path to the PDF file or its contents
+        start (int): Index of the first page
+        stop (int): Index after the last page
+        mode (str): 'fast' or 'layout'
+        
+    Returns:
+        list: PageText of each page of the range
+    """
+    import pdfplumber
+    
+    with pdfplumber.open(open_resume_source(source)) as pdf:
+        return list(_iter_pages(pdf.pages[start:stop], mode))
+
+def _iter_page_ranges(source, page_count, mode, workers):
+    """
+    Extract the first pages of a PDF split into one page range per worker process
+    
+    Args:
+        source (str or file-like): Path to the PDF file or a seekable binary file object
+        page_count (int): Number of pages to read
+        mode (str): 'fast' or 'layout'
+        workers (int): Number of worker processes
+        
+    Yields:
+        PageText: Text of each page, in page order
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        # File objects can't be sent to another process, their contents can
+        position = source.tell()
+        source.seek(0)
+        data = source.read()
+        source.seek(position)
+        source = data
     
-    return text
+    pool = _page_pool(workers)
+    size = -(-page_count // workers)
+    futures = [
+        pool.submit(_extract_page_range, source, start, min(start + size, page_count), mode)
+        for start in range(0, page_count, size)
+    ]
+    try:
+        for future in futures:
+            try:
+                pages = future.result()
+            except BrokenProcessPool:
+                _discard_page_pool(workers, pool)
+                raise
+            yield from pages
+    finally:
+        # Ranges not needed any more (e.g. once max_chars is reached) are not started
+        for future in futures:
+            future.cancel()
+
+def _page_pool(workers):
+    """Get the shared pool of page range workers, starting it on first use"""
+    with _page_pools_lock:
+        pool = _page_pools.get(workers)
+        if pool is None:
+            pool = _page_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+def _discard_page_pool(workers, pool):
+    """Drop a broken pool so the next PDF starts a new one"""
+    with _page_pools_lock:
+        if _page_pools.get(workers) is pool:
+            del _page_pools[workers]
+    pool.shutdown(wait=False)
 
 def extract_text_from_docx(docx_path):
     """
-    Extract text from a DOCX file
+    Extract text from a DOCX file, one line per paragraph (see iter_docx_paragraphs)
     
     Args:
-        docx_path (str): Path to the DOCX file
+        docx_path (str, bytes or file-like): Path to the DOCX file, its contents or a binary file object
         
     Returns:
         str: Extracted text from the DOCX
     """
+    return "\n".join(iter_docx_paragraphs(docx_path))
+
+def iter_docx_paragraphs(docx_path):
+    """
+    Stream the paragraphs of a DOCX file without building a document model
+    
+    The XML parts are decompressed and parsed incrementally straight out of
+    the zip archive, without building an element tree, so memory does not
+    grow with the size of the file. Paragraphs come in reading order: the headers,
+    then the body (paragraphs and table cells in document order, each text
+    box just before the paragraph it is anchored in), then the footers.
+    Header and footer paragraphs repeated across sections are read once.
+    
+    Args:
+        docx_path (str, bytes or file-like): Path to the DOCX file, its contents or a binary file object
+        
+    Yields:
+        str: Text of each paragraph, with tabs and line breaks as in python-docx
+    """
     try:
-        doc = Document(docx_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text
+        with zipfile.ZipFile(open_resume_source(docx_path)) as archive:
+            document_part = _docx_document_part(archive)
+            related = _related_parts(archive, document_part)
+            yield from _unique_paragraphs(archive, related.get('header', []))
+            yield from _iter_part_paragraphs(archive, document_part)
+            yield from _unique_paragraphs(archive, related.get('footer', []))
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
+
+def _iter_part_paragraphs(archive, part_name):
+    """Stream the paragraph texts of one XML part of a DOCX archive"""
+    with archive.open(part_name) as part:
+        target = _ParagraphCollector()
+        parser = ET.XMLParser(target=target)
+        for block in iter(lambda: part.read(DOCX_READ_SIZE), b''):
+            parser.feed(block)
+            yield from target.paragraphs
+            target.paragraphs.clear()
+        parser.close()
+        yield from target.paragraphs
+
+class _ParagraphCollector:
+    """
+    XMLParser target collecting the text of every finished paragraph.
+    
+    No element tree is built, the parser only reports tags and text, so
+    memory is bounded by the nesting depth and the paragraphs of one block.
+    Text box paragraphs are nested in the paragraph of their anchor and
+    finish first.
+    """
+    
+    def __init__(self):
+        self.paragraphs = []
+        # Tags of the open elements, and the text pieces of the open paragraphs (innermost last)
+        self._tags = []
+        self._open = []
+        self._fallback_depth = 0
+        # Pieces of the paragraph the open w:t element belongs to
+        self._text = None
+    
+    def start(self, tag, attrib):
+        if tag == W_P:
+            self._open.append([])
+        elif tag == MC_FALLBACK:
+            self._fallback_depth += 1
+        elif self._tags and self._tags[-1] == W_R and self._open and not self._fallback_depth:
+            if tag == W_T:
+                self._text = self._open[-1]
+            elif tag == W_BR:
+                # Page and column breaks have no text
+                if attrib.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                    self._open[-1].append("\n")
+            elif tag in W_RUN_CHARACTERS:
+                self._open[-1].append(W_RUN_CHARACTERS[tag])
+        self._tags.append(tag)
+    
+    def data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+    
+    def end(self, tag):
+        self._tags.pop()
+        if tag == W_T:
+            self._text = None
+        elif tag == W_P:
+            pieces = self._open.pop()
+            if not self._fallback_depth:
+                self.paragraphs.append("".join(pieces))
+        elif tag == MC_FALLBACK:
+            self._fallback_depth -= 1
+    
+    def close(self):
+        return None
+
+def _unique_paragraphs(archive, part_names):
+    """Stream the non-empty paragraphs of several parts, each distinct text once"""
+    seen = set()
+    for part_name in part_names:
+        for paragraph in _iter_part_paragraphs(archive, part_name):
+            if paragraph.strip() and paragraph not in seen:
+                seen.add(paragraph)
+                yield paragraph
+
+def _docx_document_part(archive):
+    """Name of the main document part of a DOCX archive"""
+    return _related_parts(archive, '').get('officeDocument', ['word/document.xml'])[0]
+
+def _related_parts(archive, part_name):
+    """
+    Read the relationships of a part of a DOCX archive
+    
+    Args:
+        archive (zipfile.ZipFile): DOCX archive
+        part_name (str): Name of the part, or '' for the package itself
+        
+    Returns:
+        dict: Names of the related parts present in the archive, in file order,
+            by relationship type (e.g. 'header')
+    """
+    directory, name = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, '_rels', name + '.rels')
+    try:
+        with archive.open(rels_name) as rels:
+            root = ET.parse(rels).getroot()
+    except KeyError:
+        return {}
+    
+    names = set(archive.namelist())
+    related = {}
+    for relationship in root.iter(RELS_NS + 'Relationship'):
+        rel_type = relationship.get('Type', '')
+        target = relationship.get('Target', '')
+        if relationship.get('TargetMode') == 'External' or not rel_type.startswith(RELATIONSHIP_TYPES):
+            continue
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        parts = related.setdefault(rel_type[len(RELATIONSHIP_TYPES):], [])
+        if target in names and target not in parts:
+            parts.append(target)
+    return related
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised inside an ingestion worker when a file takes longer than its timeout
+    
+    A BaseException, so it passes through the "except Exception" handlers that
+    wrap parser errors (and the ones inside pdfminer) up to _ingest_one.
+    """
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+def _ingest_one(path, timeout, max_pages, max_chars):
+    """
+    Extract one file in an ingestion worker process
+    
+    Args:
+        path (str): Path to the resume file
+        timeout (float): Seconds allowed for this file, or None
+        max_pages (int): Optional maximum number of PDF pages to read
+        max_chars (int): Optional character budget
+        
+    Returns:
+        IngestResult: Text or error of the file
+    """
+    start = time.perf_counter()
+    # The timer interrupts pure-Python parsing with ExtractionTimeout (Unix only)
+    use_timer = timeout is not None and hasattr(signal, 'setitimer')
+    if use_timer:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        # Files are already spread over the worker processes, each is read in one
+        text = extract_text_from_resume(path, max_pages=max_pages, max_chars=max_chars, pdf_workers=1)
+        return IngestResult(path, text, None, time.perf_counter() - start)
+    except ExtractionTimeout:
+        return IngestResult(path, None, f"Timed out after {timeout} seconds", time.perf_counter() - start)
+    except Exception as e:
+        return IngestResult(path, None, str(e), time.perf_counter() - start)
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+def ingest_resumes(paths, max_workers=None, timeout=60, max_pages=None, max_chars=None):
+    """
+    Extract text from many resume files in parallel worker processes
+    
+    Results are yielded as soon as each file is done, not in input order.
+    A file that fails to parse or runs past its timeout produces a result
+    with an error instead of stopping the batch. If a worker process dies
+    (for example on a crash inside a native library), the files it may have
+    been working on are retried one at a time, so only the file that
+    really crashes it is reported as failed.
+    
+    Args:
+        paths (iterable): Paths to PDF or DOCX files, consumed lazily
+        max_workers (int): Number of worker processes, defaults to the CPU count
+        timeout (float): Seconds allowed per file, or None for no limit
+        max_pages (int): Optional maximum number of PDF pages to read per file
+        max_chars (int): Optional character budget per file
+        
+    Yields:
+        IngestResult: Path, text (or None), error message (or None) and seconds of each file
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    # Submit a bounded window of files so huge folders don't queue up in memory
+    window = max_workers * 4
+    paths = iter(paths)
+    suspects = deque()
+    in_flight = {}
+    
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            if suspects:
+                # Run files that were in flight during a crash in isolation
+                if not in_flight:
+                    path = suspects.popleft()
+                    future = executor.submit(_ingest_one, path, timeout, max_pages, max_chars)
+                    in_flight[future] = (path, True)
+            else:
+                for path in paths:
+                    future = executor.submit(_ingest_one, path, timeout, max_pages, max_chars)
+                    in_flight[future] = (path, False)
+                    if len(in_flight) >= window:
+                        break
+            
+            if not in_flight:
+                break
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                path, isolated = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    if isolated:
+                        yield IngestResult(path, None, "Worker process crashed", 0.0)
+                    else:
+                        suspects.append(path)
+            
+            if broken:
+                # Every other unfinished file of the broken pool fails too; retry them in isolation
+                for future, (path, isolated) in in_flight.items():
+                    if future.done() and not future.cancelled() and future.exception() is None:
+                        yield future.result()
+                    else:
+                        suspects.append(path)
+                in_flight.clear()
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
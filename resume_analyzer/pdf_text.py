@@ -0,0 +1,165 @@
+"""
+Module for fast PDF text extraction without layout analysis
+
+pdfplumber turns every character of a page into an object with its font,
+position and colour before grouping the characters into words and lines,
+and that accounts for most of the time it takes to extract a resume.
+FastTextExtractor runs pdfminer's content stream interpreter with a device
+that writes the characters straight into a string instead: a line break
+where the baseline moves, a space where the gap to the previous character
+is wider than pdfplumber's tolerance. Lines come out in the order they are
+drawn rather than sorted by position, so every page goes through a quality
+check (see looks_degraded) and the caller re-reads the pages that fail it
+with pdfplumber's layout analysis.
+
+pdfminer is imported by this module, so import it only once a PDF arrives.
+
+_TextDevice.render_string repeats the text space arithmetic of pdfminer's
+PDFTextDevice.render_string_horizontal as of pdfminer.six 20260107, the
+version requirements.txt pins (pdfplumber 0.11.10 requires it); check it
+against the new implementation before moving either pin.
+"""
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.utils import mult_matrix
+
+# Horizontal gap that separates two words and vertical move of the baseline
+# that starts a new line, in points (pdfplumber's default tolerances)
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+# A page looks degraded when it has fewer non-blank characters than this...
+MIN_PAGE_CHARS = 20
+# ...or when its average word length is outside this range: longer words are
+# run together, shorter ones are letter-spaced or drawn one character per line
+MIN_WORD_LENGTH = 2
+MAX_WORD_LENGTH = 12
+
+
+def looks_degraded(text):
+    """
+    Tell whether fast extraction of a page needs a second pass with layout analysis
+
+    Args:
+        text (str): Text of the page from FastTextExtractor
+
+    Returns:
+        bool: True if the text has too few characters or broken word spacing
+    """
+    words = text.split()
+    chars = sum(len(word) for word in words)
+    if chars < MIN_PAGE_CHARS:
+        return True
+    return not MIN_WORD_LENGTH <= chars / len(words) <= MAX_WORD_LENGTH
+
+
+class _TextDevice(PDFTextDevice):
+    """pdfminer device collecting the text of the strings drawn on a page"""
+
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        # font -> {cid: (text, width in text space units per point of font size)}
+        self._glyphs = {}
+        self.reset()
+
+    def reset(self):
+        self.parts = []
+        self.vertical = False
+        self._last_x = None
+        self._last_y = None
+        self._last_space = True
+
+    def render_string(self, textstate, seq, ncs, graphicstate):
+        font = textstate.font
+        if font.is_vertical():
+            # Vertical writing is left to layout analysis
+            self.vertical = True
+            return
+
+        a, b, c, d, e, f = mult_matrix(textstate.matrix, self.ctm)
+        fontsize = textstate.fontsize
+        scaling = textstate.scaling * 0.01
+        charspace = textstate.charspace * scaling
+        wordspace = 0 if font.is_multibyte() else textstate.wordspace * scaling
+        dxscale = 0.001 * fontsize * scaling
+        advance_scale = fontsize * scaling
+        glyphs = self._glyphs.get(font)
+        if glyphs is None:
+            glyphs = self._glyphs[font] = {}
+        parts = self.parts
+
+        # The same text space arithmetic as PDFTextDevice.render_string_horizontal,
+        # so the line matrix left for the next operator is identical
+        x, y = textstate.linematrix
+        needcharspace = False
+        for obj in seq:
+            if isinstance(obj, (int, float)):
+                x -= obj * dxscale
+                needcharspace = True
+                continue
+            if not isinstance(obj, bytes):
+                continue
+            for cid in font.decode(obj):
+                if needcharspace:
+                    x += charspace
+                glyph = glyphs.get(cid)
+                if glyph is None:
+                    try:
+                        text = font.to_unichr(cid)
+                    except PDFUnicodeNotDefined:
+                        text = f"(cid:{cid})"
+                    glyph = glyphs[cid] = (text, font.char_width(cid))
+                text, width = glyph
+
+                # Device space position of the character
+                x0 = a * x + c * y + e
+                y0 = b * x + d * y + f
+                if self._last_y is not None:
+                    if abs(y0 - self._last_y) > Y_TOLERANCE:
+                        parts.append("\n")
+                        self._last_space = True
+                    elif not self._last_space and abs(x0 - self._last_x) > X_TOLERANCE:
+                        # A gap, or a jump back to the left on the same line
+                        parts.append(" ")
+                        self._last_space = True
+                parts.append(text)
+                self._last_space = text.isspace()
+
+                x += width * advance_scale
+                if cid == 32 and wordspace:
+                    x += wordspace
+                needcharspace = True
+                self._last_x = a * x + c * y + e
+                self._last_y = y0
+        textstate.linematrix = (x, y)
+
+
+class FastTextExtractor:
+    """
+    Extracts the text of the pages of one PDF document without layout analysis.
+
+    Fonts are parsed once per document and the text of every glyph is kept
+    per font, so later pages only pay for interpreting their content stream.
+    """
+
+    def __init__(self):
+        self._rsrcmgr = PDFResourceManager(caching=True)
+        self._device = _TextDevice(self._rsrcmgr)
+        self._interpreter = PDFPageInterpreter(self._rsrcmgr, self._device)
+
+    def extract_page(self, page):
+        """
+        Extract the text of a page in the order it is drawn
+
+        Args:
+            page (pdfminer.pdfpage.PDFPage): Page of the document (page_obj of a pdfplumber page)
+
+        Returns:
+            tuple: (text, degraded), degraded being True when the page should be
+                read again with layout analysis
+        """
+        self._device.reset()
+        self._interpreter.process_page(page)
+        text = "".join(self._device.parts).strip()
+        return text, self._device.vertical or looks_degraded(text)
@@ -0,0 +1,87 @@
+"""
+Module for registering precompiled job profiles and reusing them by id
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ProfileRegistry:
+    """
+    Keeps job profiles in memory so they can be reused by id.
+
+    Profile ids are derived from the job description text, so registering
+    the same posting twice returns the existing profile instead of building
+    a new one. The least recently used profiles are dropped once the
+    registry holds more than max_profiles entries.
+    """
+
+    def __init__(self, factory, max_profiles=256):
+        """
+        Create the registry
+
+        Args:
+            factory (callable): Builds a profile from a job description text
+            max_profiles (int): Maximum number of profiles kept in memory
+        """
+        self.factory = factory
+        self.max_profiles = max_profiles
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_id(job_description):
+        """
+        Build the id of a job description
+
+        Args:
+            job_description (str): Job description text
+
+        Returns:
+            str: Profile id
+        """
+        return hashlib.sha256(job_description.strip().encode('utf-8')).hexdigest()[:16]
+
+    def register(self, job_description):
+        """
+        Build and store the profile of a job description, unless it is already registered
+
+        Args:
+            job_description (str): Job description text
+
+        Returns:
+            tuple: (profile id, profile)
+        """
+        profile_id = self.make_id(job_description)
+        profile = self.get(profile_id)
+        if profile is not None:
+            return profile_id, profile
+
+        # Build outside the lock, profiles can be expensive to compute
+        profile = self.factory(job_description)
+        with self._lock:
+            self._profiles[profile_id] = profile
+            self._profiles.move_to_end(profile_id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id, profile
+
+    def get(self, profile_id):
+        """
+        Look up a registered profile
+
+        Args:
+            profile_id (str): Id returned by register
+
+        Returns:
+            object: The profile, or None if it is unknown or was evicted
+        """
+        with self._lock:
+            profile = self._profiles.get(profile_id)
+            if profile is not None:
+                self._profiles.move_to_end(profile_id)
+            return profile
+
+    def __len__(self):
+        with self._lock:
+            return len(self._profiles)
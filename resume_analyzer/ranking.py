@@ -0,0 +1,200 @@
+"""
+Module for scoring many resumes against many job descriptions at once
+"""
+import numpy as np
+
+
+def _indicator_matrices(job_sets, resume_sets):
+    """
+    Build 0/1 membership matrices over the union of all items
+
+    Args:
+        job_sets (list): One set of items (skills, words, ...) per job description
+        resume_sets (list): One set of items per resume
+
+    Returns:
+        tuple: (job matrix, resume matrix) of shape (documents, vocabulary size)
+    """
+    vocabulary = {}
+    for item_set in list(job_sets) + list(resume_sets):
+        for item in item_set:
+            vocabulary.setdefault(item, len(vocabulary))
+
+    def build(sets):
+        matrix = np.zeros((len(sets), max(len(vocabulary), 1)), dtype=np.float32)
+        for row, item_set in enumerate(sets):
+            if item_set:
+                matrix[row, [vocabulary[item] for item in item_set]] = 1
+        return matrix
+
+    return build(job_sets), build(resume_sets)
+
+
+def skill_match_matrix(job_skill_sets, resume_skill_sets):
+    """
+    Percentage of each job's skills found in each resume
+
+    Args:
+        job_skill_sets (list): One set of skills per job description
+        resume_skill_sets (list): One set of skills per resume
+
+    Returns:
+        numpy.ndarray: Matrix of shape (jobs, resumes) with values between 0 and 100
+    """
+    job_matrix, resume_matrix = _indicator_matrices(job_skill_sets, resume_skill_sets)
+    overlap = job_matrix @ resume_matrix.T
+    job_counts = job_matrix.sum(axis=1, keepdims=True)
+    # Jobs without any known skill score 0, like calculate_match_score does
+    return np.divide(overlap * 100, job_counts, out=np.zeros_like(overlap), where=job_counts > 0)
+
+
+def jaccard_matrix(job_sets, resume_sets):
+    """
+    Jaccard similarity (intersection over union) of every job/resume pair
+
+    Args:
+        job_sets (list): One set of items per job description
+        resume_sets (list): One set of items per resume
+
+    Returns:
+        numpy.ndarray: Matrix of shape (jobs, resumes) with values between 0 and 100
+    """
+    job_matrix, resume_matrix = _indicator_matrices(job_sets, resume_sets)
+    intersection = job_matrix @ resume_matrix.T
+    union = job_matrix.sum(axis=1)[:, None] + resume_matrix.sum(axis=1)[None, :] - intersection
+    return np.divide(intersection * 100, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def cosine_matrix(job_vectors, resume_vectors):
+    """
+    Cosine similarity of every job/resume pair
+
+    Args:
+        job_vectors (numpy.ndarray or scipy.sparse matrix): One row per job description
+        resume_vectors (numpy.ndarray or scipy.sparse matrix): One row per resume
+
+    Returns:
+        numpy.ndarray: Matrix of shape (jobs, resumes) with values between 0 and 100
+    """
+    def normalize(vectors):
+        if hasattr(vectors, 'multiply'):
+            norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1))).ravel()
+            norms[norms == 0] = 1
+            return vectors.multiply(1 / norms[:, None]).tocsr()
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    similarity = normalize(job_vectors) @ normalize(resume_vectors).T
+    if hasattr(similarity, 'toarray'):
+        similarity = similarity.toarray()
+    return np.asarray(similarity, dtype=np.float32) * 100
+
+
+def top_k(scores, k):
+    """
+    Indices of the k highest scores in every row, best first
+
+    Args:
+        scores (numpy.ndarray): Matrix of scores
+        k (int): Number of entries to keep per row
+
+    Returns:
+        numpy.ndarray: Matrix of shape (rows, min(k, columns)) with column indices (NaN scores last)
+    """
+    columns = scores.shape[1]
+    k = min(k, columns)
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.intp)
+    if k < columns:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(columns), (scores.shape[0], 1))
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    # Stable sort so equal scores keep their input order
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def prune(lower, upper, keep, top_k_count=None, min_score=None):
+    """
+    Drop the job/resume pairs that can no longer make their job's or their resume's ranking
+
+    A pair is dropped when the highest final score it can still get is below
+    min_score, or when it is below both the top_k_count-th highest lowest
+    score of the other pairs of its job and that of the other pairs of its
+    resume (at least top_k_count pairs are then sure to beat it in both
+    rankings). The rankings of build_rankings are the same with and without
+    pruning, except for the pairs below min_score.
+
+    Args:
+        lower (numpy.ndarray): Lowest final score every pair can still get, shape (jobs, resumes)
+        upper (numpy.ndarray): Highest final score every pair can still get
+        keep (numpy.ndarray): Boolean mask of the pairs still in the running
+        top_k_count (int): Length of the rankings, None to only apply min_score
+        min_score (float): Lowest final score of interest, None for no threshold
+
+    Returns:
+        numpy.ndarray: Boolean mask of the pairs kept
+    """
+    remaining_lower = np.where(keep, lower, -np.inf)
+    # The tolerance covers float32 rounding of the similarities
+    upper = upper + 1e-3
+    if min_score is not None:
+        keep = keep & (upper >= float(min_score))
+    if top_k_count:
+        by_job = upper >= _kth_highest(remaining_lower, top_k_count, axis=1)[:, None]
+        by_resume = upper >= _kth_highest(remaining_lower, top_k_count, axis=0)[None, :]
+        keep = keep & (by_job | by_resume)
+    return keep
+
+
+def _kth_highest(values, k, axis):
+    """k-th highest value along an axis, -inf where there are k values or fewer"""
+    if k >= values.shape[axis]:
+        return np.full(values.shape[1 - axis], -np.inf)
+    return -np.partition(-values, k - 1, axis=axis).take(k - 1, axis=axis)
+
+
+def build_rankings(scores, top_k_count=5, job_ids=None, resume_ids=None):
+    """
+    Turn a job x resume score matrix into top-k rankings in both directions
+
+    Pairs with a NaN score (not computed) are left out of the rankings.
+
+    Args:
+        scores (numpy.ndarray): Match percentages of shape (jobs, resumes)
+        top_k_count (int): Number of entries per ranking
+        job_ids (list): Optional identifiers for the job descriptions
+        resume_ids (list): Optional identifiers for the resumes
+
+    Returns:
+        dict: 'by_job' lists the best resumes for every job, 'by_resume' the best jobs for every resume
+    """
+    job_ids = list(job_ids) if job_ids is not None else list(range(scores.shape[0]))
+    resume_ids = list(resume_ids) if resume_ids is not None else list(range(scores.shape[1]))
+
+    by_job = []
+    for job_index, resume_indices in enumerate(top_k(scores, top_k_count)):
+        by_job.append({
+            'job': job_ids[job_index],
+            'matches': [
+                {'resume': resume_ids[i], 'match_percentage': round(float(scores[job_index, i]), 1)}
+                for i in resume_indices
+                if not np.isnan(scores[job_index, i])
+            ]
+        })
+
+    by_resume = []
+    for resume_index, job_indices in enumerate(top_k(scores.T, top_k_count)):
+        by_resume.append({
+            'resume': resume_ids[resume_index],
+            'matches': [
+                {'job': job_ids[i], 'match_percentage': round(float(scores[i, resume_index]), 1)}
+                for i in job_indices
+                if not np.isnan(scores[i, resume_index])
+            ]
+        })
+
+    return {'by_job': by_job, 'by_resume': by_resume}
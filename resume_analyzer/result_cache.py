@@ -0,0 +1,178 @@
+"""
+Module for caching extracted resume texts and match results by content hash
+"""
+import hashlib
+import json
+import os
+
+from .tiered_cache import TieredCache
+
+# Bytes hashed per read when hashing a file object
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def content_hash(source):
+    """
+    Hash uploaded file contents
+
+    Args:
+        source (bytes or file-like): File contents or a binary file object, which is
+            read to the end and rewound to where it was
+
+    Returns:
+        str: SHA-256 hex digest of the contents
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+        return digest.hexdigest()
+
+    position = source.tell()
+    for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+        digest.update(block)
+    source.seek(position)
+    return digest.hexdigest()
+
+
+def normalize_job_description(job_description):
+    """
+    Normalize the whitespace of a job description that no scorer depends on
+
+    Only runs of spaces and tabs within a line, space at the start and end
+    of a line or of the text, and the line ending style are normalized. Line
+    breaks are kept, since chunking.chunk_text starts a sentence at each one.
+
+    Args:
+        job_description (str): Job description text
+
+    Returns:
+        str: Text with runs of spaces collapsed, lines stripped and line endings unified
+    """
+    return '\n'.join(' '.join(line.split()) for line in job_description.strip().splitlines())
+
+
+class ResultCache(TieredCache):
+    """
+    Size-bounded cache of JSON-serializable values keyed by content hashes.
+
+    Values are stored serialized, so the byte budget counts their real size
+    and every hit returns a fresh copy the caller is free to modify. The
+    tiers, TTL and byte budgets are those of TieredCache.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, ttl=None, cache_dir=None, max_disk_bytes=256 * 1024 * 1024):
+        """
+        Create the cache
+
+        Args:
+            max_bytes (int): Byte budget of the in-process tier
+            ttl (float): Seconds an entry stays valid, or None to keep entries until they are evicted
+            cache_dir (str): Directory of the on-disk tier, or None to keep it disabled
+            max_disk_bytes (int): Byte budget of the on-disk tier
+        """
+        super().__init__(max_bytes, ttl=ttl, cache_dir=cache_dir, max_disk_bytes=max_disk_bytes)
+
+    def get(self, key):
+        """
+        Look up a value, checking memory first and then disk
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            object: A copy of the cached value, or None on a miss
+        """
+        payload = super().get(key)
+        return None if payload is None else json.loads(payload)
+
+    def put(self, key, value):
+        """
+        Add a value to both tiers
+
+        Args:
+            key (str): Cache key
+            value (object): JSON-serializable value; other values are not cached
+        """
+        try:
+            payload = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        except (TypeError, ValueError):
+            return
+        super().put(key, payload)
+
+
+class AnalysisCache:
+    """
+    The two cache levels of resume analysis.
+
+    - texts: SHA-256 of the uploaded file -> text extracted from it, so a
+      re-submitted resume is not parsed again, whatever it is scored against
+    - results: (resume hash, hash of the normalized job description, scorer
+      version) -> match result, so the same resume against the same posting
+      is not scored again
+
+    The result key doubles as the ETag of the response: it changes whenever
+    the resume, the job description or the scorer changes.
+    """
+
+    def __init__(self, text_bytes=32 * 1024 * 1024, result_bytes=16 * 1024 * 1024, ttl=None, cache_dir=None,
+                 namespace=''):
+        """
+        Create both levels
+
+        Args:
+            text_bytes (int): Byte budget of the extracted texts kept in memory
+            result_bytes (int): Byte budget of the match results kept in memory
+            ttl (float): Seconds an entry stays valid, or None to keep entries until they are evicted
+            cache_dir (str): Directory of the on-disk tiers (in its texts/ and results/
+                subdirectories), or None to keep them disabled
+            namespace (str): Part of every result key, so apps that respond with
+                different result formats can share cache_dir
+        """
+        self.namespace = namespace
+        self.texts = ResultCache(text_bytes, ttl, cache_dir and os.path.join(cache_dir, 'texts'))
+        self.results = ResultCache(result_bytes, ttl, cache_dir and os.path.join(cache_dir, 'results'))
+
+    def result_key(self, resume_hash, job_description, scorer_version):
+        """
+        Build the key of a match result
+
+        Args:
+            resume_hash (str): content_hash of the resume file
+            job_description (str): Job description text
+            scorer_version (str): Version of the scoring engine (see ScoringEngine.version)
+
+        Returns:
+            str: Hex digest identifying the result
+        """
+        job_hash = hashlib.sha256(normalize_job_description(job_description).encode('utf-8')).hexdigest()
+        digest = hashlib.sha256()
+        for part in (self.namespace, resume_hash, job_hash, scorer_version):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def text(self, resume_hash, extract):
+        """
+        Get the extracted text of a resume file, extracting it on a miss
+
+        Args:
+            resume_hash (str): content_hash of the resume file
+            extract (callable): Returns the text of the file
+
+        Returns:
+            str: Extracted text
+        """
+        text = self.texts.get(resume_hash)
+        if text is None:
+            text = extract()
+            self.texts.put(resume_hash, text)
+        return text
+
+    def stats(self):
+        """
+        Report the counters of both levels
+
+        Returns:
+            dict: ResultCache.stats of 'texts' and 'results'
+        """
+        return {'texts': self.texts.stats(), 'results': self.results.stats()}
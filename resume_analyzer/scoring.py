@@ -0,0 +1,409 @@
+"""
+Module for scoring resumes against job descriptions with selectable engines
+
+Every engine finds the skills of resumes and job descriptions with
+resume_analyzer.analyzer.extract_skills, so the tiers agree on the skills
+found and missing. They differ in what else they compare and what that costs:
+
+- "lexical": skill match (70%) and word overlap (Jaccard, 30%). No models,
+  a regular expression and a trie scan per document: well under a
+  millisecond per resume/job pair once the text is extracted.
+- "tfidf": skill match (40/70) and TF-IDF cosine with the corpus IDF
+  (30/70), plus the education and experience suggestions. No spaCy or
+  sentence model, about a millisecond per pair.
+- "semantic": the full analyzer, adding the sentence model similarity (30%)
+  and the job keyword suggestions (spaCy). Tens of milliseconds per pair on
+  a CPU, plus loading both models on first use. While the sentence model is
+  loading in the background it scores like "tfidf".
+
+Pick one with get_engine(tier). All engines have the same interface: score
+one resume text against a job description, or rank many resumes against
+many job descriptions.
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from . import analyzer, models
+from .document import Document
+from .ranking import build_rankings, jaccard_matrix, skill_match_matrix
+from .visualizer import generate_match_chart, generate_skills_chart
+
+DEFAULT_TIER = 'lexical'
+
+# Bumped when a change to the engines, the skill dictionary or the asset bundle
+# changes the scores, so cached results of the previous version are not served
+SCORER_VERSION = 2
+
+
+class LexicalProfile:
+    """Skills and content words of a job description, computed once and reused for every resume"""
+
+    def __init__(self, job_description):
+        """
+        Analyze the job description
+
+        Args:
+            job_description (str or Document): Job description text, or its Document
+        """
+        self.document = Document.of(job_description)
+        self.job_description = self.document.lower
+
+        self.skills_flat = []
+        for category, skills in analyzer.extract_skills(None, self.job_description).items():
+            self.skills_flat.extend(skills)
+        self.skill_mask = analyzer.skill_vocabulary.encode(self.skills_flat)
+
+        self.words = self.document.content_words
+
+
+class MatchProfile:
+    """
+    Job description that can be scored with any engine.
+
+    Each engine needs its own precomputed profile of the job (see
+    ScoringEngine.build_profile). They are built the first time an engine
+    scores against this job and kept, so a registered job description is
+    only analyzed once per kind of profile whatever tiers it is used with.
+    """
+
+    def __init__(self, job_description):
+        """
+        Create the profile, nothing is computed until it is used
+
+        Args:
+            job_description (str): Job description text
+        """
+        self.job_description = job_description
+        self._document = None
+        self._profiles = {}
+
+    @property
+    def document(self):
+        """Document of the job description, tokenized once for every kind of profile"""
+        if self._document is None:
+            self._document = Document(self.job_description)
+        return self._document
+
+    def get(self, engine):
+        """
+        Get the profile of this job description for an engine
+
+        Args:
+            engine (ScoringEngine): Engine the profile is for
+
+        Returns:
+            object: Profile built by engine.build_profile
+        """
+        profile = self._profiles.get(engine.profile_kind)
+        if profile is None:
+            profile = self._profiles.setdefault(engine.profile_kind, engine.build_profile(self.document))
+        return profile
+
+    @property
+    def skills_flat(self):
+        """Skills asked for by the job description"""
+        return self.get(get_engine('lexical')).skills_flat
+
+
+class ScoringEngine(ABC):
+    """
+    Interface of the scoring tiers.
+
+    A tier implements build_profile, score and rank; a subclass missing one
+    of them cannot be instantiated.
+
+    Attributes:
+        name (str): Tier name accepted by get_engine
+        models (tuple): Models the tier loads on first use
+        cost (str): Rough cost of scoring one resume/job pair
+        profile_kind (str): Engines with the same kind share job profiles
+    """
+
+    name = None
+    models = ()
+    cost = None
+    profile_kind = None
+
+    def version(self):
+        """
+        Identify what the scores depend on besides the resume and job description
+
+        Returns:
+            str: Tier, SCORER_VERSION and the state the engine currently scores with,
+                part of the result cache keys
+        """
+        return f"{self.name}-{SCORER_VERSION}"
+
+    @abstractmethod
+    def build_profile(self, job_description):
+        """
+        Precompute everything about a job description that does not depend on the resume
+
+        Args:
+            job_description (str or Document): Job description text, or its Document
+
+        Returns:
+            object: Profile accepted by score and rank in place of the text
+        """
+
+    def profile(self, job_description):
+        """
+        Get the profile of a job description text, MatchProfile or profile of this engine
+
+        Args:
+            job_description (str, Document, MatchProfile or profile): Job description
+
+        Returns:
+            object: Profile of this engine
+        """
+        if isinstance(job_description, MatchProfile):
+            return job_description.get(self)
+        if isinstance(job_description, (str, Document)):
+            return self.build_profile(job_description)
+        return job_description
+
+    @abstractmethod
+    def score(self, resume_text, job_description):
+        """
+        Score one resume against one job description
+
+        Args:
+            resume_text (str or Document): Text extracted from the resume, or its Document
+            job_description (str, MatchProfile or profile): Job description
+
+        Returns:
+            dict: Match results with at least 'match_percentage', 'skill_match_percentage',
+                'skills_found', 'skills_missing', 'suggestions', 'skills_chart' and 'match_chart'
+        """
+
+    @abstractmethod
+    def rank(self, resume_texts, job_descriptions, top_k=5, resume_ids=None, cascade=False, min_score=None):
+        """
+        Score every resume against every job description in one pass
+
+        Args:
+            resume_texts (list): Texts extracted from the resumes, or their Documents
+            job_descriptions (list): Job description texts, MatchProfile objects or profiles
+            top_k (int): Number of entries in each ranking
+            resume_ids (list): Optional id of every resume used in the rankings instead of its position
+            cascade (bool): Skip the expensive stages for pairs that cannot make the rankings
+                (see analyzer.rank_matches); tiers without expensive stages ignore it
+            min_score (float): With cascade, also skip pairs that cannot reach this match percentage
+
+        Returns:
+            dict: Top-k rankings per job and per resume (see ranking.build_rankings), the
+                rounded score matrix of shape (jobs, resumes) as 'match_scores' (None for
+                the scores the cascade skipped) and the cascade statistics ('cascade')
+        """
+
+
+class LexicalEngine(ScoringEngine):
+    """Skill match and word overlap, without any model"""
+
+    name = 'lexical'
+    models = ()
+    cost = "under 1 ms per pair, no models"
+    profile_kind = 'lexical'
+
+    def build_profile(self, job_description):
+        return LexicalProfile(job_description)
+
+    def score(self, resume_text, job_description):
+        # Tokenize once, the skills and content words are read from the same document
+        resume_document = Document.of(resume_text)
+        job_profile = self.profile(job_description)
+        skill_vocabulary = analyzer.skill_vocabulary
+
+        # Skills as bitmasks
+        resume_mask = skill_vocabulary.encode_skills(analyzer.extract_skills(None, resume_document.lower))
+        job_mask = job_profile.skill_mask
+        resume_skills_flat = skill_vocabulary.decode(resume_mask)
+
+        # Find matching and missing skills
+        skills_found = skill_vocabulary.decode(job_mask & resume_mask)
+        skills_missing = skill_vocabulary.decode(job_mask & ~resume_mask)
+
+        # Calculate skill match percentage
+        skill_match_percentage = 0
+        if job_profile.skills_flat:
+            skill_match_percentage = (len(skills_found) / len(job_profile.skills_flat)) * 100
+
+        # Jaccard similarity (intersection over union) of the content words
+        resume_words = resume_document.content_words
+        union = len(resume_words | job_profile.words)
+        content_similarity = 0
+        if union > 0:
+            content_similarity = (len(resume_words & job_profile.words) / union) * 100
+
+        # Combine scores (weighted average)
+        match_percentage = (0.7 * skill_match_percentage) + (0.3 * content_similarity)
+        match_percentage = min(100, max(0, match_percentage))  # Ensure between 0-100
+
+        # Generate suggestions
+        suggestions = []
+        if skills_missing:
+            suggestions.append(f"Consider adding these missing skills to your resume: {', '.join(skills_missing[:5])}")
+            if len(skills_missing) > 5:
+                suggestions.append(f"...and {len(skills_missing) - 5} more skills")
+
+        # Prepare chart data
+        skills_chart_data = {
+            'skills_data': [
+                {'skill': skill, 'in_resume': True, 'in_job': skill_vocabulary.has(job_mask, skill)}
+                for skill in resume_skills_flat
+            ] + [
+                {'skill': skill, 'in_resume': False, 'in_job': True}
+                for skill in skills_missing
+            ]
+        }
+
+        match_chart_data = {
+            'overall_match': round(match_percentage, 1),
+            'skill_match': round(skill_match_percentage, 1),
+            'content_match': round(content_similarity, 1)
+        }
+
+        return {
+            'match_percentage': round(match_percentage, 1),
+            'skill_match_percentage': round(skill_match_percentage, 1),
+            'content_similarity': round(content_similarity, 1),
+            'skills_found': skills_found,
+            'skills_missing': skills_missing,
+            'suggestions': suggestions,
+            'skills_chart': skills_chart_data,
+            'match_chart': match_chart_data
+        }
+
+    def rank(self, resume_texts, job_descriptions, top_k=5, resume_ids=None, cascade=False, min_score=None):
+        # Every stage is cheap, there is nothing for a cascade to skip
+        job_profiles = [self.profile(job) for job in job_descriptions]
+        resume_documents = [Document.of(text) for text in resume_texts]
+
+        # Skills and content words once per document
+        resume_skills = [
+            {skill for skills in analyzer.extract_skills(None, document.lower).values() for skill in skills}
+            for document in resume_documents
+        ]
+        skill_scores = skill_match_matrix([set(profile.skills_flat) for profile in job_profiles], resume_skills)
+        resume_words = [document.content_words for document in resume_documents]
+        content_scores = jaccard_matrix([profile.words for profile in job_profiles], resume_words)
+
+        # Combine scores (weighted average), same weights as score
+        scores = np.clip((0.7 * skill_scores) + (0.3 * content_scores), 0, 100)
+
+        result = build_rankings(scores, top_k, resume_ids=resume_ids)
+        result['match_scores'] = np.round(scores, 1).tolist()
+        return result
+
+
+class AnalyzerEngine(ScoringEngine):
+    """Scoring with the resume analyzer (analyzer.analyze_resume and calculate_match_score)"""
+
+    profile_kind = 'analyzer'
+    # Whether the sentence model similarity and keyword suggestions are used
+    semantic = False
+
+    def version(self):
+        # The TF-IDF similarity uses the corpus document frequencies, which change as documents are added
+        return f"{super().version()}-docs{analyzer.term_statistics.n_documents}"
+
+    def build_profile(self, job_description):
+        # Keywords and embedding are computed on first use, only by the tiers that need them
+        return analyzer.JobProfile(job_description, eager=False)
+
+    def score(self, resume_text, job_description):
+        resume_analysis = analyzer.analyze_resume(resume_text)
+        result = analyzer.calculate_match_score(resume_analysis, self.profile(job_description),
+                                                semantic=self.semantic)
+        result['skills_chart'] = generate_skills_chart(resume_analysis, result)
+        result['match_chart'] = generate_match_chart(result)
+        return result
+
+    def rank(self, resume_texts, job_descriptions, top_k=5, resume_ids=None, cascade=False, min_score=None):
+        resume_analyses = [analyzer.analyze_resume(text) for text in resume_texts]
+        result = analyzer.rank_matches(resume_analyses, [self.profile(job) for job in job_descriptions],
+                                       top_k=top_k, semantic=self.semantic, resume_ids=resume_ids,
+                                       cascade=cascade, min_score=min_score)
+        ranked = {
+            'by_job': result['by_job'],
+            'by_resume': result['by_resume'],
+            'match_scores': [
+                [None if np.isnan(score) else score for score in row]
+                for row in np.round(result['match_percentage'], 1).tolist()
+            ]
+        }
+        if 'cascade' in result:
+            ranked['cascade'] = result['cascade']
+        return ranked
+
+
+class TfidfEngine(AnalyzerEngine):
+    """Skill match and corpus TF-IDF similarity, without spaCy or the sentence model"""
+
+    name = 'tfidf'
+    models = ()
+    cost = "about 1 ms per pair, no models"
+    semantic = False
+
+
+class SemanticEngine(AnalyzerEngine):
+    """Skill match, TF-IDF and sentence model similarity, with keyword suggestions"""
+
+    name = 'semantic'
+    models = (models.SPACY_MODEL_NAME, models.SENTENCE_MODEL_NAME)
+    cost = "tens of ms per pair on a CPU, plus loading the models on first use"
+    semantic = True
+
+    def version(self):
+        # Scores made while a model is still loading lack its similarity or keywords
+        loaded = ''.join('1' if models.registry.is_ready(name) else '0' for name in ('spacy', 'sentence_model'))
+        return f"{super().version()}-models{loaded}"
+
+
+ENGINES = {engine.name: engine for engine in (LexicalEngine(), TfidfEngine(), SemanticEngine())}
+
+TIERS = tuple(ENGINES)
+
+
+def get_engine(tier=None):
+    """
+    Get the engine of a scoring tier
+
+    Args:
+        tier (str): One of TIERS, or None for DEFAULT_TIER
+
+    Returns:
+        ScoringEngine: The engine
+
+    Raises:
+        ValueError: If the tier is unknown
+    """
+    engine = ENGINES.get((tier or DEFAULT_TIER).strip().lower())
+    if engine is None:
+        raise ValueError(f"Unknown scoring tier '{tier}', expected one of: {', '.join(TIERS)}")
+    return engine
+
+
+def analysis_response(match_result, tier):
+    """
+    Build the /analyze response of a match result, the same in both entry points
+
+    Args:
+        match_result (dict): Result of ScoringEngine.score
+        tier (str): Tier that scored it
+
+    Returns:
+        dict: Match score (as 'match_score' and 'match_percentage'), skills found and
+            missing, suggestions, chart data and tier
+    """
+    return {
+        'match_score': match_result['match_percentage'],
+        'match_percentage': match_result['match_percentage'],
+        'skills_found': match_result['skills_found'],
+        'skills_missing': match_result['skills_missing'],
+        'suggestions': match_result['suggestions'],
+        'skills_chart': match_result['skills_chart'],
+        'match_chart': match_result['match_chart'],
+        'tier': tier
+    }
@@ -0,0 +1,161 @@
+"""
+Module for splitting resume text into sections (education, experience, ...)
+"""
+import re
+from collections import namedtuple
+
+# One section of a resume: canonical name, header line as written, and the
+# character offsets of its body (the text after the header line up to the
+# next header)
+Section = namedtuple('Section', ['name', 'header', 'start', 'end'])
+
+# Header keywords by canonical section name
+SECTION_KEYWORDS = {
+    'summary': ['summary', 'profile', 'objective', 'about me'],
+    'education': ['education', 'academic', 'qualification'],
+    'experience': ['experience', 'employment', 'work history', 'career history'],
+    'skills': ['skills', 'technologies', 'competencies', 'expertise'],
+    'projects': ['projects', 'portfolio'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'courses'],
+}
+
+# Lines longer than this are content, not headers
+MAX_HEADER_WORDS = 4
+
+_KEYWORD_SECTIONS = {
+    keyword: name for name, keywords in SECTION_KEYWORDS.items() for keyword in keywords
+}
+_HEADER_PATTERN = re.compile(
+    r'\b(' + '|'.join(sorted(map(re.escape, _KEYWORD_SECTIONS), key=len, reverse=True)) + r')',
+    re.IGNORECASE
+)
+
+
+class SectionMap:
+    """
+    Sections of a resume, found in a single pass over its lines.
+
+    The text keeps its line structure; extractors read the sections they
+    need from the map instead of scanning the whole text again. Lines before
+    the first header belong to a section named None.
+    """
+
+    def __init__(self, text):
+        """
+        Segment the text
+
+        Args:
+            text (str): Resume text with its newlines
+        """
+        self.text = text
+        self.sections = []
+
+        name, header, start = None, '', 0
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            section_name = header_section(line)
+            if section_name is not None:
+                self._add(name, header, start, offset)
+                name, header, start = section_name, line.strip(), offset + len(line)
+            offset += len(line)
+        self._add(name, header, start, offset)
+
+    def _add(self, name, header, start, end):
+        # Skip an empty preamble, but keep headers without a body
+        if name is not None or self.text[start:end].strip():
+            self.sections.append(Section(name, header, start, end))
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __contains__(self, name):
+        return any(section.name == name for section in self.sections)
+
+    def get(self, name):
+        """
+        Get the sections with a given name
+
+        Args:
+            name (str): Canonical section name, a key of SECTION_KEYWORDS
+
+        Returns:
+            list: Section tuples in document order (a resume can repeat a header)
+        """
+        return [section for section in self.sections if section.name == name]
+
+    def section_text(self, name):
+        """
+        Get the body text of the sections with a given name
+
+        Args:
+            name (str): Canonical section name
+
+        Returns:
+            str: Bodies of the matching sections joined by newlines, '' if there are none
+        """
+        return '\n'.join(self.text[section.start:section.end].strip('\n') for section in self.get(name))
+
+    def section_lines(self, name):
+        """
+        Get the non-empty lines of the sections with a given name
+
+        Args:
+            name (str): Canonical section name
+
+        Returns:
+            list: Stripped lines
+        """
+        return [line.strip() for line in self.section_text(name).splitlines() if line.strip()]
+
+    def lines(self):
+        """
+        Get every non-empty line of the text
+
+        Returns:
+            list: Stripped lines
+        """
+        return [line.strip() for line in self.text.splitlines() if line.strip()]
+
+    def to_dict(self):
+        """
+        Describe the sections, e.g. for an API response
+
+        Returns:
+            list: One dict per section with its name, header and offsets
+        """
+        return [section._asdict() for section in self.sections]
+
+
+def header_section(line):
+    """
+    Tell whether a line is a section header
+
+    Args:
+        line (str): One line of resume text
+
+    Returns:
+        str: Canonical section name, or None if the line is not a header
+    """
+    words = line.split()
+    if not words or len(words) > MAX_HEADER_WORDS:
+        return None
+    match = _HEADER_PATTERN.search(line)
+    if match is None:
+        return None
+    return _KEYWORD_SECTIONS[match.group(1).lower()]
+
+
+def segment(text):
+    """
+    Split resume text into sections
+
+    Args:
+        text (str): Resume text with its newlines
+
+    Returns:
+        SectionMap: Sections with their headers and offsets
+    """
+    return SectionMap(text)
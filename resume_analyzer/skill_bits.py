@@ -0,0 +1,331 @@
+"""
+Module for representing skill sets as bitmasks over a fixed skill vocabulary
+"""
+import numpy as np
+
+# Number of set bits in every byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """
+    Count the set bits of packed bitmasks
+
+    Args:
+        words (numpy.ndarray): uint64 array of shape (..., words per mask)
+
+    Returns:
+        numpy.ndarray: Number of set bits of every mask, shape (...)
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    counts = _BYTE_POPCOUNT[words.view(np.uint8)]
+    return counts.reshape(words.shape[:-1] + (-1,)).sum(axis=-1, dtype=np.int64)
+
+
+def bit_count(mask):
+    """
+    Count the set bits of a single bitmask
+
+    Args:
+        mask (int): Bitmask
+
+    Returns:
+        int: Number of skills in the mask
+    """
+    return bin(mask).count('1')
+
+
+class SkillVocabulary:
+    """
+    Fixed index of every skill of a skills dictionary.
+
+    Skill i of the vocabulary is bit i of a mask. A single document's skills
+    are a Python int, so overlap and missing skills are one AND each; a pool
+    of documents is a uint64 matrix with one row of 64-bit words per
+    document (see SkillPool).
+    """
+
+    def __init__(self, skills_by_category):
+        """
+        Index the skills
+
+        Args:
+            skills_by_category (dict): Mapping of category name to a list of skills
+        """
+        self.skills = []
+        self.categories = []
+        self.index = {}
+        for category, skill_list in skills_by_category.items():
+            for skill in skill_list:
+                if skill not in self.index:
+                    self.index[skill] = len(self.skills)
+                    self.skills.append(skill)
+                    self.categories.append(category)
+
+        self.n_words = max(1, (len(self.skills) + 63) // 64)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return skill in self.index
+
+    def _bit(self, skill):
+        try:
+            return self.index[skill]
+        except KeyError:
+            raise ValueError(f"Unknown skill: {skill}") from None
+
+    def encode(self, skills):
+        """
+        Build the bitmask of a set of skills
+
+        Args:
+            skills (iterable): Skills of the vocabulary
+
+        Returns:
+            int: Bitmask with the bit of every skill set
+        """
+        mask = 0
+        for skill in skills:
+            mask |= 1 << self._bit(skill)
+        return mask
+
+    def encode_skills(self, skills_by_category):
+        """
+        Build the bitmask of an extract_skills result
+
+        Args:
+            skills_by_category (dict): Mapping of category name to a list of skills
+
+        Returns:
+            int: Bitmask of all skills, whatever their category
+        """
+        return self.encode(skill for skill_list in skills_by_category.values() for skill in skill_list)
+
+    def decode(self, mask):
+        """
+        List the skills of a bitmask
+
+        Args:
+            mask (int): Bitmask
+
+        Returns:
+            list: Skills in vocabulary (dictionary) order
+        """
+        skills = []
+        while mask:
+            low_bit = mask & -mask
+            skills.append(self.skills[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return skills
+
+    def has(self, mask, skill):
+        """
+        Check whether a bitmask contains a skill
+
+        Args:
+            mask (int): Bitmask
+            skill (str): Skill of the vocabulary
+
+        Returns:
+            bool: True if the skill's bit is set
+        """
+        return bool(mask >> self._bit(skill) & 1)
+
+    def category(self, skill):
+        """
+        Get the category a skill is listed under (the first one, if several)
+
+        Args:
+            skill (str): Skill of the vocabulary
+
+        Returns:
+            str: Category name
+        """
+        return self.categories[self._bit(skill)]
+
+    def to_words(self, mask):
+        """
+        Pack a bitmask into 64-bit words
+
+        Args:
+            mask (int): Bitmask
+
+        Returns:
+            numpy.ndarray: uint64 array of n_words words, lowest skills first
+        """
+        return np.array([(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for word in range(self.n_words)], dtype=np.uint64)
+
+    def encode_many(self, skill_sets):
+        """
+        Pack the skills of many documents into a bit matrix
+
+        Args:
+            skill_sets (iterable): One iterable of skills per document
+
+        Returns:
+            numpy.ndarray: uint64 matrix of shape (documents, n_words)
+        """
+        rows = [self.to_words(self.encode(skills)) for skills in skill_sets]
+        if not rows:
+            return np.zeros((0, self.n_words), dtype=np.uint64)
+        return np.vstack(rows)
+
+
+class SkillPool:
+    """
+    Skills of a pool of candidates as a packed bit matrix.
+
+    Boolean queries such as "python AND (aws OR gcp)" and per-candidate
+    overlap counts are a few vectorized AND/popcount operations over the
+    whole matrix.
+    """
+
+    def __init__(self, vocabulary, skill_sets=()):
+        """
+        Build the pool
+
+        Args:
+            vocabulary (SkillVocabulary): Vocabulary the masks refer to
+            skill_sets (iterable): One iterable of skills per candidate
+        """
+        self.vocabulary = vocabulary
+        self.bits = vocabulary.encode_many(skill_sets)
+
+    @classmethod
+    def from_masks(cls, vocabulary, masks):
+        """
+        Build a pool from skill bitmasks
+
+        Args:
+            vocabulary (SkillVocabulary): Vocabulary the masks refer to
+            masks (iterable): One bitmask per candidate
+
+        Returns:
+            SkillPool: Pool of the candidates
+        """
+        pool = cls(vocabulary)
+        rows = [vocabulary.to_words(mask) for mask in masks]
+        if rows:
+            pool.bits = np.vstack(rows)
+        return pool
+
+    def __len__(self):
+        return self.bits.shape[0]
+
+    def add(self, skill_sets):
+        """
+        Append candidates to the pool
+
+        Args:
+            skill_sets (iterable): One iterable of skills per new candidate
+        """
+        self.bits = np.vstack([self.bits, self.vocabulary.encode_many(skill_sets)])
+
+    def subset(self, rows):
+        """
+        Get a pool with some of the candidates
+
+        Args:
+            rows (numpy.ndarray): Candidate indices or boolean mask
+
+        Returns:
+            SkillPool: Pool of the selected candidates, in the given order
+        """
+        pool = SkillPool(self.vocabulary)
+        pool.bits = self.bits[rows]
+        return pool
+
+    def overlap(self, skills):
+        """
+        Count how many of the given skills every candidate has
+
+        Args:
+            skills (iterable or int): Skills, or their bitmask
+
+        Returns:
+            numpy.ndarray: Count per candidate
+        """
+        return popcount(self.bits & self._words(skills))
+
+    def has_all(self, skills):
+        """
+        Find the candidates having every given skill
+
+        Args:
+            skills (iterable or int): Skills, or their bitmask
+
+        Returns:
+            numpy.ndarray: Boolean mask over the candidates
+        """
+        selected = np.ones(len(self), dtype=bool)
+        # Only the words holding a queried skill are read
+        for column, word in self._nonzero_words(skills):
+            selected &= (self.bits[:, column] & word) == word
+        return selected
+
+    def has_any(self, skills):
+        """
+        Find the candidates having at least one of the given skills
+
+        Args:
+            skills (iterable or int): Skills, or their bitmask
+
+        Returns:
+            numpy.ndarray: Boolean mask over the candidates
+        """
+        selected = np.zeros(len(self), dtype=bool)
+        for column, word in self._nonzero_words(skills):
+            selected |= (self.bits[:, column] & word) != 0
+        return selected
+
+    def query(self, all_of=(), any_of=(), none_of=()):
+        """
+        Filter the candidates with a boolean skill query
+
+        "python AND (aws OR gcp)" is query(all_of=['python'], any_of=['aws', 'gcp']).
+
+        Args:
+            all_of (iterable): Skills a candidate must all have
+            any_of (iterable): Skills of which a candidate must have at least one (ignored if empty)
+            none_of (iterable): Skills a candidate must not have
+
+        Returns:
+            numpy.ndarray: Boolean mask over the candidates
+        """
+        selected = self.has_all(all_of)
+        if self._nonzero_words(any_of):
+            selected &= self.has_any(any_of)
+        if self._nonzero_words(none_of):
+            selected &= ~self.has_any(none_of)
+        return selected
+
+    def coverage_matrix(self, skill_masks):
+        """
+        Percentage of each job's skills every candidate has
+
+        Args:
+            skill_masks (list): Skill bitmask of every job
+
+        Returns:
+            numpy.ndarray: Percentages of shape (jobs, candidates), 0 for jobs without skills
+        """
+        job_words = np.vstack([self.vocabulary.to_words(mask) for mask in skill_masks])
+        job_sizes = popcount(job_words)
+        overlaps = popcount(job_words[:, None, :] & self.bits[None, :, :])
+        return np.divide(
+            overlaps * 100.0, job_sizes[:, None],
+            out=np.zeros(overlaps.shape), where=job_sizes[:, None] > 0
+        )
+
+    def _words(self, skills):
+        mask = skills if isinstance(skills, int) else self.vocabulary.encode(skills)
+        return self.vocabulary.to_words(mask)
+
+    def _nonzero_words(self, skills):
+        """List (column, word) of the words of a skill set that have a bit set"""
+        words = self._words(skills)
+        return [(column, words[column]) for column in np.flatnonzero(words)]
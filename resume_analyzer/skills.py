@@ -0,0 +1,126 @@
+"""
+Module for matching skills from a skills dictionary against text
+"""
+import re
+
+# Marker key for trie nodes that complete a skill
+_END = ''
+
+
+def _is_word_char(char):
+    """
+    Check whether a character counts as a word character (same as regex \\w)
+
+    Args:
+        char (str): Single character
+
+    Returns:
+        bool: True if the character is alphanumeric or an underscore
+    """
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """
+    Matches every skill of a skills dictionary in a single scan of the text.
+
+    The skills are compiled once into a character trie. Matching walks the
+    trie from each token start, so the cost depends on the length of the
+    text and not on the number of skills in the dictionary. A skill only
+    matches as a whole token: it may not be directly preceded or followed
+    by a word character. This also works for skills that start or end with
+    punctuation such as "c++", "c#", "node.js" or "ci/cd", so the text must
+    keep its punctuation. A space in a skill matches any run of whitespace.
+    """
+
+    def __init__(self, skills_by_category):
+        """
+        Compile the matcher
+
+        Args:
+            skills_by_category (dict): Mapping of category name to a list of skills
+        """
+        self.skills_by_category = skills_by_category
+        self._trie = {}
+        # Position of every (category, skill) pair in the dictionary, used
+        # to return results in dictionary order
+        self._order = {}
+
+        for category, skill_list in skills_by_category.items():
+            for skill in skill_list:
+                key = (category, skill)
+                if key in self._order:
+                    continue
+                self._order[key] = len(self._order)
+
+                node = self._trie
+                for char in skill.lower():
+                    node = node.setdefault(char, {})
+                node.setdefault(_END, []).append(key)
+
+        # A skill can only start at a character that begins some skill and
+        # that is not preceded by a word character
+        first_chars = ''.join(sorted(char for char in self._trie if char != _END))
+        self._start_pattern = re.compile(r'(?<!\w)[' + re.escape(first_chars) + ']') if first_chars else None
+
+    def __len__(self):
+        return len(self._order)
+
+    def find(self, text):
+        """
+        Find every skill occurring in the text
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            list: (category, skill) pairs in dictionary order, without duplicates
+        """
+        if self._start_pattern is None:
+            return []
+
+        text = text.lower()
+        text_length = len(text)
+        trie = self._trie
+        found = set()
+
+        for match in self._start_pattern.finditer(text):
+            node = trie
+            position = match.start()
+            while position < text_length:
+                char = text[position]
+                if char.isspace():
+                    # A space in a skill matches any run of whitespace ("rest\napi")
+                    node = node.get(' ')
+                    if node is None:
+                        break
+                    position += 1
+                    while position < text_length and text[position].isspace():
+                        position += 1
+                else:
+                    node = node.get(char)
+                    if node is None:
+                        break
+                    position += 1
+                if _END in node and (position == text_length or not _is_word_char(text[position])):
+                    found.update(node[_END])
+
+        return sorted(found, key=self._order.__getitem__)
+
+    def extract(self, text):
+        """
+        Find skills in the text grouped by category
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            dict: Dictionary of skills by category, only including categories with found skills
+        """
+        # Pairs come back in dictionary order, so the categories keep the
+        # order of the skills dictionary as well
+        result = {}
+        for category, skill in self.find(text):
+            result.setdefault(category, []).append(skill)
+
+        return result
@@ -0,0 +1,393 @@
+"""
+Module for keeping analyzed candidates on disk so they can be re-ranked without re-parsing
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Precomputed features of every stored candidate, in insertion order, as
+# returned by CandidateStore.load(). term_counts is a sparse (candidates,
+# terms) matrix over vocabulary; embeddings has a zero row wherever
+# has_embedding is False.
+StoredCandidates = namedtuple('StoredCandidates', [
+    'ids', 'names', 'skill_sets', 'vocabulary', 'term_counts', 'embeddings', 'has_embedding'
+])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    sections TEXT NOT NULL,
+    term_counts TEXT NOT NULL,
+    embedding_row INTEGER,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CandidateStore:
+    """
+    Persistent store of analyzed resumes, keyed by a hash of their text.
+
+    Everything except the embeddings lives in a SQLite database. The
+    embeddings are rows of one float32 file that is memory-mapped when the
+    store is loaded. Embeddings are only ever appended, and synced to disk
+    before the transaction that points rows at them commits: a crash leaves
+    at most unreferenced rows, which the next open cuts off. Replaced and
+    removed embeddings leave unused rows behind until compact(), which
+    writes a new file and switches to it in the same transaction as the
+    new row numbers.
+    """
+
+    DATABASE_NAME = 'candidates.sqlite'
+    EMBEDDINGS_NAME = 'embeddings.f32'
+
+    def __init__(self, directory):
+        """
+        Open the store, creating it if needed
+
+        Args:
+            directory (str): Directory holding the database and the embedding file
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._loaded = None
+
+        self._db = sqlite3.connect(os.path.join(directory, self.DATABASE_NAME), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'embedding_dim'").fetchone()
+        self.embedding_dim = int(row[0]) if row else None
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'embeddings_file'").fetchone()
+        self._embeddings_path = os.path.join(directory, row[0] if row else self.EMBEDDINGS_NAME)
+        self._check_embeddings()
+
+    @staticmethod
+    def make_key(text):
+        """
+        Build the key of a candidate
+
+        Args:
+            text (str): Text extracted from the resume
+
+        Returns:
+            str: Hex digest of the text
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM candidates WHERE id = ?", (key,)).fetchone() is not None
+
+    def missing(self, keys):
+        """
+        Find which candidates are not stored yet
+
+        Args:
+            keys (iterable): Candidate keys
+
+        Returns:
+            list: Keys that are not in the store, in input order
+        """
+        with self._lock:
+            stored = {row[0] for row in self._db.execute("SELECT id FROM candidates")}
+        return [key for key in keys if key not in stored]
+
+    def without_embedding(self):
+        """
+        List the candidates stored before their embedding could be computed
+
+        Returns:
+            list: Keys of candidates without an embedding
+        """
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT id FROM candidates WHERE embedding_row IS NULL")]
+
+    def put_many(self, candidates):
+        """
+        Insert or replace candidates in one transaction
+
+        Args:
+            candidates (iterable): Dicts with 'id', 'name', 'text', 'skills' (list),
+                'sections' (list of dicts), 'term_counts' (dict) and 'embedding'
+                (1-D array or None)
+        """
+        now = time.time()
+        candidates = list(candidates)
+        with self._lock:
+            # Vectors first, so the rows the transaction points at are on disk when it commits
+            new_rows = iter(self._append_embeddings(
+                [candidate['embedding'] for candidate in candidates if candidate.get('embedding') is not None]
+            ))
+            with self._db:
+                self._save_embedding_dim()
+                for candidate in candidates:
+                    if candidate.get('embedding') is not None:
+                        embedding_row = next(new_rows)
+                    else:
+                        row = self._db.execute(
+                            "SELECT embedding_row FROM candidates WHERE id = ?", (candidate['id'],)
+                        ).fetchone()
+                        embedding_row = row[0] if row else None
+
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO candidates "
+                        "(id, name, text, skills, sections, term_counts, embedding_row, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            candidate['id'],
+                            candidate.get('name'),
+                            candidate['text'],
+                            json.dumps(sorted(candidate['skills'])),
+                            json.dumps(candidate['sections']),
+                            json.dumps(candidate['term_counts']),
+                            embedding_row,
+                            now
+                        )
+                    )
+            self._loaded = None
+
+    def put(self, candidate):
+        """
+        Insert or replace one candidate, see put_many
+
+        Args:
+            candidate (dict): Candidate features
+        """
+        self.put_many([candidate])
+
+    def set_embeddings(self, keys, embeddings):
+        """
+        Store the embeddings of candidates that are already in the store
+
+        Args:
+            keys (list): Candidate keys
+            embeddings (numpy.ndarray): One row per key
+        """
+        with self._lock:
+            pairs = list(zip(keys, embeddings))
+            embedding_rows = self._append_embeddings([embedding for _, embedding in pairs])
+            now = time.time()
+            with self._db:
+                self._save_embedding_dim()
+                # Keys that are not stored leave an unused row behind
+                self._db.executemany(
+                    "UPDATE candidates SET embedding_row = ?, updated_at = ? WHERE id = ?",
+                    [(embedding_row, now, key) for (key, _), embedding_row in zip(pairs, embedding_rows)]
+                )
+            self._loaded = None
+
+    def get(self, key):
+        """
+        Read one candidate
+
+        Args:
+            key (str): Candidate key
+
+        Returns:
+            dict: Candidate features as given to put_many, or None if the key is unknown
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, name, text, skills, sections, term_counts, embedding_row FROM candidates WHERE id = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            embedding = None
+            if row[6] is not None:
+                embedding = np.array(self._embedding_rows()[row[6]])
+        return {
+            'id': row[0],
+            'name': row[1],
+            'text': row[2],
+            'skills': json.loads(row[3]),
+            'sections': json.loads(row[4]),
+            'term_counts': json.loads(row[5]),
+            'embedding': embedding
+        }
+
+    def remove(self, keys):
+        """
+        Delete candidates
+
+        Args:
+            keys (iterable): Candidate keys
+        """
+        with self._lock:
+            with self._db:
+                self._db.executemany("DELETE FROM candidates WHERE id = ?", [(key,) for key in keys])
+            self._loaded = None
+
+    def load(self):
+        """
+        Read the features needed for scoring of every candidate
+
+        The result is kept until the next write, so scoring many job
+        descriptions against the store reads it only once.
+
+        Returns:
+            StoredCandidates: Ids, names, skill sets, term count matrix and embeddings
+        """
+        from scipy.sparse import csr_matrix
+
+        with self._lock:
+            if self._loaded is not None:
+                return self._loaded
+
+            rows = self._db.execute(
+                "SELECT id, name, skills, term_counts, embedding_row FROM candidates ORDER BY rowid"
+            ).fetchall()
+
+            vocabulary = {}
+            data, indices, indptr = [], [], [0]
+            for row in rows:
+                for term, count in json.loads(row[3]).items():
+                    indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                    data.append(count)
+                indptr.append(len(indices))
+            term_counts = csr_matrix(
+                (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+                shape=(len(rows), len(vocabulary))
+            )
+
+            has_embedding = np.array([row[4] is not None for row in rows], dtype=bool)
+            embeddings = None
+            if self.embedding_dim is not None:
+                embeddings = np.zeros((len(rows), self.embedding_dim), dtype=np.float32)
+                if has_embedding.any():
+                    embedding_rows = np.array([row[4] for row in rows if row[4] is not None])
+                    embeddings[has_embedding] = self._embedding_rows()[embedding_rows]
+
+            self._loaded = StoredCandidates(
+                ids=[row[0] for row in rows],
+                names=[row[1] for row in rows],
+                skill_sets=[set(json.loads(row[2])) for row in rows],
+                vocabulary=vocabulary,
+                term_counts=term_counts,
+                embeddings=embeddings,
+                has_embedding=has_embedding
+            )
+            return self._loaded
+
+    def compact(self):
+        """Rewrite the embedding file without the rows of removed candidates or replaced embeddings"""
+        with self._lock:
+            if self.embedding_dim is None:
+                return
+            rows = self._db.execute(
+                "SELECT id, embedding_row FROM candidates WHERE embedding_row IS NOT NULL ORDER BY embedding_row"
+            ).fetchall()
+            kept = np.zeros((0, self.embedding_dim), dtype=np.float32)
+            if rows:
+                kept = np.array(self._embedding_rows()[[row[1] for row in rows]])
+
+            # The compacted rows go to a new file; the transaction that renumbers
+            # the rows also switches to it, so a crash leaves one consistent pair
+            generation = int(time.time() * 1000)
+            name = f"embeddings.{generation}.f32"
+            path = os.path.join(self.directory, name)
+            with open(path, 'wb') as f:
+                f.write(kept.astype(np.float32).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with self._db:
+                self._db.executemany(
+                    "UPDATE candidates SET embedding_row = ? WHERE id = ?",
+                    [(index, row[0]) for index, row in enumerate(rows)]
+                )
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('embeddings_file', ?)", (name,))
+            previous_path, self._embeddings_path = self._embeddings_path, path
+            if os.path.exists(previous_path):
+                os.remove(previous_path)
+            self._loaded = None
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._db.close()
+
+    def _embedding_rows(self):
+        """Memory-map the embedding file (lock held)"""
+        if self.embedding_dim is None or not os.path.exists(self._embeddings_path):
+            return np.zeros((0, self.embedding_dim or 0), dtype=np.float32)
+        rows = os.path.getsize(self._embeddings_path) // (4 * self.embedding_dim)
+        if rows == 0:
+            return np.zeros((0, self.embedding_dim), dtype=np.float32)
+        return np.memmap(self._embeddings_path, dtype=np.float32, mode='r', shape=(rows, self.embedding_dim))
+
+    def _append_embeddings(self, embeddings):
+        """
+        Append embeddings to the embedding file and sync it (lock held)
+
+        Returns:
+            list: Row of every embedding
+        """
+        if not embeddings:
+            return []
+        matrix = np.vstack([np.ascontiguousarray(embedding, dtype=np.float32).ravel() for embedding in embeddings])
+        if self.embedding_dim is None:
+            self.embedding_dim = matrix.shape[1]
+        elif matrix.shape[1] != self.embedding_dim:
+            raise ValueError(f"Embedding has {matrix.shape[1]} dimensions, the store uses {self.embedding_dim}")
+
+        with open(self._embeddings_path, 'ab') as f:
+            first_row = f.tell() // (4 * self.embedding_dim)
+            f.write(matrix.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        return list(range(first_row, first_row + len(matrix)))
+
+    def _save_embedding_dim(self):
+        """Record the embedding size in the current transaction (lock held)"""
+        if self.embedding_dim is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('embedding_dim', ?)", (str(self.embedding_dim),)
+            )
+
+    def _check_embeddings(self):
+        """
+        Line the embedding file up with the database after a crash
+
+        Rows written by a transaction that never committed are cut off the
+        end of the file, and candidates whose row is missing from it (a file
+        lost or truncated outside the store) lose their embedding, which
+        store_resumes computes again. Files left by an interrupted compact()
+        are deleted.
+        """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('embeddings.') and name.endswith('.f32') and path != self._embeddings_path:
+                os.remove(path)
+
+        if self.embedding_dim is None:
+            if os.path.exists(self._embeddings_path):
+                os.truncate(self._embeddings_path, 0)
+            return
+
+        row_bytes = 4 * self.embedding_dim
+        file_rows = os.path.getsize(self._embeddings_path) // row_bytes if os.path.exists(self._embeddings_path) else 0
+        with self._db:
+            self._db.execute(
+                "UPDATE candidates SET embedding_row = NULL WHERE embedding_row >= ?", (file_rows,)
+            )
+        last_row = self._db.execute("SELECT MAX(embedding_row) FROM candidates").fetchone()[0]
+        used_bytes = (last_row + 1) * row_bytes if last_row is not None else 0
+        if os.path.exists(self._embeddings_path) and os.path.getsize(self._embeddings_path) > used_bytes:
+            os.truncate(self._embeddings_path, used_bytes)
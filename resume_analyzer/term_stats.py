@@ -0,0 +1,274 @@
+"""
+Module for corpus-level TF-IDF term statistics
+"""
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+
+class TermStatistics:
+    """
+    Document frequencies of terms over a corpus of resumes and job postings.
+
+    Documents are added incrementally (add_documents), so the IDF improves
+    as the corpus grows without refitting anything. Scoring a document only
+    needs a sparse transform with the current IDF and a dot product. The IDF
+    is the smoothed one of TfidfVectorizer, ln((1 + n) / (1 + df)) + 1, and
+    terms never seen in the corpus get the IDF of df = 0 in columns of their
+    own (see ColumnSpace), so they still match between the documents compared.
+    With an empty corpus every IDF is 1 and the similarity is the plain
+    term-count cosine.
+    """
+
+    def __init__(self, path=None):
+        """
+        Open the statistics, loading them from path if the file exists
+
+        Args:
+            path (str): JSON file the statistics are saved to, or None to keep them in memory
+        """
+        self.path = path
+        self.n_documents = 0
+        self.vocabulary = {}
+        self._document_frequency = []
+        self._lock = threading.RLock()
+        # Bumped on every update, the cached IDF is rebuilt when it changes
+        self.version = 0
+        self._idf = None
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.n_documents = data['n_documents']
+            self.vocabulary = {term: column for column, term in enumerate(data['terms'])}
+            self._document_frequency = data['document_frequency']
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def add_documents(self, term_counts):
+        """
+        Count the terms of new corpus documents
+
+        Args:
+            term_counts (iterable): Term counts (dict or Counter) of every document
+        """
+        with self._lock:
+            for counts in term_counts:
+                self.n_documents += 1
+                for term, count in counts.items():
+                    if count <= 0:
+                        continue
+                    column = self.vocabulary.get(term)
+                    if column is None:
+                        column = self.vocabulary[term] = len(self._document_frequency)
+                        self._document_frequency.append(0)
+                    self._document_frequency[column] += 1
+            self.version += 1
+            self._idf = None
+
+    def unknown_idf(self):
+        """IDF of a term that is not in the corpus"""
+        return math.log(1 + self.n_documents) + 1
+
+    def idf(self):
+        """
+        Get the IDF of every vocabulary term
+
+        Returns:
+            numpy.ndarray: IDF per vocabulary column
+        """
+        with self._lock:
+            if self._idf is None:
+                document_frequency = np.asarray(self._document_frequency, dtype=np.float64)
+                self._idf = np.log((1 + self.n_documents) / (1 + document_frequency)) + 1
+            return self._idf
+
+    def column_space(self):
+        """
+        Start the column space of documents that are compared together
+
+        Returns:
+            ColumnSpace: Space with the current vocabulary columns and no extra terms
+        """
+        with self._lock:
+            return ColumnSpace(len(self._document_frequency))
+
+    def transform(self, term_counts, space=None):
+        """
+        Build the L2-normalized TF-IDF vectors of documents
+
+        Terms outside the vocabulary get the IDF of an unseen term in an
+        extra column of space, so dot products of vectors built in the same
+        space are exact cosine similarities.
+
+        Args:
+            term_counts (list): Term counts (dict or Counter) of every document
+            space (ColumnSpace): Columns shared with the documents these are compared
+                with, by default a new space for these documents only
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrix of shape (documents, columns of space)
+        """
+        from scipy.sparse import csr_matrix
+
+        with self._lock:
+            if space is None:
+                space = self.column_space()
+            idf = self.idf()
+            unknown_idf = self.unknown_idf()
+            data, indices, indptr = [], [], [0]
+            for counts in term_counts:
+                for term, count in counts.items():
+                    column = space.column(term, self.vocabulary)
+                    indices.append(column)
+                    data.append(count * (idf[column] if column < space.size else unknown_idf))
+                indptr.append(len(indices))
+            matrix = csr_matrix(
+                (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+                shape=(len(term_counts), len(space))
+            )
+        return _normalize_rows(matrix)
+
+    def transform_matrix(self, counts, vocabulary, space=None):
+        """
+        Build the L2-normalized TF-IDF vectors of a term count matrix
+
+        Used for count matrices kept over their own vocabulary, such as the
+        one of CandidateStore.load(), without going back to dicts. Terms
+        outside the corpus vocabulary get extra columns of space, as in transform.
+
+        Args:
+            counts (scipy.sparse.csr_matrix): Term counts of shape (documents, len(vocabulary))
+            vocabulary (dict): Term of every column of counts
+            space (ColumnSpace): Columns shared with the documents these are compared
+                with, by default a new space for these documents only
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrix of shape (documents, columns of space)
+        """
+        from scipy.sparse import csr_matrix
+
+        with self._lock:
+            if space is None:
+                space = self.column_space()
+            idf = self.idf()
+            unknown_idf = self.unknown_idf()
+            # Column and IDF of every term of the other vocabulary
+            columns = np.empty(len(vocabulary), dtype=np.int64)
+            term_idf = np.empty(len(vocabulary))
+            for term, column in vocabulary.items():
+                mapped = columns[column] = space.column(term, self.vocabulary)
+                term_idf[column] = idf[mapped] if mapped < space.size else unknown_idf
+
+        counts = counts.tocoo()
+        matrix = csr_matrix(
+            (counts.data * term_idf[counts.col], (counts.row, columns[counts.col])),
+            shape=(counts.shape[0], len(space))
+        )
+        return _normalize_rows(matrix)
+
+    def similarity(self, job_vectors, resume_vectors):
+        """
+        Cosine similarity of every job/resume pair of transformed documents
+
+        Args:
+            job_vectors (scipy.sparse.csr_matrix): Output of transform, one row per job description
+            resume_vectors (scipy.sparse.csr_matrix): Output of transform, one row per resume
+
+        Returns:
+            numpy.ndarray: Matrix of shape (jobs, resumes) with values between 0 and 100
+        """
+        # Vectors transformed before the space grew have fewer columns
+        columns = max(job_vectors.shape[1], resume_vectors.shape[1])
+        job_vectors = _with_columns(job_vectors, columns)
+        resume_vectors = _with_columns(resume_vectors, columns)
+        return np.clip((job_vectors @ resume_vectors.T).toarray() * 100, 0, 100)
+
+    def save(self):
+        """Write the statistics to path atomically (does nothing without a path)"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'n_documents': self.n_documents,
+                'terms': list(self.vocabulary),
+                'document_frequency': self._document_frequency
+            }
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+
+
+class ColumnSpace:
+    """
+    Columns of the TF-IDF vectors of documents that are compared together.
+
+    The first size columns are those of the corpus vocabulary when the space
+    was started. Every other term, never seen in the corpus or added to it
+    since, gets the next extra column the first time one of the documents
+    has it, so documents sharing such a term still match on it. Vectors are
+    only comparable within one space; use copy() to compare more documents
+    with vectors that are kept.
+    """
+
+    def __init__(self, size):
+        """
+        Args:
+            size (int): Number of corpus vocabulary columns
+        """
+        self.size = size
+        self.extra = {}
+
+    def __len__(self):
+        return self.size + len(self.extra)
+
+    def column(self, term, vocabulary):
+        """
+        Get the column of a term, adding an extra column for terms outside the vocabulary
+
+        Args:
+            term (str): The term
+            vocabulary (dict): Corpus vocabulary, term -> column
+
+        Returns:
+            int: Column of the term
+        """
+        column = vocabulary.get(term)
+        if column is not None and column < self.size:
+            return column
+        column = self.extra.get(term)
+        if column is None:
+            column = self.extra[term] = len(self)
+        return column
+
+    def copy(self):
+        """Get a space with the same columns that can be extended separately"""
+        space = ColumnSpace(self.size)
+        space.extra = dict(self.extra)
+        return space
+
+
+def _normalize_rows(matrix):
+    """Divide every row of a sparse matrix by its L2 norm (rows with a zero norm stay empty)"""
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    norms = np.sqrt(np.bincount(rows, weights=matrix.data * matrix.data, minlength=matrix.shape[0]))
+    scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    matrix.data *= np.repeat(scale, np.diff(matrix.indptr))
+    return matrix
+
+
+def _with_columns(matrix, columns):
+    """Pad a sparse matrix with empty columns up to the given count"""
+    if matrix.shape[1] == columns:
+        return matrix
+    matrix = matrix.copy()
+    matrix.resize((matrix.shape[0], columns))
+    return matrix
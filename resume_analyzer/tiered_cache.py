@@ -0,0 +1,259 @@
+"""
+Module for the bounded in-process and on-disk tiers shared by the caches
+"""
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class TieredCache:
+    """
+    Two-tier cache of values keyed by hex digests.
+
+    The in-process tier is an LRU bounded by a byte budget (size gives the
+    bytes of a value). The optional on-disk tier stores one file per entry
+    (the time it was stored, then the value serialized with dump), survives
+    restarts and is pruned least recently used first (by modification time,
+    refreshed on every hit) once it grows past its own byte budget. Entries
+    older than ttl seconds are expired in both tiers.
+
+    EmbeddingCache and ResultCache keep their values here and only differ in
+    what a value is and how it is serialized.
+    """
+
+    def __init__(self, max_bytes, ttl=None, cache_dir=None, max_disk_bytes=256 * 1024 * 1024,
+                 size=len, dump=None, load=None):
+        """
+        Create the cache
+
+        Args:
+            max_bytes (int): Byte budget of the in-process tier
+            ttl (float): Seconds an entry stays valid, or None to keep entries until they are evicted
+            cache_dir (str): Directory of the on-disk tier, or None to keep it disabled
+            max_disk_bytes (int): Byte budget of the on-disk tier
+            size (callable): Bytes of a value in memory
+            dump (callable): Serializes a value to bytes for the disk tier, by default values are bytes
+            load (callable): Reads a value back from the bytes of dump; raises ValueError if they are invalid
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._size = size
+        self._dump = dump or (lambda value: value)
+        self._load = load or (lambda payload: payload)
+
+        # key -> (time stored, value)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        self._disk_bytes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    def get(self, key):
+        """
+        Look up a value, checking memory first and then disk
+
+        Args:
+            key (str): Cache key (a hex digest, its first two characters name the disk subdirectory)
+
+        Returns:
+            object: The cached value, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._expired(entry[0], now):
+                    self._drop(key)
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+
+        entry = self._read_disk(key, now)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, *entry)
+        return entry[1]
+
+    def put(self, key, value):
+        """
+        Add a value to both tiers
+
+        Args:
+            key (str): Cache key
+            value (object): Value to cache
+        """
+        stored_at = time.time()
+        with self._lock:
+            self._store(key, stored_at, value)
+        self._write_disk(key, stored_at, value)
+
+    def stats(self):
+        """
+        Report cache counters
+
+        Returns:
+            dict: Hit/miss/expiration/eviction counters and the size of both tiers
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'disk_bytes': self._disk_bytes
+            }
+
+    def clear(self):
+        """
+        Drop every in-process entry (the on-disk tier is kept)
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _drop(self, key):
+        """Remove an in-process entry (lock held)"""
+        _, value = self._entries.pop(key)
+        self._bytes -= self._size(value)
+
+    def _store(self, key, stored_at, value):
+        """Insert into the in-process LRU and evict down to the byte budget (lock held)"""
+        if key in self._entries:
+            self._drop(key)
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (stored_at, value)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= self._size(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.entry')
+
+    def _disk_files(self):
+        """List (path, size, mtime) of every file of the on-disk tier"""
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith('.entry'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _read_disk(self, key, now):
+        """Read (time stored, value) of an entry, None if it is missing, invalid or expired"""
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_at, payload = f.read().split(b'\n', 1)
+            stored_at = float(stored_at)
+            value = self._load(payload)
+        except (OSError, ValueError):
+            return None
+
+        if self._expired(stored_at, now):
+            self._remove_disk(path)
+            with self._lock:
+                self.expirations += 1
+            return None
+
+        # Refresh the modification time so pruning keeps recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return stored_at, value
+
+    def _write_disk(self, key, stored_at, value):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        # Write to a temporary file first so readers never see a partial entry;
+        # the first line is the time the value was stored, for the TTL
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(repr(stored_at).encode('ascii') + b'\n')
+                f.write(self._dump(value))
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._disk_bytes += os.path.getsize(path) - previous_size
+            prune = self._disk_bytes > self.max_disk_bytes
+        if prune:
+            self._prune_disk()
+
+    def _remove_disk(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes -= size
+
+    def _prune_disk(self):
+        """Delete the least recently used files until the disk tier is at 90% of its budget"""
+        files = sorted(self._disk_files(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        removed = 0
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._disk_bytes = total
+            self.disk_evictions += removed
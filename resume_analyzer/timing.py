@@ -0,0 +1,231 @@
+"""
+Module for timing the analysis stages
+
+Code is wrapped in named spans:
+
+    with timing.span('spacy'):
+        doc = nlp(text)
+
+Every span is added to a histogram of its stage (served in Prometheus text
+format by render_prometheus) and, while a request is being traced (see
+start_request), to the spans reported in that request's Server-Timing
+header. Set RESUME_ANALYZER_TIMING=0 to turn spans into a shared no-op
+context manager.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+ENABLED = os.environ.get('RESUME_ANALYZER_TIMING', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Durations by span name of the request being handled, None outside of traced requests
+_request_spans = contextvars.ContextVar('request_spans', default=None)
+
+
+class Histogram:
+    """
+    Cumulative latency histogram with one series per label value.
+    """
+
+    def __init__(self, name, help_text, label, buckets=BUCKETS):
+        """
+        Create the histogram
+
+        Args:
+            name (str): Metric name
+            help_text (str): Description shown in the metrics output
+            label (str): Name of the label distinguishing the series
+            buckets (tuple): Bucket upper bounds in seconds
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, seconds):
+        """
+        Record one duration
+
+        Args:
+            label_value (str): Series the duration belongs to
+            seconds (float): Duration
+        """
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[index] += 1
+                    break
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self):
+        """
+        Format the histogram in the Prometheus text exposition format
+
+        Returns:
+            list: Lines of text
+        """
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((value, (list(counts), total, count)) for value, (counts, total, count) in self._series.items())
+        for value, (counts, total, count) in series:
+            labels = f'{self.label}="{_escape(value)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+    def reset(self):
+        """Drop every recorded duration"""
+        with self._lock:
+            self._series.clear()
+
+
+stage_seconds = Histogram('resume_analyzer_stage_seconds', "Time spent in each analysis stage", 'stage')
+request_seconds = Histogram('resume_analyzer_request_seconds', "Time spent handling each endpoint", 'endpoint')
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        _record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name):
+    """
+    Time a block of code as one stage
+
+    Args:
+        name (str): Stage name (a Server-Timing token: no spaces, commas or semicolons)
+
+    Returns:
+        Context manager timing the block
+    """
+    return _Span(name) if ENABLED else _NO_SPAN
+
+
+def timed(name):
+    """
+    Decorator timing every call of a function as one stage
+
+    Args:
+        name (str): Stage name
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name, seconds):
+    """
+    Add a duration measured elsewhere (e.g. in a worker process) to a stage
+
+    Args:
+        name (str): Stage name
+        seconds (float): Duration
+    """
+    if ENABLED:
+        _record(name, seconds)
+
+
+def _record(name, seconds):
+    stage_seconds.observe(name, seconds)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans[name] = spans.get(name, 0.0) + seconds
+
+
+def start_request():
+    """
+    Start collecting the spans of the current request (thread or context)
+
+    Returns:
+        contextvars.Token: Token for finish_request
+    """
+    return _request_spans.set(OrderedDict() if ENABLED else None)
+
+
+def finish_request(token, endpoint=None, seconds=None):
+    """
+    Stop collecting spans and build the Server-Timing header value
+
+    Args:
+        token (contextvars.Token): Token returned by start_request
+        endpoint (str): Endpoint name recorded in the request histogram, if given
+        seconds (float): Total request duration, reported as the 'total' metric
+
+    Returns:
+        str: Server-Timing header value, empty if timing is disabled
+    """
+    spans = _request_spans.get()
+    _request_spans.reset(token)
+    if spans is None:
+        return ''
+    if endpoint is not None and seconds is not None:
+        request_seconds.observe(endpoint, seconds)
+    metrics = [f"{name};dur={duration * 1000:.1f}" for name, duration in spans.items()]
+    if seconds is not None:
+        metrics.append(f"total;dur={seconds * 1000:.1f}")
+    return ', '.join(metrics)
+
+
+def render_prometheus():
+    """
+    Format every histogram in the Prometheus text exposition format
+
+    Returns:
+        str: Metrics text
+    """
+    return '\n'.join(stage_seconds.render() + request_seconds.render()) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
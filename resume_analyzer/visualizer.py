@@ -3,6 +3,8 @@ Module for generating visualizations for resume analysis
 """
 import json
 
+from .analyzer import skill_mask, skill_vocabulary
+
 def generate_skills_chart(analysis_result, match_result):
     """
     Generate data for skills chart visualization
@@ -14,13 +16,10 @@ def generate_skills_chart(analysis_result, match_result):
     Returns:
         dict: Data for skills chart visualization
     """
-    # Get skills from resume
-    resume_skills = []
-    for category, skills in analysis_result['skills'].items():
-        resume_skills.extend(skills)
-    
-    # Get skills from job description (both found and missing)
+    # Skills from resume and from job description (both found and missing) as bitmasks
+    resume_mask = skill_mask(analysis_result)
     job_skills = match_result['skills_found'] + match_result['skills_missing']
+    job_mask = skill_vocabulary.encode(job_skills)
     
     # Prepare data for skills chart
     skills_data = []
@@ -28,37 +27,28 @@ def generate_skills_chart(analysis_result, match_result):
     for skill in job_skills:
         skills_data.append({
             'skill': skill,
-            'in_resume': skill in resume_skills,
+            'in_resume': skill_vocabulary.has(resume_mask, skill),
             'in_job': True
         })
     
     # Add skills from resume that are not in job description
-    for skill in resume_skills:
-        if skill not in job_skills:
-            skills_data.append({
-                'skill': skill,
-                'in_resume': True,
-                'in_job': False
-            })
+    for skill in skill_vocabulary.decode(resume_mask & ~job_mask):
+        skills_data.append({
+            'skill': skill,
+            'in_resume': True,
+            'in_job': False
+        })
     
     # Group skills by category
     skills_by_category = {}
     
     for skill_data in skills_data:
-        skill = skill_data['skill']
-        
-        # Find which category this skill belongs to
-        for category, skill_list in analysis_result['skills'].items():
-            if skill in skill_list:
-                if category not in skills_by_category:
-                    skills_by_category[category] = []
-                skills_by_category[category].append(skill_data)
-                break
+        # Skills of the resume go under their category, job-only skills under "other"
+        if skill_data['in_resume']:
+            category = skill_vocabulary.category(skill_data['skill'])
         else:
-            # If not found in any category, add to "other"
-            if "other" not in skills_by_category:
-                skills_by_category["other"] = []
-            skills_by_category["other"].append(skill_data)
+            category = "other"
+        skills_by_category.setdefault(category, []).append(skill_data)
     
     return {
         'skills_data': skills_data,
@@ -0,0 +1,51 @@
+import importlib.util
+import io
+import os
+
+import docx
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_entry_point(name, path):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module')
+def clients():
+    apps = [load_entry_point('app', 'app.py').app, load_entry_point('api_index', 'api/index.py').app]
+    return [app.test_client() for app in apps]
+
+
+def resume_docx():
+    document = docx.Document()
+    for line in ["Jane Doe", "Skills", "Python, Django, AWS and Docker", "Experience", "Backend developer, 2019 - 2023"]:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_entry_points_return_the_same_analysis(clients):
+    payloads = []
+    for client in clients:
+        response = client.post('/analyze', data={
+            'resume': (io.BytesIO(resume_docx()), 'resume.docx'),
+            'job_description': "Python developer with AWS and Kubernetes",
+            'tier': 'lexical'
+        })
+        assert response.status_code == 200
+        payloads.append(response.get_json())
+
+    app_payload, api_payload = payloads
+    assert app_payload == api_payload
+    assert sorted(app_payload) == [
+        'match_chart', 'match_percentage', 'match_score', 'skills_chart', 'skills_found', 'skills_missing',
+        'suggestions', 'tier'
+    ]
+    assert app_payload['skills_found'] == ['python', 'aws']
+    assert app_payload['skills_missing'] == ['kubernetes']
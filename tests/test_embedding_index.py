@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pytest
+
+from resume_analyzer.embedding_index import EmbeddingIndex
+
+
+def normalized(vectors):
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def brute_force(keys, vectors, queries, k):
+    scores = normalized(queries) @ normalized(vectors).T
+    return [[keys[row] for row in np.argsort(-row_scores, kind='stable')[:k]] for row_scores in scores]
+
+
+def found_keys(results):
+    return [[key for key, _ in matches] for matches in results]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    keys = [f'resume-{index}' for index in range(300)]
+    return keys, rng.normal(size=(300, 16)), rng.normal(size=(5, 16))
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float16'])
+def test_search_matches_brute_force(tmp_path, data, dtype):
+    keys, vectors, queries = data
+    index = EmbeddingIndex(str(tmp_path), dtype=dtype)
+    index.add(keys[:100], vectors[:100])
+    index.add(keys[100:], vectors[100:])
+
+    results = index.search(queries, k=10, block_rows=64)
+    if dtype == 'float32':
+        assert found_keys(results) == brute_force(keys, vectors, queries, 10)
+    expected = normalized(queries) @ normalized(vectors).T
+    for query, matches in enumerate(results):
+        for key, score in matches:
+            assert score == pytest.approx(expected[query, keys.index(key)], abs=1e-2)
+
+
+def test_remove_and_replace_survive_a_reopen(tmp_path, data):
+    keys, vectors, queries = data
+    index = EmbeddingIndex(str(tmp_path))
+    index.add(keys, vectors)
+    index.remove(keys[:50])
+    # Replaced embeddings are searched with their new vector only
+    index.add(keys[50:60], vectors[:10])
+
+    live_vectors = np.vstack([vectors[:10], vectors[60:]])
+    live_keys = keys[50:60] + keys[60:]
+    expected = brute_force(live_keys, live_vectors, queries, 10)
+    assert len(index) == 250
+    assert found_keys(index.search(queries, k=10)) == expected
+
+    reopened = EmbeddingIndex(str(tmp_path))
+    assert len(reopened) == 250 and keys[0] not in reopened and keys[55] in reopened
+    assert found_keys(reopened.search(queries, k=10)) == expected
+
+    reopened.compact()
+    assert len(reopened.ids) == 250
+    assert os.path.getsize(reopened._vectors_path) == 250 * 16 * 4
+    assert found_keys(reopened.search(queries, k=10)) == expected
+    assert found_keys(EmbeddingIndex(str(tmp_path)).search(queries, k=10)) == expected
+
+
+def test_interrupted_append_is_repaired_on_open(tmp_path, data):
+    keys, vectors, queries = data
+    index = EmbeddingIndex(str(tmp_path))
+    index.add(keys[:100], vectors[:100])
+    # A crash after the vectors were written, halfway through the next one
+    with open(index._vectors_path, 'ab') as f:
+        f.write(vectors[100:102].astype(np.float32).tobytes()[:100])
+
+    reopened = EmbeddingIndex(str(tmp_path))
+    assert len(reopened) == 100
+    reopened.add(keys[100:200], vectors[100:200])
+    assert found_keys(EmbeddingIndex(str(tmp_path)).search(queries, k=10)) == brute_force(
+        keys[:200], vectors[:200], queries, 10
+    )
+
+
+def test_partitioned_search(tmp_path, data):
+    keys, vectors, queries = data
+    index = EmbeddingIndex(str(tmp_path))
+    index.add(keys[:250], vectors[:250])
+    index.build_partitions(n_partitions=8)
+    # Rows added after clustering join their closest partition
+    index.add(keys[250:], vectors[250:])
+
+    expected = brute_force(keys, vectors, queries, 5)
+    assert found_keys(index.search(queries, k=5, n_probe=8)) == expected
+    probed = index.search(queries, k=5, n_probe=2)
+    assert all(len(matches) == 5 for matches in probed)
+
+    reopened = EmbeddingIndex(str(tmp_path))
+    assert found_keys(reopened.search(queries, k=5, n_probe=8)) == expected
+    assert reopened.search(queries, k=5, n_probe=2) == probed
+    reopened.remove(keys[:100])
+    reopened.compact()
+    assert found_keys(reopened.search(queries, k=5, n_probe=8)) == brute_force(keys[100:], vectors[100:], queries, 5)
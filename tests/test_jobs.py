@@ -0,0 +1,98 @@
+import os
+import time
+
+import pytest
+
+from resume_analyzer.jobs import JobQueue, QueueFullError
+
+
+def wait_for_file(path, value):
+    """Job that blocks until the test creates path (works in threads and worker processes)"""
+    deadline = time.time() + 30
+    while not os.path.exists(path):
+        if time.time() > deadline:
+            raise TimeoutError(path)
+        time.sleep(0.01)
+    return value
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def wait_until_finished(queue, job_ids):
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        statuses = [queue.status(job_id) for job_id in job_ids]
+        if all(status['status'] in ('done', 'failed') for status in statuses):
+            return statuses
+        time.sleep(0.01)
+    raise AssertionError("Jobs did not finish")
+
+
+@pytest.fixture(params=[False, True], ids=['threads', 'processes'])
+def queue(request):
+    queue = JobQueue(max_workers=1, max_queued=2, use_processes=request.param)
+    yield queue
+    queue.shutdown()
+
+
+def test_status_transitions_and_queue_limit(queue, tmp_path):
+    gate = str(tmp_path / 'gate')
+    job_ids = [queue.submit(wait_for_file, gate, index) for index in range(3)]
+    # Give a process pool time to move jobs into the queue feeding its workers
+    time.sleep(0.3)
+
+    assert [queue.status(job_id)['status'] for job_id in job_ids] == ['running', 'queued', 'queued']
+    stats = queue.stats()
+    assert (stats['running'], stats['queued']) == (1, 2)
+    assert queue.status(job_ids[1])['wait_seconds'] is None
+
+    with pytest.raises(QueueFullError):
+        queue.submit(wait_for_file, gate, 3)
+    assert queue.stats()['rejected'] == 1
+
+    open(gate, 'w').close()
+    statuses = wait_until_finished(queue, job_ids)
+    assert [status['status'] for status in statuses] == ['done'] * 3
+    assert [status['result'] for status in statuses] == [0, 1, 2]
+    assert all(status['wait_seconds'] >= 0 and status['run_seconds'] >= 0 for status in statuses)
+
+    stats = queue.stats()
+    assert (stats['running'], stats['queued'], stats['completed']) == (0, 0, 3)
+    assert stats['wait_seconds']['max'] >= stats['wait_seconds']['p50']
+
+
+def test_failed_job_reports_its_error(queue):
+    job_id = queue.submit(fail, "bad resume")
+    status, = wait_until_finished(queue, [job_id])
+
+    assert status['status'] == 'failed'
+    assert status['error'] == "bad resume"
+    assert status['result'] is None
+    assert queue.stats()['failed'] == 1
+
+
+def test_unpicklable_job_fails_in_process_mode():
+    queue = JobQueue(max_workers=1, max_queued=1, use_processes=True)
+    try:
+        job_id = queue.submit(lambda: 1)
+        status, = wait_until_finished(queue, [job_id])
+        assert status['status'] == 'failed'
+        # The failed job frees its worker for the next one
+        next_id = queue.submit(len, 'abc')
+        assert wait_until_finished(queue, [next_id])[0]['result'] == 3
+    finally:
+        queue.shutdown()
+
+
+def test_finished_jobs_expire():
+    queue = JobQueue(max_workers=1, retention_seconds=0)
+    try:
+        job_id = queue.submit(len, 'abc')
+        wait_until_finished(queue, [job_id])
+        time.sleep(0.01)
+        queue.submit(len, 'abcd')
+        assert queue.status(job_id) is None
+    finally:
+        queue.shutdown()
@@ -0,0 +1,66 @@
+import pytest
+
+from resume_analyzer import analyzer, models, scoring
+
+
+def failing_registry(calls):
+    def load():
+        calls.append(1)
+        raise OSError("model not installed")
+
+    registry = models.ModelRegistry('lazy')
+    registry.register('spacy', load)
+    registry.register('sentence_model', load)
+    return registry
+
+
+def test_failed_load_is_not_retried():
+    calls = []
+    registry = failing_registry(calls)
+
+    assert registry.get('sentence_model', wait=False) is None
+    assert registry.get('sentence_model', wait=False) is None
+    with pytest.raises(models.ModelUnavailableError):
+        registry.get('sentence_model')
+    assert len(calls) == 1
+    assert isinstance(registry.load_errors['sentence_model'], OSError)
+
+
+def test_first_failed_load_raises_when_waiting():
+    registry = failing_registry([])
+    with pytest.raises(OSError):
+        registry.get('spacy')
+    with pytest.raises(models.ModelUnavailableError):
+        registry.get('spacy')
+
+
+def test_semantic_tier_falls_back_without_models(monkeypatch):
+    calls = []
+    monkeypatch.setattr(models, 'registry', failing_registry(calls))
+    engine = scoring.get_engine('semantic')
+
+    result = engine.score("Python developer with AWS", "Python and AWS engineer")
+    assert result['semantic_similarity'] is None
+    assert result['skills_found'] == ['python', 'aws']
+
+    ranked = engine.rank(["Python developer", "Java developer"], ["Python engineer"])
+    assert ranked['by_job'][0]['matches'][0]['resume'] == 0
+
+    analyzer.rank_matches([analyzer.analyze_resume("Python developer")], ["Python engineer"])
+    # One attempt per model, none in the later requests
+    assert len(calls) == 2
+
+
+def test_failed_warm_up_does_not_stop_the_loader():
+    def fail(model):
+        raise RuntimeError("warm-up failed")
+
+    registry = models.ModelRegistry('background')
+    registry.register('spacy', lambda: 'nlp', warm_up=fail)
+    registry.register('sentence_model', lambda: 'model')
+    registry.start()
+    registry._background_thread.join(5)
+
+    # Both models were loaded by the background thread, not on first use
+    assert registry.is_ready('spacy') and registry.is_ready('sentence_model')
+    assert registry.get('spacy', wait=False) == 'nlp'
@@ -0,0 +1,70 @@
+import io
+import time
+
+import docx
+import pdfplumber
+import pytest
+from docx.enum.text import WD_BREAK
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+from resume_analyzer import parser
+
+
+def test_slow_file_is_reported_as_timed_out(monkeypatch):
+    def slow_open(*args, **kwargs):
+        time.sleep(5)
+
+    monkeypatch.setattr(pdfplumber, 'open', slow_open)
+    result = parser._ingest_one('slow.pdf', 0.2, None, None)
+
+    assert result.text is None
+    assert result.error == "Timed out after 0.2 seconds"
+    assert result.seconds < 2
+
+
+def test_parse_errors_are_reported(tmp_path):
+    path = tmp_path / 'broken.pdf'
+    path.write_bytes(b'%PDF-1.4 not really a pdf')
+    result = parser._ingest_one(str(path), 5, None, None)
+
+    assert result.text is None
+    assert result.error.startswith("Error extracting text from PDF")
+
+
+def docx_resume():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    document.sections[0].footer.paragraphs[0].text = "References on request"
+    document.add_heading("Experience", level=1)
+    paragraph = document.add_paragraph("Data Engineer\tAcme Corp")
+    paragraph.add_run(" 2019").add_break()
+    paragraph.add_run("Built ETL pipelines")
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+    document.add_paragraph("Skills: Python, SQL, Spark", style="List Bullet")
+    table = document.add_table(rows=2, cols=2)
+    for row, texts in zip(table.rows, [("Language", "Level"), ("German", "Fluent")]):
+        for cell, text in zip(row.cells, texts):
+            cell.text = text
+    document.add_paragraph("")
+    document.add_paragraph("Education: M.Sc. Computer Science")
+
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('read_size', [parser.DOCX_READ_SIZE, 7])
+def test_docx_text_matches_python_docx(monkeypatch, read_size):
+    # A tiny read size splits tags and text across parser feeds
+    monkeypatch.setattr(parser, 'DOCX_READ_SIZE', read_size)
+    data = docx_resume()
+    document = docx.Document(io.BytesIO(data))
+    section = document.sections[0]
+    # Headers, every body paragraph in document order (table cells included), then footers
+    expected = [paragraph.text for paragraph in section.header.paragraphs if paragraph.text.strip()]
+    expected += [Paragraph(element, document._body).text for element in document.element.body.iter(qn('w:p'))]
+    expected += [paragraph.text for paragraph in section.footer.paragraphs if paragraph.text.strip()]
+
+    assert parser.extract_text_from_docx(data) == "\n".join(expected)
+    assert parser.extract_text_from_docx(io.BytesIO(data)) == "\n".join(expected)
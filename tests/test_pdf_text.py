@@ -0,0 +1,75 @@
+import pytest
+
+from resume_analyzer import parser
+from resume_analyzer.pdf_text import looks_degraded
+
+# Content streams of the fixture resume: two fonts, kerning and a word gap in
+# a TJ array, two columns on one line, character and word spacing, and
+# horizontal scaling
+PAGES = [
+    'BT /F2 16 Tf 50 750 Td (Jane Doe) Tj ET '
+    'BT /F1 10 Tf 14 TL 50 720 Td (Senior Data Engineer, Berlin) Tj T* '
+    '[(Sk) 20 (ills: Py) -10 (thon, SQL) -400 (and Spark)] TJ T* '
+    '(Experience) Tj 200 0 Td (2019 - 2024) Tj -200 -14 Td '
+    '2 Tc (Lead) Tj 0 Tc 1.5 Tw ( Built ETL pipelines for 2TB/day) Tj 0 Tw T* '
+    '120 Tz (Wide scaled text line here) Tj 100 Tz T* ET',
+    'BT /F1 11 Tf 13 TL 72 700 Td (Education) Tj T* (M.Sc. Computer Science, TU Munich) Tj T* '
+    '(Certifications: AWS Solutions Architect) Tj ET',
+]
+
+
+def pdf_bytes(page_contents):
+    page_count = len(page_contents)
+    font_ref = 3 + 2 * page_count
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(page_count))}] /Count {page_count} >>",
+    ]
+    for index, content in enumerate(page_contents):
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font '
+                       f'<< /F1 {font_ref} 0 R /F2 {font_ref + 1} 0 R >> >> /Contents {4 + 2 * index} 0 R >>')
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\nendstream')
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Times-Bold /Encoding /WinAnsiEncoding >>')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(output)
+    output += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    output += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    output += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    return bytes(output)
+
+
+@pytest.fixture
+def resume_pdf():
+    return pdf_bytes(PAGES)
+
+
+def test_fast_and_layout_modes_give_the_same_text(resume_pdf):
+    fast = list(parser.iter_pdf_pages(resume_pdf, mode='fast'))
+    layout = list(parser.iter_pdf_pages(resume_pdf, mode='layout'))
+
+    # No page fell back, so the text really comes from the fast device
+    assert [page.fallback for page in fast] == [False, False]
+    assert [page.text for page in fast] == [page.text for page in layout]
+    assert fast[0].text.splitlines()[2:4] == ["Skills: Python, SQL and Spark", "Experience 2019 - 2024"]
+
+
+def test_degraded_pages_fall_back_to_layout():
+    letter_spaced = pdf_bytes(['BT /F1 10 Tf 50 750 Td 12 Tc (Python developer with SQL) Tj ET'])
+    fast = list(parser.iter_pdf_pages(letter_spaced, mode='fast'))
+    layout = list(parser.iter_pdf_pages(letter_spaced, mode='layout'))
+
+    assert fast[0].fallback
+    assert fast[0].text == layout[0].text
+
+
+def test_looks_degraded():
+    assert looks_degraded("Too short")
+    assert looks_degraded("P y t h o n d e v e l o p e r w i t h S Q L")
+    assert looks_degraded("Pythondeveloperwithtenyearsofexperience")
+    assert not looks_degraded("Python developer with ten years of experience")
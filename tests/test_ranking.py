@@ -0,0 +1,43 @@
+import numpy as np
+
+from resume_analyzer import analyzer
+from resume_analyzer.ranking import build_rankings, prune
+
+
+def test_prune_keeps_the_best_jobs_of_every_resume():
+    scores = np.array([[90, 80, 70, 10], [95, 85, 75, 60], [91, 81, 71, 50]], dtype=float)
+    keep = prune(scores, scores, np.ones(scores.shape, dtype=bool), 2)
+
+    assert build_rankings(np.where(keep, scores, np.nan), 2) == build_rankings(scores, 2)
+    assert not keep[0, 2] and not keep[0, 3]
+
+
+def test_prune_with_bounds_keeps_both_rankings():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        scores = rng.uniform(0, 100, size=(6, 40))
+        lower = scores - rng.uniform(0, 30, size=scores.shape)
+        upper = scores + rng.uniform(0, 30, size=scores.shape)
+        keep = prune(lower, upper, np.ones(scores.shape, dtype=bool), 3)
+
+        assert keep.sum() < keep.size
+        assert build_rankings(np.where(keep, scores, np.nan), 3) == build_rankings(scores, 3)
+
+
+def test_cascade_gives_the_full_rankings():
+    rng = np.random.default_rng(1)
+    skills = ['python', 'java', 'aws', 'docker', 'react', 'sql', 'kubernetes', 'django', 'spark', 'go']
+    words = ['built', 'services', 'led', 'team', 'designed', 'pipelines', 'tested', 'apis', 'data', 'cloud']
+    resumes = [
+        ' '.join(rng.choice(skills, size=4)) + ' developer who ' + ' '.join(rng.choice(words, size=8))
+        for _ in range(30)
+    ]
+    jobs = [' '.join(rng.choice(skills, size=3)) + ' engineer, ' + ' '.join(rng.choice(words, size=5)) for _ in range(12)]
+    analyses = [analyzer.analyze_resume(text) for text in resumes]
+
+    full = analyzer.rank_matches(analyses, jobs, top_k=2, semantic=False)
+    cascade = analyzer.rank_matches(analyses, jobs, top_k=2, semantic=False, cascade=True)
+
+    assert cascade['cascade']['pruned']['skills']['pairs'] > 0
+    assert cascade['by_job'] == full['by_job']
+    assert cascade['by_resume'] == full['by_resume']
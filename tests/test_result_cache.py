@@ -0,0 +1,10 @@
+from resume_analyzer.result_cache import AnalysisCache
+
+
+def test_only_whitespace_within_lines_is_normalized():
+    cache = AnalysisCache()
+    key = cache.result_key('resume', "Python developer\nAWS and Docker", 'v1')
+
+    assert cache.result_key('resume', "  Python   developer \r\nAWS\tand Docker\n", 'v1') == key
+    assert cache.result_key('resume', "Python developer AWS and Docker", 'v1') != key
+    assert cache.result_key('resume', "Python\ndeveloper\nAWS and Docker", 'v1') != key
@@ -0,0 +1,24 @@
+import pytest
+
+from resume_analyzer import scoring
+
+
+def test_incomplete_tier_fails_when_instantiated():
+    class PartialEngine(scoring.ScoringEngine):
+        name = 'partial'
+
+        def build_profile(self, job_description):
+            return job_description
+
+        def score(self, resume_text, job_description):
+            return {}
+
+    with pytest.raises(TypeError, match='rank'):
+        PartialEngine()
+
+
+def test_every_tier_implements_the_interface():
+    for tier in scoring.TIERS:
+        engine = scoring.get_engine(tier)
+        assert isinstance(engine, scoring.ScoringEngine)
+        assert engine.name == tier
@@ -0,0 +1,53 @@
+from resume_analyzer import analyzer, models, scoring
+from resume_analyzer.skills import SkillMatcher
+
+PUNCTUATED_SKILLS = ['c++', 'c#', 'node.js', 'asp.net', 'ci/cd', 'scikit-learn']
+RESUME = "Skills: C++, C#, Node.js, ASP.NET, CI/CD pipelines, scikit-learn and Python.\nBuilt a REST\nAPI."
+
+
+def flatten(skills):
+    return [skill for category in skills.values() for skill in category]
+
+
+def test_matcher_keeps_punctuation_and_spans_whitespace():
+    matcher = SkillMatcher({'skills': PUNCTUATED_SKILLS + ['rest api']})
+    assert flatten(matcher.extract(RESUME.lower())) == PUNCTUATED_SKILLS + ['rest api']
+    assert flatten(matcher.extract("cpp, c, nodejs, rest-api")) == []
+
+
+def test_analyzer_finds_punctuated_skills():
+    skills = flatten(analyzer.analyze_resume(RESUME)['skills'])
+    assert set(PUNCTUATED_SKILLS + ['python', 'rest api']) <= set(skills)
+
+
+def test_job_profile_finds_punctuated_skills():
+    profile = analyzer.JobProfile("Need C++ and node.js and python", eager=False)
+    assert profile.skills_flat == ['python', 'c++', 'node.js']
+
+
+def test_tfidf_tier_reports_missing_punctuated_skills():
+    result = scoring.get_engine('tfidf').score("Python developer", "Need C++ and node.js and python")
+    assert result['skills_found'] == ['python']
+    assert sorted(result['skills_missing']) == ['c++', 'node.js']
+
+
+def test_every_tier_finds_the_same_skills(monkeypatch):
+    def unavailable():
+        raise OSError("model not installed")
+
+    # The semantic tier scores without its models, they make no difference to the skills
+    registry = models.ModelRegistry('lazy')
+    registry.register('spacy', unavailable)
+    registry.register('sentence_model', unavailable)
+    monkeypatch.setattr(models, 'registry', registry)
+
+    job_description = "Wanted: Python, C#, Node.js, CI/CD and ASP.NET"
+    results = [scoring.get_engine(tier).score(RESUME, job_description) for tier in scoring.TIERS]
+    for result in results:
+        assert result['skills_found'] == ['python', 'c#', 'node.js', 'asp.net', 'ci/cd']
+        assert result['skills_missing'] == []
+
+    results = [scoring.get_engine(tier).score("Python and Node.js", job_description) for tier in scoring.TIERS]
+    for result in results:
+        assert result['skills_found'] == ['python', 'node.js']
+        assert result['skills_missing'] == ['c#', 'asp.net', 'ci/cd']
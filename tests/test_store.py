@@ -0,0 +1,119 @@
+import os
+
+import numpy as np
+
+from resume_analyzer.store import CandidateStore
+
+
+def candidate(index, embedding=None):
+    text = f'Resume {index} python sql'
+    return {
+        'id': CandidateStore.make_key(text),
+        'name': f'resume-{index}.pdf',
+        'text': text,
+        'skills': ['sql', 'python'],
+        'sections': [{'title': 'Skills', 'content': 'python sql'}],
+        'term_counts': {'python': 1, 'sql': 1, f'term{index}': index + 1},
+        'embedding': embedding
+    }
+
+
+def embedding_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith('.f32')]
+
+
+def test_put_get_and_load(tmp_path):
+    store = CandidateStore(str(tmp_path))
+    embeddings = np.arange(12, dtype=np.float32).reshape(3, 4)
+    candidates = [candidate(0, embeddings[0]), candidate(1), candidate(2, embeddings[2])]
+    store.put_many(candidates)
+
+    assert len(store) == 3
+    stored = store.get(candidates[0]['id'])
+    assert stored['skills'] == ['python', 'sql']
+    assert stored['sections'] == candidates[0]['sections']
+    assert stored['term_counts'] == candidates[0]['term_counts']
+    np.testing.assert_array_equal(stored['embedding'], embeddings[0])
+    assert store.get(candidates[1]['id'])['embedding'] is None
+    assert store.without_embedding() == [candidates[1]['id']]
+
+    loaded = store.load()
+    assert loaded.ids == [c['id'] for c in candidates]
+    assert loaded.skill_sets[0] == {'python', 'sql'}
+    assert loaded.has_embedding.tolist() == [True, False, True]
+    np.testing.assert_array_equal(loaded.embeddings[2], embeddings[2])
+    assert not loaded.embeddings[1].any()
+    assert loaded.term_counts[2, loaded.vocabulary['term2']] == 3
+
+
+def test_reopen_keeps_candidates_and_embeddings(tmp_path):
+    store = CandidateStore(str(tmp_path))
+    store.put_many([candidate(0, np.ones(4)), candidate(1)])
+    store.set_embeddings([candidate(1)['id']], np.full((1, 4), 2.0))
+    store.close()
+
+    reopened = CandidateStore(str(tmp_path))
+    assert reopened.embedding_dim == 4
+    assert reopened.without_embedding() == []
+    loaded = reopened.load()
+    np.testing.assert_array_equal(loaded.embeddings, [[1.0] * 4, [2.0] * 4])
+
+
+def test_replace_and_compact(tmp_path):
+    store = CandidateStore(str(tmp_path))
+    store.put_many([candidate(index, np.full(4, index)) for index in range(3)])
+    store.put(candidate(1, np.full(4, 9.0)))
+    store.remove([candidate(0)['id']])
+    store.compact()
+
+    assert len(embedding_files(str(tmp_path))) == 1
+    # Replacing a candidate moves it to the end of the insertion order
+    np.testing.assert_array_equal(store.load().embeddings, [[2.0] * 4, [9.0] * 4])
+
+    store.close()
+    reopened = CandidateStore(str(tmp_path))
+    np.testing.assert_array_equal(reopened.load().embeddings, [[2.0] * 4, [9.0] * 4])
+    reopened.put(candidate(3, np.full(4, 3.0)))
+    np.testing.assert_array_equal(reopened.get(candidate(3)['id'])['embedding'], [3.0] * 4)
+
+
+def test_open_drops_vectors_of_uncommitted_writes(tmp_path):
+    store = CandidateStore(str(tmp_path))
+    store.put(candidate(0, np.ones(4)))
+    store.close()
+    # A crash after appending the vectors but before the commit
+    path = os.path.join(str(tmp_path), CandidateStore.EMBEDDINGS_NAME)
+    with open(path, 'ab') as f:
+        f.write(np.full((2, 4), 5.0, dtype=np.float32).tobytes() + b'\0\0')
+
+    reopened = CandidateStore(str(tmp_path))
+    assert os.path.getsize(path) == 16
+    reopened.put(candidate(1, np.full(4, 2.0)))
+    np.testing.assert_array_equal(reopened.load().embeddings, [[1.0] * 4, [2.0] * 4])
+
+
+def test_open_clears_rows_missing_from_the_embedding_file(tmp_path):
+    store = CandidateStore(str(tmp_path))
+    store.put_many([candidate(0, np.ones(4)), candidate(1, np.full(4, 2.0))])
+    store.close()
+    path = os.path.join(str(tmp_path), CandidateStore.EMBEDDINGS_NAME)
+    os.truncate(path, 20)
+
+    reopened = CandidateStore(str(tmp_path))
+    assert reopened.without_embedding() == [candidate(1)['id']]
+    assert os.path.getsize(path) == 16
+    loaded = reopened.load()
+    assert loaded.has_embedding.tolist() == [True, False]
+    np.testing.assert_array_equal(loaded.embeddings[0], [1.0] * 4)
+
+
+def test_open_removes_files_of_an_interrupted_compact(tmp_path):
+    store = CandidateStore(str(tmp_path))
+    store.put(candidate(0, np.ones(4)))
+    store.close()
+    with open(os.path.join(str(tmp_path), 'embeddings.123.f32'), 'wb') as f:
+        f.write(b'\0' * 16)
+
+    reopened = CandidateStore(str(tmp_path))
+    assert embedding_files(str(tmp_path)) == [CandidateStore.EMBEDDINGS_NAME]
+    np.testing.assert_array_equal(reopened.get(candidate(0)['id'])['embedding'], [1.0] * 4)
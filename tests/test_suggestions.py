@@ -0,0 +1,20 @@
+from resume_analyzer import analyzer
+
+RESUME = "Backend engineer: Node.js services in C++ and Go, machine\nlearning pipelines on AWS."
+
+
+def missing_keywords(monkeypatch, keywords):
+    # The keywords normally come from a spaCy parse of the job description
+    monkeypatch.setattr(analyzer, 'extract_important_keywords', lambda text: keywords)
+    suggestions = analyzer.generate_suggestions([], analyzer.analyze_resume(RESUME), "job description")
+    prefix = "Consider adding these keywords from the job description: "
+    return [suggestion[len(prefix):].split(', ') for suggestion in suggestions if suggestion.startswith(prefix)]
+
+
+def test_keywords_with_punctuation_and_spaces_are_found(monkeypatch):
+    assert missing_keywords(monkeypatch, ['Node.js', 'C++', 'machine learning', 'AWS', 'go']) == []
+
+
+def test_missing_keywords_are_reported(monkeypatch):
+    keywords = ['C#', 'node', 'deep learning', 'Kubernetes', 'C++']
+    assert missing_keywords(monkeypatch, keywords) == [['C#', 'deep learning', 'Kubernetes']]
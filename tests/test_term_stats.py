@@ -0,0 +1,71 @@
+import math
+from collections import Counter
+
+import pytest
+
+from resume_analyzer import analyzer, scoring
+from resume_analyzer.term_stats import TermStatistics
+
+
+def test_seed_sets_the_idf_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(analyzer, 'term_statistics', TermStatistics())
+    (tmp_path / 'a.txt').write_text("python developer with django experience")
+    (tmp_path / 'b.txt').write_text("java developer with spring experience")
+    (tmp_path / 'notes.md').write_text("not a corpus document")
+    engine = scoring.get_engine('tfidf')
+    version = engine.version()
+
+    assert analyzer.seed_term_statistics(str(tmp_path)) == 2
+    assert analyzer.term_statistics.n_documents == 2
+    idf = analyzer.term_statistics.idf()
+    vocabulary = analyzer.term_statistics.vocabulary
+    # Terms in every document weigh less than terms in one of them
+    assert idf[vocabulary['developer']] < idf[vocabulary['python']]
+    assert engine.version() != version
+
+    # Statistics that already hold documents are not seeded again
+    assert analyzer.seed_term_statistics(str(tmp_path)) == 0
+    assert analyzer.term_statistics.n_documents == 2
+
+
+def test_requests_do_not_update_the_statistics(monkeypatch):
+    monkeypatch.setattr(analyzer, 'term_statistics', TermStatistics())
+    engine = scoring.get_engine('tfidf')
+    version = engine.version()
+
+    engine.score("python developer", "python developer wanted")
+    engine.rank(["python developer", "java developer"], ["python developer wanted"])
+    assert analyzer.term_statistics.n_documents == 0
+    assert engine.version() == version
+
+
+def test_empty_corpus_gives_the_count_cosine():
+    statistics = TermStatistics()
+    job = Counter("python developer python".split())
+    resume = Counter("python engineer".split())
+    vectors = statistics.transform([job, resume])
+
+    expected = 2 / (math.sqrt(5) * math.sqrt(2)) * 100
+    assert statistics.similarity(vectors[0], vectors[1])[0, 0] == pytest.approx(expected)
+    assert statistics.similarity(vectors[0], vectors[0])[0, 0] == pytest.approx(100)
+
+
+def test_terms_new_to_the_corpus_still_match():
+    statistics = TermStatistics()
+    statistics.add_documents([Counter("java developer".split()), Counter("sales manager".split())])
+    space = statistics.column_space()
+    jobs = statistics.transform([Counter("kotlin developer".split())], space)
+    resumes = statistics.transform([Counter("kotlin developer".split()), Counter("java developer".split())], space)
+
+    scores = statistics.similarity(jobs, resumes)
+    assert scores[0, 0] == pytest.approx(100)
+    assert 0 < scores[0, 1] < 100
+
+
+def test_tfidf_tier_scores_identical_texts_fully(monkeypatch):
+    monkeypatch.setattr(analyzer, 'term_statistics', TermStatistics())
+    text = "Python developer with Django and AWS experience"
+
+    assert scoring.get_engine('tfidf').score(text, text)['tfidf_similarity'] == 100
+    ranked = scoring.get_engine('tfidf').rank([text, "Sales manager"], [text])
+    assert ranked['match_scores'] == [[100, 0]]
@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+
+from resume_analyzer import tiered_cache
+from resume_analyzer.embedding_cache import EmbeddingCache
+from resume_analyzer.result_cache import ResultCache
+from resume_analyzer.tiered_cache import TieredCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_by_bytes():
+    cache = TieredCache(max_bytes=10)
+    cache.put('aa', b'1234')
+    cache.put('bb', b'5678')
+    assert cache.get('aa') == b'1234'
+
+    # 'bb' is the least recently used entry
+    cache.put('cc', b'90ab')
+    assert cache.get('bb') is None
+    assert cache.get('aa') == b'1234' and cache.get('cc') == b'90ab'
+    # Larger than the whole budget, never kept
+    cache.put('dd', b'x' * 11)
+    assert cache.get('dd') is None
+
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['evictions']) == (2, 8, 1)
+
+
+def test_entries_expire_in_both_tiers(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(tiered_cache.time, 'time', clock)
+    cache = TieredCache(max_bytes=100, ttl=60, cache_dir=str(tmp_path))
+    cache.put('aa', b'value')
+
+    clock.now += 30
+    assert cache.get('aa') == b'value'
+    clock.now += 31
+    assert cache.get('aa') is None
+    assert cache.stats()['expirations'] == 2
+    assert cache.stats()['disk_bytes'] == 0
+    assert not os.path.exists(cache._disk_path('aa'))
+
+
+def test_disk_tier_survives_a_restart_and_is_pruned(tmp_path):
+    cache = TieredCache(max_bytes=100, cache_dir=str(tmp_path), max_disk_bytes=1000)
+    for index in range(8):
+        cache.put(f'{index:02x}', bytes(100))
+        # Entries used in this order, oldest first
+        os.utime(cache._disk_path(f'{index:02x}'), (index, index))
+    assert cache.stats()['disk_evictions'] == 0
+
+    reopened = TieredCache(max_bytes=100, cache_dir=str(tmp_path), max_disk_bytes=1000)
+    assert reopened.stats()['disk_bytes'] == cache.stats()['disk_bytes']
+    assert reopened.get('03') == bytes(100)
+    assert reopened.stats()['disk_hits'] == 1
+
+    # Over the budget: the least recently used files go until 90% of it is left
+    reopened.put('08', bytes(100))
+    assert reopened.stats()['disk_bytes'] <= 900
+    assert reopened.get('00') is None
+    assert reopened.get('03') == bytes(100)
+    assert reopened.get('08') == bytes(100)
+
+
+def test_caches_round_trip_their_values(tmp_path):
+    results = ResultCache(cache_dir=str(tmp_path / 'results'))
+    results.put('aa', {'skills': ['python']})
+    value = results.get('aa')
+    value['skills'].append('java')
+    assert ResultCache(cache_dir=str(tmp_path / 'results')).get('aa') == {'skills': ['python']}
+    assert results.get('aa') == {'skills': ['python']}
+
+    embeddings = EmbeddingCache(cache_dir=str(tmp_path / 'embeddings'))
+    key = embeddings.make_key("python developer", 'model')
+    embeddings.put(key, np.arange(4, dtype=np.float64))
+    loaded = EmbeddingCache(cache_dir=str(tmp_path / 'embeddings')).get(key)
+    assert loaded.dtype == np.float32 and not loaded.flags.writeable
+    assert loaded.tolist() == [0, 1, 2, 3]